@@ -0,0 +1,768 @@
+import os
+import json
+import time
+import inspect
+import argparse
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+
+import pandas as pd
+import numpy as np
+
+import olah_data_top_brand as olah_tb
+import ppt_top_brand as ppt_tb
+
+
+# Nama file masukan default (relatif terhadap folder_data)
+FILE_MASUKAN = {'df_input_clean' : 'data input clean top brand.xlsx',
+                'df_tracking' : 'gabungan data tracking na.xlsx',
+                'df_semuaElemen' : 'gabungan fase.xlsx',
+                'df_tambahan' : 'data tambahan edit.xlsx',
+                'df_nontambahan' : 'data non tambahan.xlsx',
+                'mascod_bedding' : 'mascod bedding 2021.xlsx',
+                'code_top_brand_lainnya' : 'urutan brand.xlsx',
+                'excel_tambahan' : 'mascod tambahan.xlsx',
+                'excel_non_tambahan' : 'mascod non tambahan.xlsx'}
+
+
+def _path_masukan(konteks, nama):
+    return os.path.join(konteks.get('folder_data', '.'), konteks.get('file', {}).get(nama, FILE_MASUKAN[nama]))
+
+
+# ---------------------------------------------------------------------------
+# Tahap data: tiap fungsi tahap menerima ambil(nama) untuk meminta tabel lain
+# dan konteks laporan, lalu mengembalikan dict {nama tabel : isi}. Satu tahap
+# dijalankan paling banyak sekali per laporan, dan hanya jika salah satu
+# keluarannya diminta. Tabel berwarna (presentase pekerjaan, crosstab, indeks
+# TBI, competitor landscape) disimpan sebagai pasangan (tabel, warna) hasil
+# olah_tb.tabel_warna.
+# ---------------------------------------------------------------------------
+
+def _tahap_baca(nama, ambil, konteks):
+    return {nama : olah_tb.baca_excel(_path_masukan(konteks, nama))}
+
+
+def _tahap_store(ambil, konteks):
+    return {'isi_store' : olah_tb.baca_store(os.path.join(konteks.get('folder_data', '.'), konteks['store']))}
+
+
+def _tahap_input(ambil, konteks):
+    # Data responden mengikuti sumber agregat: isi store, file stream, atau gabungan shard,
+    # sehingga tabel per responden (sample size, data laporan, profil) sama dengan kubus.
+    # File stream / shard baru dimuat utuh jika ada tabel per responden yang diminta
+    folder_data = konteks.get('folder_data', '.')
+    if 'store' in konteks:
+        df_input_clean = ambil('isi_store')['data']
+    elif 'stream' in konteks:
+        df_input_clean = pd.concat(olah_tb.baca_bertahap(os.path.join(folder_data, konteks['stream']),
+                                                         konteks.get('n_baris_stream', 10000)),
+                                   ignore_index = True)
+    elif 'shard' in konteks:
+        df_input_clean = pd.concat([olah_tb.baca_excel(os.path.join(folder_data, shard)) for shard in konteks['shard']],
+                                   ignore_index = True)
+    else:
+        return _tahap_baca('df_input_clean', ambil, konteks)
+    return {'df_input_clean' : df_input_clean}
+
+
+def _tahap_brand(ambil, konteks):
+    code_top_brand_lainnya = ambil('code_top_brand_lainnya')
+    code_top_brand = code_top_brand_lainnya.loc[:len(code_top_brand_lainnya)-2].sort_values(by='Sorting').reset_index(drop=True)
+    top10_brand = code_top_brand_lainnya[~(code_top_brand_lainnya['Brand']=='Lainnya') &
+                                         ~(code_top_brand_lainnya['Brand']=='Total')]['Brand'].to_list()
+    sorter_brand = code_top_brand_lainnya['Sorting'][:len(code_top_brand_lainnya)]
+    return {'code_top_brand' : code_top_brand, 'top10_brand' : top10_brand, 'sorter_brand' : sorter_brand}
+
+
+def _tahap_sample_size(ambil, konteks):
+    return {'sample_size' : olah_tb.sample_size(ambil('df_input_clean'), ['Kota','Random','Booster','Total'])}
+
+
+def _tahap_ringkasan(ambil, konteks):
+    data_tracking, merek_tracking, tahun_ini = olah_tb.buat_data_tracking(ambil('df_tracking'), konteks['subkategori'])
+    subkategori = [konteks['subkategori'][0].upper()]
+    df_semuaElemen, semua_elemen_sekarang, semua_elemen_kemarin, merek_top6 = olah_tb.top6_semuaElemen_DuaTahun(
+        ambil('df_semuaElemen'), subkategori, tahun_ini)
+
+    dt_client = df_semuaElemen[(df_semuaElemen.Brand.isin([konteks['client']]))]
+    dt_client_5thn = dt_client[~(tahun_ini-dt_client['Tahun'] >= 5)]
+    return {'data_tracking' : data_tracking, 'merek_tracking' : merek_tracking, 'tahun_ini' : tahun_ini,
+            'semua_elemen_sekarang' : semua_elemen_sekarang, 'semua_elemen_kemarin' : semua_elemen_kemarin,
+            'merek_top6' : merek_top6, 'dt_client' : dt_client, 'dt_client_5thn' : dt_client_5thn}
+
+
+def _tahap_laporan(ambil, konteks):
+    df_laporan = olah_tb.data_laporan(ambil('df_input_clean'), ambil('mascod_bedding'), ambil('top10_brand'))
+    # Dengan konteks 'survey_frame' data laporan disimpan dalam tipe data ringkas (kategori berkode,
+    # bobot 'tipe_bobot', default float64, float32 untuk menghemat memori)
+    if konteks.get('survey_frame', False):
+        df_laporan = olah_tb.buat_survey_frame(df_laporan, konteks.get('tipe_bobot', 'float64'))
+    return {'df_laporan' : df_laporan,
+            'responden' : olah_tb.buat_frame_responden(df_laporan)}
+
+
+def _tahap_subset_ir(ambil, konteks):
+    # Salinan subset hanya dibuat jika diminta manifest, tabel bawaan memakai mask frame responden
+    responden = ambil('responden')
+    return {'data_ir' : responden['data'][olah_tb.mask_responden(responden, 'ir')]}
+
+
+def _tahap_agregat(ambil, konteks):
+    # Dengan konteks 'shard' (list file data responden, misalnya satu file per kota), agregat
+    # dibuat map-reduce per shard tanpa memuat data responden utuh. Dengan konteks 'store' (file
+    # hasil olah_tb.simpan_store yang diperbarui bertahap selama fieldwork) agregat langsung dibaca.
+    # Dengan konteks 'stream' (file csv/parquet/xlsx data responden) file dibaca per potongan
+    # 'n_baris_stream' baris dan langsung diagregasi
+    if 'store' in konteks:
+        agregat = ambil('isi_store')['agregat']
+    elif 'stream' in konteks:
+        agregat = olah_tb.agregat_bertahap(os.path.join(konteks.get('folder_data', '.'), konteks['stream']),
+                                           ambil('mascod_bedding'), ambil('top10_brand'),
+                                           konteks.get('n_baris_stream', 10000))
+    elif 'shard' in konteks:
+        list_shard = [os.path.join(konteks.get('folder_data', '.'), shard) for shard in konteks['shard']]
+        agregat = olah_tb.agregat_shard(list_shard, ambil('mascod_bedding'), ambil('top10_brand'),
+                                        konteks.get('n_proses_shard'))
+    else:
+        agregat = olah_tb.buat_agregat(ambil('df_laporan'))
+    kubus = agregat['kubus']
+    return {'agregat' : agregat,
+            'kubus' : kubus,
+            'kubus_ir' : kubus[kubus.IR == 'Ya'],
+            'kubus_nonIR' : kubus[kubus.IR == 'Tidak']}
+
+
+def _tahap_profil(ambil, konteks):
+    responden, sorter_brand = ambil('responden'), ambil('sorter_brand')
+    profil_ir, profil_ir_persen = olah_tb.data_ir(ambil('df_laporan'))
+
+    total_Usiar, tabelUsiar = olah_tb.profil_responden(responden, 'LU', 'usiar', sorter_brand, mask = 'ir')
+    total_Usia, tabelUsia = olah_tb.profil_responden(responden, 'LU', 'usia', sorter_brand, mask = 'ir')
+    total_Pekerjaan, tabelPekerjaan = olah_tb.profil_responden(responden, 'LU', 'kerja', sorter_brand, mask = 'ir')
+    total_Pendidikan, tabelPendidikan = olah_tb.profil_responden(responden, 'LU', 'didik', sorter_brand, olah_tb.pendidikan_urut(),
+                                                                 mask = 'ir')
+    total_Expandr, tabelExpandr = olah_tb.profil_responden(responden, 'LU', 'expandr', sorter_brand, olah_tb.ses_urut(),
+                                                           mask = 'ir')
+    usia_ir = responden['data']['usia'][olah_tb.mask_responden(responden, 'ir')]
+    return {'profil_ir' : profil_ir, 'profil_ir_persen' : profil_ir_persen,
+            'total_Usiar' : total_Usiar, 'tabelUsiar' : tabelUsiar,
+            'total_Usia' : total_Usia, 'tabelUsia' : tabelUsia,
+            'mean_usia' : [round(np.mean(usia_ir), 2)],
+            'total_Pekerjaan' : total_Pekerjaan, 'tabelPekerjaan' : tabelPekerjaan,
+            'presentase_pekerjaan' : olah_tb.tabel_warna(olah_tb.presentase_profil(tabelPekerjaan), 'pekerjaan'),
+            'total_Pendidikan' : total_Pendidikan, 'tabelPendidikan' : tabelPendidikan,
+            'total_Expandr' : total_Expandr, 'tabelExpandr' : tabelExpandr}
+
+
+def _tahap_indeks(ambil, konteks):
+    kubus, kubus_ir = ambil('kubus'), ambil('kubus_ir')
+    sorter_brand, top10_brand = ambil('sorter_brand'), ambil('top10_brand')
+
+    mind_share, total_bobot_tom = olah_tb.hitung_nilai('TOM', kubus, sorter_brand)
+    mind_share_nonuser, _ = olah_tb.hitung_nilai('TOM', kubus, sorter_brand, non_user = True)
+    market_share, _ = olah_tb.hitung_nilai('LU', kubus_ir, sorter_brand)
+    commitment_share, _ = olah_tb.hitung_nilai('FI', kubus_ir, sorter_brand)
+
+    gap_mind_share = olah_tb.hitung_gap(mind_share, top10_brand)
+    gap_mind_share_nonuser = olah_tb.hitung_gap(mind_share_nonuser, top10_brand)
+    gap_market_share = olah_tb.hitung_gap(market_share, top10_brand)
+    gap_commitment_share = olah_tb.hitung_gap(commitment_share, top10_brand)
+
+    mind_share_nonuser.columns = ['Brand','Mind Share (non-user)']
+    gap_mind_share.columns = ['Brand','Gap Mind Share']
+    gap_mind_share_nonuser.columns = ['Brand', 'Gap Mind Share (non-user)']
+    gap_market_share.columns = ['Brand', 'Gap Market Share']
+    gap_commitment_share.columns = ['Brand','Gap Commitment Share']
+    return {'mind_share' : mind_share, 'total_bobot_tom' : total_bobot_tom, 'mind_share_nonuser' : mind_share_nonuser,
+            'market_share' : market_share, 'commitment_share' : commitment_share,
+            'gap_mind_share' : gap_mind_share, 'gap_mind_share_nonuser' : gap_mind_share_nonuser,
+            'gap_market_share' : gap_market_share, 'gap_commitment_share' : gap_commitment_share}
+
+
+# kolom breakdown : indeks kolom custom
+_BREAKDOWN = {'kota' : olah_tb.kota_urut, 'expandr' : olah_tb.ses_urut, 'usiar' : None, 'sex' : None}
+
+# nama tabel : (kriteria, kriteria fungsi_by, data crosstab, data fungsi_by, non_user)
+_INDEKS_CROSSTAB = {'mind_share' : ('TOM', 'TOM', 'kubus', 'kubus', False),
+                    'mind_share_nonuser' : ('TOM', 'TOM', 'kubus', 'kubus_nonIR', True),
+                    'market_share' : ('LU', 'LU', 'kubus_ir', 'kubus_ir', False),
+                    'commitment_share' : ('FI', 'LU', 'kubus_ir', 'kubus_ir', False),
+                    'unaided' : ('UN', 'TOM', 'kubus', 'kubus', False)}
+
+
+def _nama_crosstab(indeks, by):
+    if indeks.endswith('_nonuser'):
+        return '%s_%s_nonuser'%(indeks[:-len('_nonuser')], by)
+    return '%s_%s'%(indeks, by)
+
+
+def _tahap_crosstab(indeks, by, ambil, konteks):
+    kriteria, kriteria_by, data_crosstab, data_by, non_user = _INDEKS_CROSSTAB[indeks]
+    kwargs = {}
+    if _BREAKDOWN[by] != None:
+        kwargs['indeks_kolom'] = _BREAKDOWN[by]()
+    if kriteria == 'UN':
+        kwargs['dt_tom'] = ambil('kubus')
+    if non_user == True:
+        kwargs['non_user'] = True
+    tabel = olah_tb.hitung_nilai_crosstab(kriteria = kriteria, by = by, data_used = ambil(data_crosstab),
+                                          indeks_brand = ambil('sorter_brand'), **kwargs)
+    tabel = olah_tb.fungsi_by(kriteria_by, by, tabel, ambil(data_by))
+    return {_nama_crosstab(indeks, by) : olah_tb.tabel_warna(tabel, kriteria_by)}
+
+
+def _tahap_tbi(ambil, konteks):
+    dt_tbi = olah_tb.hitung_tbi(ambil('mind_share'), ambil('market_share'), ambil('commitment_share'))
+    gap_tbi = olah_tb.hitung_gap(dt_tbi, ambil('top10_brand'))
+    gap_tbi.columns = ['Brand','Gap TBI']
+    return {'dt_tbi' : dt_tbi, 'gap_tbi' : gap_tbi}
+
+
+def _tahap_tbi_crosstab(by, ambil, konteks):
+    dt_tbi_by = olah_tb.crosstab_tbi(ambil('mind_share_' + by)[0], ambil('market_share_' + by)[0],
+                                     ambil('commitment_share_' + by)[0])
+    return {'indeks_tbi_' + by : olah_tb.tabel_warna(dt_tbi_by)}
+
+
+def _tahap_unaided(ambil, konteks):
+    dt_unaided = olah_tb.hitung_unaided(ambil('kubus'), ambil('total_bobot_tom'), ambil('sorter_brand'))
+    gap_unaided = olah_tb.hitung_gap(dt_unaided, ambil('top10_brand'))
+    gap_unaided.columns = ['Brand','Gap Unaided']
+
+    dt_selisih = dt_unaided.copy()
+    dt_selisih['Unaided'] = dt_unaided['Unaided']-ambil('mind_share')['Mind Share']
+    dt_selisih.columns = ['Brand','Selisih UN-TOM']
+    return {'dt_unaided' : dt_unaided, 'gap_unaided' : gap_unaided, 'dt_selisih' : dt_selisih}
+
+
+def _tahap_brand_switch(ambil, konteks):
+    agregat, code_top_brand = ambil('agregat'), ambil('code_top_brand')
+    n_sample = olah_tb.n_sample_user(ambil('kubus_ir'), ambil('code_top_brand_lainnya'))
+    return {'brand_switch' : olah_tb.hitung_brand_switch(agregat, ambil('code_top_brand_lainnya'), ambil('sorter_brand')),
+            'n_sample' : n_sample,
+            'tabel_brand_switching' : olah_tb.tabel_brand_switch(agregat, code_top_brand, n_sample),
+            'conv_rate' : olah_tb.hitung_conv_rate(data_used = agregat, list_sorted_brand = code_top_brand)}
+
+
+def _tahap_diagnostic(ambil, konteks):
+    return {'dt_diagnostic' : olah_tb.brand_diagnostic(ambil('mind_share'), ambil('market_share'), ambil('commitment_share'))}
+
+
+def _tahap_competitor(ambil, konteks):
+    kt_ = olah_tb.kota_urut()
+    bobot_cl, competitor_all, competitor_landscape = olah_tb.hitung_bobot_cl(ambil('kubus_ir'), ambil('code_top_brand'))
+    cl_semua = olah_tb.hitung_competitor_landscape(['Overall'] + kt_, np.stack([competitor_all] + competitor_landscape), bobot_cl)
+    cl_overall, cl_perkota = cl_semua[0], cl_semua[1:]
+
+    cl_perkota_ = [olah_tb.tabel_warna(x_, 'competitor') for x_ in cl_perkota]
+    return {'cl_overall_' : olah_tb.tabel_warna(cl_overall, 'competitor'),
+            'cl_perkota_' : cl_perkota_,
+            'cl_kota_' : dict(zip(kt_, cl_perkota_))}
+
+
+def _tabel_tambahan(ambil, konteks, sumber, sheet, kode_awal, top):
+    data = ambil('df_tambahan' if sumber == 'excel_tambahan' else 'df_nontambahan')
+    mascod = olah_tb.baca_excel(_path_masukan(konteks, sumber), sheet_name = sheet)
+    return olah_tb.hitung_tambahan(data_used = data, kode_awal = kode_awal, mascod = mascod, top = top)
+
+
+def _tahap_tambahan(nama, sumber, sheet, kode_awal, top, ambil, konteks):
+    tabel = _tabel_tambahan(ambil, konteks, sumber, sheet, kode_awal, top)
+    tabel = tabel.reset_index()
+    tabel['Kriteria'] = tabel['Kriteria'].astype('str')
+    return {nama : tabel}
+
+
+def _tahap_tambahan_ganda(nama, sheet, kode_dimiliki, top, kode_sering, baris, ambil, konteks):
+    tabel_dimiliki = _tabel_tambahan(ambil, konteks, 'excel_tambahan', sheet, kode_dimiliki, top)
+    tabel_sering = _tabel_tambahan(ambil, konteks, 'excel_tambahan', sheet, kode_sering, None)
+    tabel_dimiliki.columns = ['Count_1','Presentase_1']
+    tabel_sering.columns = ['Count_2','Presentase_2']
+    tabel = pd.concat([tabel_dimiliki, tabel_sering], axis = 1)
+    tabel = tabel.fillna(0)
+    list_kriteria = [x for x in tabel.index.to_list() if (x not in ['Multirespon','Tidak ada/ Tidak Punya'])]
+    tabel = tabel.reindex(index = list_kriteria + ['Tidak ada/ Tidak Punya', 'Multirespon'])
+    if baris != None:
+        tabel = tabel.iloc[baris,:]
+    tabel.index.rename('Kriteria', inplace = True)
+    tabel = tabel.reset_index()
+    tabel['Kriteria'] = tabel['Kriteria'].astype('str')
+    return {nama : tabel}
+
+
+def _tahap_olshop(ambil, konteks):
+    df_tambahan = ambil('df_tambahan')
+    dt_olshop = olah_tb.filter_tambahan(df_tambahan, kode_awal = 'p18_1_0', incl_kota = True, kolom_kota = 'Kota_1_0')
+    mascod_kota = olah_tb.baca_excel(_path_masukan(konteks, 'excel_tambahan'), sheet_name = 'Kota_1_0')
+    mascod_olshop = olah_tb.baca_excel(_path_masukan(konteks, 'excel_tambahan'), sheet_name = 'p18_1_0')
+    profil_olshop, profil_olshop_persen = olah_tb.data_olshop(dt_olshop, mascod_kota, mascod_olshop)
+
+    dt_pengeluaran = olah_tb.filter_tambahan(df_tambahan, kode_awal = 'p22_1', incl_kota = False)
+    dt_pengeluaran = dt_pengeluaran.dropna()
+    return {'profil_olshop' : profil_olshop, 'profil_olshop_persen' : profil_olshop_persen,
+            'rata_pengeluaran' : np.mean(dt_pengeluaran), 'n_sampel_pengeluaran' : len(dt_pengeluaran)}
+
+
+def _tahap_n_sampel(ambil, konteks):
+    kubus = ambil('kubus')
+    nSampel_mind_share = olah_tb.hitung_nSampel(kubus, 'TOM')
+    unaided_multirespon = [round(sum(ambil('dt_unaided')['Unaided']), 1)]
+    unaided_nSampel = [nSampel_mind_share.iloc[-1,0]]
+    return {'nSampel_mind_share' : nSampel_mind_share,
+            'nSampel_mind_share_nonUser' : olah_tb.hitung_nSampel(ambil('kubus_nonIR'), 'TOM'),
+            'nSampel_mult_unaided' : pd.DataFrame({'nSampel': unaided_nSampel, 'Total multirespon': unaided_multirespon}),
+            'nSampel_market_share' : olah_tb.hitung_nSampel(kubus, 'LU'),
+            'nSampel_commitment_share' : olah_tb.hitung_nSampel(kubus, 'FI')}
+
+
+def _daftar_tahap():
+    daftar = [_tahap_brand, _tahap_sample_size, _tahap_ringkasan, _tahap_laporan, _tahap_subset_ir, _tahap_agregat,
+              _tahap_profil, _tahap_indeks, _tahap_tbi, _tahap_unaided, _tahap_brand_switch, _tahap_diagnostic,
+              _tahap_competitor, _tahap_olshop, _tahap_n_sampel]
+    keluaran = {_tahap_brand : ['code_top_brand', 'top10_brand', 'sorter_brand'],
+                _tahap_sample_size : ['sample_size'],
+                _tahap_ringkasan : ['data_tracking', 'merek_tracking', 'tahun_ini', 'semua_elemen_sekarang',
+                                    'semua_elemen_kemarin', 'merek_top6', 'dt_client', 'dt_client_5thn'],
+                _tahap_laporan : ['df_laporan', 'responden'],
+                _tahap_subset_ir : ['data_ir'],
+                _tahap_agregat : ['agregat', 'kubus', 'kubus_ir', 'kubus_nonIR'],
+                _tahap_profil : ['profil_ir', 'profil_ir_persen', 'total_Usiar', 'tabelUsiar', 'total_Usia',
+                                 'tabelUsia', 'mean_usia', 'total_Pekerjaan', 'tabelPekerjaan',
+                                 'presentase_pekerjaan', 'total_Pendidikan', 'tabelPendidikan',
+                                 'total_Expandr', 'tabelExpandr'],
+                _tahap_indeks : ['mind_share', 'total_bobot_tom', 'mind_share_nonuser', 'market_share',
+                                 'commitment_share', 'gap_mind_share', 'gap_mind_share_nonuser',
+                                 'gap_market_share', 'gap_commitment_share'],
+                _tahap_tbi : ['dt_tbi', 'gap_tbi'],
+                _tahap_unaided : ['dt_unaided', 'gap_unaided', 'dt_selisih'],
+                _tahap_brand_switch : ['brand_switch', 'n_sample', 'tabel_brand_switching', 'conv_rate'],
+                _tahap_diagnostic : ['dt_diagnostic'],
+                _tahap_competitor : ['cl_overall_', 'cl_perkota_', 'cl_kota_'],
+                _tahap_olshop : ['profil_olshop', 'profil_olshop_persen', 'rata_pengeluaran', 'n_sampel_pengeluaran'],
+                _tahap_n_sampel : ['nSampel_mind_share', 'nSampel_mind_share_nonUser', 'nSampel_mult_unaided',
+                                   'nSampel_market_share', 'nSampel_commitment_share']}
+
+    tahap = {}
+    tahap['isi_store'] = _tahap_store
+    tahap['df_input_clean'] = _tahap_input
+    for nama in ['df_tracking', 'df_semuaElemen', 'df_tambahan', 'df_nontambahan',
+                 'mascod_bedding', 'code_top_brand_lainnya']:
+        tahap[nama] = partial(_tahap_baca, nama)
+    for fungsi in daftar:
+        for nama in keluaran[fungsi]:
+            tahap[nama] = fungsi
+    for indeks in _INDEKS_CROSSTAB:
+        for by in _BREAKDOWN:
+            tahap[_nama_crosstab(indeks, by)] = partial(_tahap_crosstab, indeks, by)
+    for by in _BREAKDOWN:
+        tahap['indeks_tbi_' + by] = partial(_tahap_tbi_crosstab, by)
+
+    # nama tabel : (file mascod, sheet mascod, kode_awal, top)
+    tambahan = {'tab_mhabit' : ('excel_tambahan', 'p8', 'p8', 10),
+                'tab_mhabit_tv' : ('excel_tambahan', 'tv', 'tv', 10),
+                'tab_mhabit_acaratv' : ('excel_tambahan', 'acaratv', 'acaratv', 10),
+                'tab_mhabit_koran' : ('excel_tambahan', 'koran', 'koran', 10),
+                'tab_mhabit_majalah' : ('excel_tambahan', 'majalah', 'majalah', 10),
+                'tab_mhabit_tabloid' : ('excel_tambahan', 'tabloid', 'tabloid', 10),
+                'tab_ism_jenis_barang' : ('excel_tambahan', 'p20', 'p20_1', 10),
+                'tab_ism_pembayaran' : ('excel_tambahan', 'p23', 'p23', 7),
+                'tab_ism_chat' : ('excel_tambahan', 'p13', 'p13', 5),
+                'tab_ism_akses' : ('excel_non_tambahan', 'akses', 'akses', 10),
+                'tab_ism_aktivitas' : ('excel_non_tambahan', 'aktivitas', 'aktivitas', 10),
+                'tab_ism_waktu' : ('excel_non_tambahan', 'waktu', 'waktu', 10),
+                'tab_ism_media_upload' : ('excel_non_tambahan', 'media_upload', 'media_upload', 10),
+                'tab_ism_media_download' : ('excel_non_tambahan', 'media_download', 'media_download', 10),
+                'tab_ism_email' : ('excel_non_tambahan', 'email', 'email', 10),
+                'tab_ism_game' : ('excel_non_tambahan', 'game', 'game', 10),
+                'tab_ism_berita' : ('excel_non_tambahan', 'berita', 'berita', 10),
+                'tab_ism_streaming' : ('excel_non_tambahan', 'streaming', 'streaming', 10),
+                'tab_ism_olshop' : ('excel_non_tambahan', 'olshop', 'olshop', 10)}
+    for nama, (sumber, sheet, kode_awal, top) in tambahan.items():
+        tahap[nama] = partial(_tahap_tambahan, nama, sumber, sheet, kode_awal, top)
+    tahap['tab_ism_gadget'] = partial(_tahap_tambahan_ganda, 'tab_ism_gadget', 'p9', 'p9_1', 9, 'p10', None)
+    tahap['tab_ism_sosmed'] = partial(_tahap_tambahan_ganda, 'tab_ism_sosmed', 'p11', 'p11_1', 3, 'p12', [0,1,2,-1])
+
+    return tahap
+
+
+# nama tabel : fungsi tahap yang menghasilkannya
+TAHAP_DATA = _daftar_tahap()
+
+
+def buat_sumber(konteks, tabel = None):
+    """
+    Membuat sumber data laporan. Tabel dihitung saat pertama kali diminta lewat ambil_data
+    lalu disimpan, sehingga bagian laporan yang tidak dipakai tidak pernah dihitung.
+
+    Parameter
+    ---------
+    konteks : dict parameter laporan, minimal 'client' dan 'subkategori' (list), serta opsional
+              'folder_data' (folder file masukan), 'file' (dict pengganti nama file di FILE_MASUKAN),
+              'shard' (list file data responden per bagian untuk agregat map-reduce), 'n_proses_shard',
+              'store' (file store agregat bertahap dari olah_tb.simpan_store), serta 'stream' dan
+              'n_baris_stream' (file data responden yang diagregasi per potongan baris), dengan
+              df_input_clean ikut diambil dari store / stream / shard tersebut, dan
+              'survey_frame' serta 'tipe_bobot' (data laporan ringkas dari olah_tb.buat_survey_frame)
+    tabel : dict tabel yang sudah tersedia di memori (nama sama dengan TAHAP_DATA), dipakai apa adanya
+
+    Return
+    ------
+    sumber : dict sumber data untuk ambil_data
+    """
+
+    return {'konteks' : dict(konteks),
+            'hasil' : dict(tabel) if tabel != None else {},
+            'proses' : {},
+            'kunci' : threading.Lock()}
+
+
+def ambil_data(sumber, nama):
+    """
+    Mengambil tabel hasil tahap data dari sumber, menjalankan tahapnya (beserta tahap yang
+    dibutuhkan) jika belum pernah dihitung. Aman dipanggil dari beberapa thread sekaligus,
+    satu tahap tetap hanya dihitung sekali.
+
+    Parameter
+    ---------
+    sumber : sumber data (hasil buat_sumber)
+    nama : nama tabel (kunci TAHAP_DATA) atau nama parameter pada konteks
+
+    Return
+    ------
+    tabel : isi tabel
+    """
+
+    if nama in sumber['hasil']:
+        return sumber['hasil'][nama]
+    if nama in sumber['konteks']:
+        return sumber['konteks'][nama]
+    if nama not in TAHAP_DATA:
+        raise KeyError("tabel '%s' tidak dikenal"%(nama))
+
+    tahap = TAHAP_DATA[nama]
+    with sumber['kunci']:
+        proses = sumber['proses'].get(tahap)
+        pemilik = proses == None
+        if pemilik:
+            proses = Future()
+            sumber['proses'][tahap] = proses
+
+    if pemilik:
+        try:
+            sumber['hasil'].update(tahap(partial(ambil_data, sumber), sumber['konteks']))
+        except BaseException as galat:
+            proses.set_exception(galat)
+            raise
+        proses.set_result(None)
+    else:
+        proses.result()
+    return sumber['hasil'][nama]
+
+
+# ---------------------------------------------------------------------------
+# Manifest slide
+# ---------------------------------------------------------------------------
+
+def baca_manifest(manifest):
+    """
+    Membaca manifest laporan. Manifest berisi 'konteks' (parameter laporan, lihat buat_sumber)
+    dan 'slide', yaitu daftar isi slide dengan kunci:
+
+        bagian : nama bagian laporan (untuk memilih sebagian laporan)
+        slide : nomor slide (mulai dari 0)
+        fungsi : nama fungsi di ppt_top_brand, dipanggil fungsi(template_ppt, slide, *args, **kwargs)
+        args, kwargs : argumen fungsi. String "$nama" diganti tabel dari tahap data, atau
+                       {"data": nama, "kolom": kolom, "kunci": kunci, "potong": [awal, akhir]}
+                       untuk mengambil kolom / item / potongan baris tabel tersebut
+
+    Parameter
+    ---------
+    manifest : path file manifest (.json, .yaml atau .yml) atau dict manifest
+
+    Return
+    ------
+    manifest : dict manifest
+    """
+
+    if type(manifest) == dict:
+        return manifest
+
+    with open(manifest, encoding = 'utf-8') as f:
+        if os.path.splitext(manifest)[1].lower() in ['.yaml', '.yml']:
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _referensi(argumen):
+    if type(argumen) == str and argumen.startswith('$'):
+        return [argumen[1:]]
+    if type(argumen) == dict and 'data' in argumen:
+        return [argumen['data']]
+    if type(argumen) in [list, tuple]:
+        return [x for arg in argumen for x in _referensi(arg)]
+    if type(argumen) == dict:
+        return [x for arg in argumen.values() for x in _referensi(arg)]
+    return []
+
+
+def _isi_argumen(argumen, sumber):
+    if type(argumen) == str and argumen.startswith('$'):
+        return ambil_data(sumber, argumen[1:])
+    if type(argumen) == dict and 'data' in argumen:
+        isi = ambil_data(sumber, argumen['data'])
+        if 'kunci' in argumen:
+            isi = isi[argumen['kunci']]
+        if 'kolom' in argumen:
+            isi = isi[argumen['kolom']]
+        if 'potong' in argumen:
+            isi = isi.iloc[slice(*argumen['potong'])]
+        return isi
+    if type(argumen) in [list, tuple]:
+        return [_isi_argumen(arg, sumber) for arg in argumen]
+    if type(argumen) == dict:
+        return {k : _isi_argumen(v, sumber) for k, v in argumen.items()}
+    return argumen
+
+
+def validasi_manifest(daftar_slide, jumlah_slide, tabel = None):
+    """
+    Memeriksa seluruh isi manifest sebelum laporan dibuat: nomor slide ada di template,
+    fungsi ada di ppt_top_brand, dan semua tabel yang dirujuk dikenal tahap data.
+
+    Parameter
+    ---------
+    daftar_slide : list isi slide manifest
+    jumlah_slide : jumlah slide pada template
+    tabel : nama tabel / parameter lain yang tersedia (konteks dan tabel di memori)
+
+    Return
+    ------
+    None, ValueError berisi semua kesalahan jika ada
+    """
+
+    dikenal = set(TAHAP_DATA) | set(tabel if tabel != None else [])
+    kesalahan = []
+    for i, isi in enumerate(daftar_slide):
+        label = "slide[%d] (%s, slide %s)"%(i, isi.get('fungsi'), isi.get('slide'))
+        nomor = isi.get('slide')
+        if type(nomor) != int or not 0 <= nomor < jumlah_slide:
+            kesalahan.append("%s: nomor slide harus 0 s/d %d"%(label, jumlah_slide-1))
+        if not callable(getattr(ppt_tb, str(isi.get('fungsi')), None)):
+            kesalahan.append("%s: fungsi tidak ada di ppt_top_brand"%(label))
+        for nama in _referensi([isi.get('args', []), isi.get('kwargs', {})]):
+            if nama not in dikenal:
+                kesalahan.append("%s: tabel '%s' tidak dikenal"%(label, nama))
+
+    if len(kesalahan) > 0:
+        raise ValueError("manifest tidak valid:\n" + "\n".join(kesalahan))
+
+    return None
+
+
+def jalankan_manifest(manifest, konteks = None, bagian = None, template_ppt = None, nama_output = None,
+                      tabel = None, n_thread = 4, verbose = False):
+    """
+    Membuat laporan ppt dari manifest. Manifest divalidasi lebih dulu, lalu tabel masukan
+    setiap slide dihitung secara lazy (hanya tahap data yang dibutuhkan slide terpilih) dengan
+    beberapa thread sekaligus untuk slide yang saling bebas. Penulisan ke ppt tetap berurutan
+    sesuai manifest karena seluruh slide berbagi satu package pptx.
+
+    Parameter
+    ---------
+    manifest : path file manifest atau dict manifest (lihat baca_manifest)
+    konteks : dict parameter laporan, menimpa 'konteks' pada manifest, termasuk 'workbook_chart'
+              (workbook chart 'lengkap', 'ringkas' atau 'tanpa', lihat ppt_tb.tambah_chart)
+    bagian : list nama bagian yang dibuat, None untuk seluruh manifest
+    template_ppt : template ppt yang dipakai, default FileTemplate(konteks['template']), path template
+                   relatif terhadap konteks['folder_data'] seperti file masukan lain
+    nama_output : nama file ppt hasil, default konteks['output'] (tidak disimpan jika keduanya None)
+    tabel : dict tabel yang sudah ada di memori (lihat buat_sumber)
+    n_thread : jumlah thread penghitung tabel masukan
+    verbose : True untuk mencetak waktu tiap tahap
+
+    Return
+    ------
+    template_ppt : ppt hasil
+    """
+
+    manifest = baca_manifest(manifest)
+    konteks_laporan = dict(manifest.get('konteks', {}))
+    if konteks != None:
+        konteks_laporan.update(konteks)
+
+    daftar_slide = [isi for isi in manifest['slide'] if bagian == None or isi.get('bagian') in bagian]
+
+    if template_ppt == None:
+        template_ppt = ppt_tb.FileTemplate(os.path.join(konteks_laporan.get('folder_data', '.'), konteks_laporan['template']))
+    validasi_manifest(daftar_slide, len(template_ppt.slides),
+                      list(konteks_laporan) + list(tabel if tabel != None else []))
+
+    sumber = buat_sumber(konteks_laporan, tabel)
+    waktu_awal = time.time()
+
+    def siapkan(isi):
+        return (_isi_argumen(isi.get('args', []), sumber), _isi_argumen(isi.get('kwargs', {}), sumber))
+
+    if n_thread > 1:
+        with ThreadPoolExecutor(n_thread) as pool:
+            argumen = list(pool.map(siapkan, daftar_slide))
+    else:
+        argumen = [siapkan(isi) for isi in daftar_slide]
+    if verbose == True:
+        print('data', round(time.time() - waktu_awal, 2), 'detik')
+
+    # Workbook chart (lihat ppt_tb.tambah_chart) diteruskan ke setiap fungsi chart
+    workbook_chart = konteks_laporan.get('workbook_chart', 'lengkap')
+    waktu_awal = time.time()
+    for isi, (args, kwargs) in zip(daftar_slide, argumen):
+        fungsi = getattr(ppt_tb, isi['fungsi'])
+        if 'workbook_chart' in inspect.signature(fungsi).parameters and 'workbook_chart' not in kwargs:
+            kwargs = dict(kwargs, workbook_chart = workbook_chart)
+        fungsi(template_ppt, isi['slide'], *args, **kwargs)
+    if verbose == True:
+        print('ppt', round(time.time() - waktu_awal, 2), 'detik')
+
+    if nama_output == None:
+        nama_output = konteks_laporan.get('output')
+    if nama_output != None:
+        template_ppt.save(nama_output)
+
+    return template_ppt
+
+
+# ---------------------------------------------------------------------------
+# Batch banyak subkategori / client
+# ---------------------------------------------------------------------------
+
+# Tabel masukan yang sama untuk semua job, dibaca sekali lalu dibagikan ke setiap proses
+TABEL_BERSAMA = ['df_tracking', 'df_semuaElemen']
+
+# Tabel bersama di proses pekerja (diisi oleh _siapkan_pekerja)
+_tabel_pekerja = {}
+
+
+def _siapkan_pekerja(tabel_bersama):
+    _tabel_pekerja.clear()
+    _tabel_pekerja.update(tabel_bersama)
+
+
+def _jalankan_job(manifest, konteks, bagian, n_thread):
+    waktu_awal = time.time()
+    try:
+        jalankan_manifest(manifest, konteks = konteks, bagian = bagian, tabel = _tabel_pekerja, n_thread = n_thread)
+        galat = None
+    except Exception as e:
+        galat = '%s: %s'%(type(e).__name__, e)
+    return {'client' : konteks['client'], 'subkategori' : konteks['subkategori'], 'output' : konteks['output'],
+            'detik' : round(time.time() - waktu_awal, 2), 'galat' : galat}
+
+
+def konteks_job(job, konteks = None):
+    """
+    Menyusun konteks laporan satu job batch.
+
+    Parameter
+    ---------
+    job : dict dengan kunci 'subkategori' (string atau list), 'client', opsional 'mascod' (file mascod
+          subkategori pengganti 'mascod bedding 2021.xlsx'), 'template', 'output', 'file' dan
+          parameter konteks lain (lihat buat_sumber)
+    konteks : konteks dasar yang dipakai semua job
+
+    Return
+    ------
+    konteks : konteks laporan job
+    """
+
+    konteks_laporan = dict(konteks if konteks != None else {})
+    konteks_laporan.update({k : v for k, v in job.items() if k != 'mascod'})
+    if type(konteks_laporan['subkategori']) == str:
+        konteks_laporan['subkategori'] = [konteks_laporan['subkategori']]
+
+    file_masukan = dict(konteks_laporan.get('file', {}))
+    if 'mascod' in job:
+        file_masukan['mascod_bedding'] = job['mascod']
+    konteks_laporan['file'] = file_masukan
+
+    if 'output' not in job:
+        konteks_laporan['output'] = 'laporan top brand %s %s.pptx'%(konteks_laporan['subkategori'][0], konteks_laporan['client'])
+    return konteks_laporan
+
+
+def jalankan_batch(daftar_job, manifest, konteks = None, bagian = None, n_proses = None, n_thread = 1,
+                   verbose = False):
+    """
+    Membuat laporan untuk banyak subkategori / client sekaligus. Tabel bersama (TABEL_BERSAMA,
+    misalnya gabungan fase dan gabungan data tracking) dibaca sekali di proses utama, lalu
+    job dibagi ke beberapa proses dan dijalankan paralel. Job yang gagal tidak menghentikan
+    job lain, kesalahannya dicatat pada hasil. Beberapa job dengan file output yang sama
+    ditolak (ValueError) sebelum job dijalankan.
+
+    Parameter
+    ---------
+    daftar_job : list job (lihat konteks_job), atau path file json berisi list tersebut
+    manifest : path file manifest atau dict manifest (lihat baca_manifest)
+    konteks : konteks dasar semua job, menimpa 'konteks' pada manifest
+    bagian : list nama bagian yang dibuat, None untuk seluruh manifest
+    n_proses : jumlah proses, default jumlah core
+    n_thread : jumlah thread penghitung tabel di tiap proses
+    verbose : True untuk mencetak waktu tiap job
+
+    Return
+    ------
+    hasil : tabel client, subkategori, output, detik, dan galat (None jika berhasil) tiap job
+    """
+
+    if type(daftar_job) == str:
+        with open(daftar_job, encoding = 'utf-8') as f:
+            daftar_job = json.load(f)
+
+    manifest = baca_manifest(manifest)
+    konteks_dasar = dict(manifest.get('konteks', {}))
+    if konteks != None:
+        konteks_dasar.update(konteks)
+    daftar_konteks = [konteks_job(job, konteks_dasar) for job in daftar_job]
+
+    # Job dengan file output yang sama akan saling menimpa, diperiksa sebelum job dijalankan
+    daftar_output = [os.path.normcase(os.path.abspath(k['output'])) for k in daftar_konteks]
+    output_ganda = sorted(set(output for output in daftar_output if daftar_output.count(output) > 1))
+    if len(output_ganda) > 0:
+        raise ValueError("beberapa job menulis file output yang sama: %s"%(', '.join(output_ganda)))
+
+    waktu_awal = time.time()
+    sumber = buat_sumber(konteks_dasar)
+    tabel_bersama = {nama : ambil_data(sumber, nama) for nama in TABEL_BERSAMA}
+    if verbose == True:
+        print('tabel bersama', round(time.time() - waktu_awal, 2), 'detik')
+
+    with ProcessPoolExecutor(n_proses, initializer = _siapkan_pekerja, initargs = (tabel_bersama,)) as pool:
+        daftar_proses = [pool.submit(_jalankan_job, manifest, k, bagian, n_thread) for k in daftar_konteks]
+        for proses in as_completed(daftar_proses):
+            hasil_job = proses.result()
+            if verbose == True:
+                print(hasil_job['subkategori'][0], hasil_job['client'], hasil_job['detik'], 'detik',
+                      '' if hasil_job['galat'] == None else hasil_job['galat'])
+
+    if verbose == True:
+        print('total', round(time.time() - waktu_awal, 2), 'detik')
+
+    hasil = pd.DataFrame([proses.result() for proses in daftar_proses], columns = ['client', 'subkategori', 'output', 'detik', 'galat'])
+    return hasil
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Membuat laporan top brand dari manifest slide')
+    parser.add_argument('manifest', help = 'file manifest (.json / .yaml)')
+    parser.add_argument('--bagian', nargs = '*', default = None, help = 'bagian laporan yang dibuat')
+    parser.add_argument('--output', default = None, help = 'nama file ppt hasil')
+    parser.add_argument('--thread', type = int, default = 4, help = 'jumlah thread penghitung tabel')
+    parser.add_argument('--job', default = None, help = 'file json daftar job batch (lihat konteks_job)')
+    parser.add_argument('--proses', type = int, default = None, help = 'jumlah proses batch')
+    arg = parser.parse_args()
+
+    if arg.job != None:
+        print(jalankan_batch(arg.job, arg.manifest, bagian = arg.bagian, n_proses = arg.proses,
+                             n_thread = arg.thread, verbose = True))
+    else:
+        jalankan_manifest(arg.manifest, bagian = arg.bagian, nama_output = arg.output, n_thread = arg.thread, verbose = True)
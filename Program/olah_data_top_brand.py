@@ -1,9 +1,277 @@
 import pandas as pd
 import numpy as np
 import datetime
+import hashlib
+import math
+import glob
+import os
+import tempfile
+import warnings
 import seaborn as sb
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
 
 
+# Hash isi file per (path, ukuran, waktu modifikasi) agar file yang sama tidak di-hash berulang
+_hash_file = {}
+
+
+def _hitung_hash_file(nama_file):
+    """
+    Menghitung hash isi file, disimpan selama file tidak berubah
+    """
+
+    info = os.stat(nama_file)
+    kunci = (os.path.abspath(nama_file), info.st_size, info.st_mtime_ns)
+    if kunci not in _hash_file:
+        hash_ = hashlib.sha1()
+        with open(nama_file, 'rb') as f:
+            for blok in iter(lambda: f.read(1 << 20), b''):
+                hash_.update(blok)
+        _hash_file[kunci] = hash_.hexdigest()
+    return _hash_file[kunci]
+
+
+# Kode tipe nilai untuk kolom object (campuran angka dan teks) di cache parquet
+_TIPE_NILAI = {type(None): 0, float: 1, int: 2, str: 3, bool: 4,
+               datetime.datetime: 5, datetime.time: 6}
+
+
+def _kode_kolom_objek(kolom):
+    """
+    Mengubah kolom object menjadi pasangan (teks, tipe) agar bisa disimpan ke parquet
+    tanpa kehilangan tipe asli tiap nilai. Menghasilkan None jika ada tipe lain.
+    """
+
+    tipe = np.fromiter((_TIPE_NILAI.get(type(x), -1) for x in kolom), dtype = 'int8', count = len(kolom))
+    if (tipe == -1).any():
+        return None
+
+    nilai = kolom.to_numpy()
+    teks = np.array([repr(x) if t == 1 else x.isoformat() if t >= 5 else str(x)
+                     for x, t in zip(nilai, tipe)], dtype = 'object')
+    teks[tipe == 0] = None
+
+    return teks, tipe
+
+
+def _pulihkan_kolom_objek(teks, tipe):
+    """
+    Mengembalikan kolom object dari pasangan (teks, tipe) hasil _kode_kolom_objek
+    """
+
+    nilai = np.empty(len(teks), dtype = 'object')
+    nilai[tipe == 0] = None
+    for kode, fungsi in [(1, float), (2, int), (3, str),
+                         (5, datetime.datetime.fromisoformat), (6, datetime.time.fromisoformat)]:
+        posisi = np.flatnonzero(tipe == kode)
+        if len(posisi) > 0:
+            nilai[posisi] = list(map(fungsi, teks[posisi]))
+    nilai[tipe == 4] = teks[tipe == 4] == 'True'
+
+    return nilai
+
+
+def _simpan_cache(data, file_cache):
+    """
+    Menyimpan tabel ke file parquet. Kolom object disimpan sebagai teks + kode tipe.
+    Menghasilkan False jika tabel tidak bisa disimpan.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not all(isinstance(k, str) for k in data.columns):
+        return False
+
+    data_simpan = data.copy()
+    kolom_objek = []
+    for kolom in data.columns[data.dtypes == 'object']:
+        hasil = _kode_kolom_objek(data[kolom])
+        if hasil == None:
+            return False
+        data_simpan[kolom] = hasil[0]
+        data_simpan['__tipe__' + kolom] = hasil[1]
+        kolom_objek.append(kolom)
+
+    tabel = pa.Table.from_pandas(data_simpan)
+    metadata = dict(tabel.schema.metadata)
+    metadata[b'kolom_objek'] = '\n'.join(kolom_objek).encode('utf-8')
+
+    # File sementara unik di folder cache agar beberapa proses batch tidak menulis file yang sama,
+    # lalu dipindah sekaligus sehingga file cache tidak pernah terbaca setengah jadi
+    fd, file_sementara = tempfile.mkstemp(suffix = '.tmp', dir = os.path.dirname(file_cache))
+    os.close(fd)
+    try:
+        pq.write_table(tabel.replace_schema_metadata(metadata), file_sementara)
+        os.replace(file_sementara, file_cache)
+    except BaseException:
+        os.remove(file_sementara)
+        raise
+    return True
+
+
+def _galat_cache():
+    """
+    Jenis error yang membuat cache parquet dilewati (pyarrow tidak ada, file tidak bisa
+    dibaca/ditulis, atau file parquet rusak)
+    """
+
+    try:
+        import pyarrow
+    except ImportError:
+        return (ImportError, OSError)
+    return (ImportError, OSError, pyarrow.lib.ArrowException)
+
+
+def _baca_cache(file_cache):
+    """
+    Membaca tabel dari file parquet hasil _simpan_cache
+    """
+
+    import pyarrow.parquet as pq
+
+    tabel = pq.read_table(file_cache, memory_map = True)
+    kolom_objek = tabel.schema.metadata[b'kolom_objek'].decode('utf-8')
+    kolom_objek = kolom_objek.split('\n') if kolom_objek != '' else []
+
+    data = tabel.to_pandas()
+    for kolom in kolom_objek:
+        teks = data[kolom].to_numpy(dtype = 'object')
+        tipe = data.pop('__tipe__' + kolom).to_numpy()
+        data[kolom] = _pulihkan_kolom_objek(teks, tipe)
+
+    return data
+
+
+def baca_excel(nama_file, sheet_name = 0, folder_cache = None):
+    """
+    Membaca sheet file excel melalui cache parquet. Pembacaan pertama menyimpan
+    salinan parquet dengan kunci hash isi file dan nama sheet, pembacaan berikutnya
+    memakai salinan tersebut (memory-mapped). Jika file excel berubah, cache lama
+    dihapus. Tanpa pyarrow, file excel dibaca langsung.
+
+    Parameter
+    ---------
+    nama_file : path file excel
+    sheet_name : nama atau nomor sheet, list nama/nomor sheet, atau None untuk semua sheet
+                 (sama seperti pd.read_excel, tiap sheet di-cache terpisah)
+    folder_cache : folder penyimpanan cache (default folder '.cache_excel' di samping file excel)
+
+    Return
+    ------
+    data : tabel isi sheet, atau dict nama sheet -> tabel jika sheet_name berupa list / None
+    """
+
+    if sheet_name == None or isinstance(sheet_name, list):
+        if sheet_name == None:
+            with pd.ExcelFile(nama_file) as file_excel:
+                sheet_name = file_excel.sheet_names
+        return {sheet : baca_excel(nama_file, sheet, folder_cache) for sheet in sheet_name}
+
+    if folder_cache == None:
+        folder_cache = os.path.join(os.path.dirname(os.path.abspath(nama_file)), '.cache_excel')
+
+    nama_dasar = os.path.basename(nama_file)
+    awalan_cache = '%s [%s] '%(nama_dasar, sheet_name)
+    file_cache = os.path.join(folder_cache, awalan_cache + _hitung_hash_file(nama_file) + '.parquet')
+
+    # Cache yang tidak bisa dibaca diabaikan, file excel dibaca ulang dan cache ditulis ulang
+    try:
+        if os.path.exists(file_cache):
+            return _baca_cache(file_cache)
+    except _galat_cache():
+        pass
+
+    data = pd.read_excel(nama_file, sheet_name = sheet_name)
+
+    # Kegagalan cache (folder read-only, disk penuh, pyarrow tidak ada) tidak menggagalkan pembacaan,
+    # tabel hasil pd.read_excel tetap dipakai tanpa cache
+    try:
+        # Cache versi lama (hash berbeda) untuk sheet yang sama dihapus
+        os.makedirs(folder_cache, exist_ok = True)
+        for file_lama in glob.glob(os.path.join(glob.escape(folder_cache), glob.escape(awalan_cache) + '*.parquet')):
+            if file_lama != file_cache:
+                try:
+                    os.remove(file_lama)
+                except FileNotFoundError:
+                    pass
+
+        tersimpan = _simpan_cache(data, file_cache)
+    except ImportError:
+        pass
+    except _galat_cache() as galat:
+        warnings.warn('Cache %s tidak ditulis: %s'%(file_cache, galat))
+    else:
+        if tersimpan == False:
+            warnings.warn('Sheet %s pada %s tidak bisa disimpan ke parquet, dibaca tanpa cache'%(sheet_name, nama_dasar))
+
+    return data
+
+
+
+def baca_bertahap(nama_file, n_baris = 10000, sheet_name = 0, pilih_kolom = None):
+    """
+    Membaca file data responden per potongan n_baris baris tanpa memuat isi file
+    sekaligus. Mendukung csv, parquet (pyarrow), dan xlsx (openpyxl mode read-only).
+
+    Parameter
+    ---------
+    nama_file : path file csv, parquet, atau xlsx
+    n_baris : jumlah baris tiap potongan
+    sheet_name : nama atau nomor sheet (khusus xlsx)
+    pilih_kolom : fungsi nama kolom -> bool untuk memilih kolom yang dibaca (default semua kolom)
+
+    Return
+    ------
+    generator tabel potongan data
+    """
+
+    ekstensi = os.path.splitext(nama_file)[1].lower()
+
+    if ekstensi == '.csv':
+        for potongan in pd.read_csv(nama_file, chunksize = n_baris, usecols = pilih_kolom):
+            yield potongan
+
+    elif ekstensi == '.parquet':
+        import pyarrow.parquet as pq
+
+        file_parquet = pq.ParquetFile(nama_file)
+        kolom = file_parquet.schema_arrow.names
+        if pilih_kolom != None:
+            kolom = [k for k in kolom if pilih_kolom(k)]
+        for batch in file_parquet.iter_batches(batch_size = n_baris, columns = kolom):
+            yield batch.to_pandas()
+
+    elif ekstensi in ['.xlsx', '.xlsm']:
+        import openpyxl
+
+        buku = openpyxl.load_workbook(nama_file, read_only = True, data_only = True)
+        try:
+            sheet = buku.worksheets[sheet_name] if isinstance(sheet_name, int) else buku[sheet_name]
+            baris = sheet.iter_rows(values_only = True)
+            header = next(baris)
+            posisi = [i for i, k in enumerate(header) if k != None and (pilih_kolom == None or pilih_kolom(k))]
+            kolom = [header[i] for i in posisi]
+
+            isi = []
+            for nilai in baris:
+                nilai = [nilai[i] if i < len(nilai) else None for i in posisi]
+                # Baris kosong (misalnya sisa format di bawah tabel) dilewati seperti pd.read_excel
+                if all(n == None for n in nilai):
+                    continue
+                isi.append(nilai)
+                if len(isi) == n_baris:
+                    yield pd.DataFrame(isi, columns = kolom)
+                    isi = []
+            if len(isi) > 0:
+                yield pd.DataFrame(isi, columns = kolom)
+        finally:
+            buku.close()
+
+    else:
+        raise ValueError('Format file %s tidak didukung (csv, parquet, xlsx)'%(nama_file))
+
 
 def kota_multiindex():
     """
@@ -57,28 +325,139 @@ def pendidikan_urut():
     pendidikan = ['SD/sederajat', 'SMP/sederajat', 'SMA/sederajat', 'Akademi/ Diploma', 'Sarjana (S1/ S2/ S3)']
     return pendidikan
 
-def conditional_formating(data, kriteria=None):
-    cm = sb.light_palette("seagreen", as_cmap=True)
+# Tabel warna gradien seagreen: 256 warna, lalu slot NaN (warna 'bad') dan slot sel di luar subset.
+# Diisi sekali oleh _lut_seagreen dalam satu assignment agar aman dipakai bersama antar thread
+_lut_gradien = None
+
+
+def _lut_seagreen():
+    """
+    Membuat (sekali) tabel warna RGB dan CSS untuk palet seagreen, sama dengan
+    warna yang dihasilkan background_gradient
+    """
+
+    global _lut_gradien
+
+    if _lut_gradien == None:
+        cm = sb.light_palette("seagreen", as_cmap=True)
+        rgba = np.vstack([cm(np.arange(cm.N)), [cm.get_bad()]])
+
+        # Warna teks mengikuti relative luminance warna latar (W3C), ambang 0.408
+        linear = np.where(rgba[:, :3] <= 0.04045, rgba[:, :3]/12.92, ((rgba[:, :3] + 0.055)/1.055)**2.4)
+        gelap = linear @ np.array([0.2126, 0.7152, 0.0722]) < 0.408
+
+        rgb = np.array([[round(x*255) for x in warna_[:3]] for warna_ in rgba], dtype='uint8')
+        css = ['background-color: #%02x%02x%02x;color: %s;'%(r, g, b, '#f1f1f1' if gl else '#000000')
+               for (r, g, b), gl in zip(rgb, gelap)]
+
+        # Tabel lengkap dipasang sekaligus, thread lain melihat None atau tabel utuh
+        _lut_gradien = {'N' : cm.N,
+                        'rgb' : np.vstack([rgb, np.zeros((1, 3), dtype='uint8')]),
+                        'css' : np.array(css + [''], dtype='object')}
+
+    return _lut_gradien
+
+
+def _indeks_gradien(data, kriteria=None):
+    """
+    Menghitung posisi warna gradien tiap sel pada tabel warna _lut_seagreen
+    dengan aturan subset dan vmin/vmax yang sama untuk tiap kriteria
+    """
+
     if kriteria=='UN':
         id_min = -2
     elif (kriteria=='FI') or (kriteria=='LU') or (kriteria=='TOM') or (kriteria=='pekerjaan'):
         id_min = -1
-
     else:
         id_min = len(data)
-        
+
+    vmin = min(data.iloc[:id_min,:].min())
+    vmax = max(data.iloc[:id_min,:].max())
+
+    # Sepuluh (pekerjaan) atau sebelas baris pertama, berdasarkan posisi agar berlaku juga untuk
+    # index bertingkat yang levelnya tidak urut (competitor landscape)
     if kriteria == 'pekerjaan':
-        colored_data = data.style.background_gradient(cmap=cm,
-                                          subset=pd.IndexSlice[data.index[0]:data.index[9], :],
-                                          vmin = min(data.iloc[:id_min,:].min()), vmax = max(data.iloc[:id_min,:].max()))
-    elif kriteria=='competitor':
-        colored_data = data.style.background_gradient(cmap=cm,
-                                              subset=pd.IndexSlice[data.index[0]:data.index[10], :],
-                                              vmin = min(data.iloc[:id_min,:].min()), vmax = max(data.iloc[:id_min,:].max())).highlight_null('royalblue')                                          
-    else:                                      
-        colored_data = data.style.background_gradient(cmap=cm,
-                                          subset=pd.IndexSlice[data.index[0]:data.index[10], :],
-                                          vmin = min(data.iloc[:id_min,:].min()), vmax = max(data.iloc[:id_min,:].max()))
+        baris = slice(0, 10)
+    else:
+        baris = slice(0, 11)
+
+    # Normalisasi dan pemetaan ke 256 warna mengikuti matplotlib Normalize + Colormap
+    lut = _lut_seagreen()
+    n_warna = lut['N']
+    nilai = data.iloc[baris, :].to_numpy(dtype='float64')
+    if vmax == vmin:
+        # Seperti Normalize, semua sel (termasuk NaN) mendapat warna pertama
+        posisi = np.zeros(nilai.shape)
+    else:
+        posisi = (nilai - vmin)/(vmax - vmin)
+    posisi = posisi*n_warna
+    posisi[posisi < 0] = -1
+    posisi[posisi == n_warna] = n_warna - 1
+    posisi = np.clip(posisi, -1, n_warna)
+
+    idx_subset = np.clip(np.nan_to_num(posisi, nan=0).astype('int64'), 0, n_warna - 1)
+    idx_subset[np.isnan(posisi)] = n_warna
+
+    idx_warna = np.full(data.shape, n_warna + 1, dtype='int64')
+    idx_warna[baris, :] = idx_subset
+
+    return idx_warna
+
+
+def warna_gradien(data, kriteria=None):
+    """
+    Menghitung warna conditional formatting (gradien seagreen) tiap sel tabel
+    langsung dalam bentuk array RGB, tanpa render Styler
+
+    Parameter
+    ---------
+    data : tabel nilai
+    kriteria : 'UN', 'FI', 'LU', 'TOM', 'pekerjaan', 'competitor', atau None
+
+    Return
+    ------
+    warna : array RGB uint8 (baris x kolom x 3), sel tanpa warna bernilai 0
+    """
+
+    idx_warna = _indeks_gradien(data, kriteria)
+    warna = _lut_seagreen()['rgb'][idx_warna]
+
+    if kriteria == 'competitor':
+        warna[data.isna().to_numpy()] = [65, 105, 225]
+
+    return warna
+
+
+def tabel_warna(tabel, kriteria=None):
+    """
+    Memasangkan tabel dengan warna gradiennya untuk renderer ppt
+
+    Parameter
+    ---------
+    tabel : tabel nilai atau Styler hasil fungsi_by / conditional_formating
+    kriteria : kriteria warna, sama dengan conditional_formating
+
+    Return
+    ------
+    (data, warna) : tabel nilai dan array RGB hasil warna_gradien
+    """
+
+    data = getattr(tabel, 'data', tabel)
+    return data, warna_gradien(data, kriteria)
+
+
+def conditional_formating(data, kriteria=None):
+    """
+    Memberi warna gradien seagreen pada tabel. Warna sel sama dengan hasil warna_gradien,
+    yang dipakai renderer ppt untuk tabel di memori (lihat tabel_warna).
+    """
+
+    css = _lut_seagreen()['css'][_indeks_gradien(data, kriteria)]
+    css = pd.DataFrame(css, index = data.index, columns = data.columns)
+
+    colored_data = data.style.apply(lambda _: css, axis = None)
+    if kriteria=='competitor':
+        colored_data = colored_data.highlight_null('royalblue')
 
     return colored_data
 
@@ -116,22 +495,22 @@ def sample_size(data, list_kolom):
 
     return sample_size
 
-def hitung_nSampel(data_masukan, kolom1, kolom2 = None):
+def hitung_nSampel(data_masukan, kolom1, kolom2 = None, mask = None):
     """
     Menghitung nilai n Sampel berdasarkan suatu kategori (TOM, LU, FI)
     breakdown by karakteristik responden
 
     Parameter
     ---------
-    data_masukan = data yang akan diolah
+    data_masukan = data yang akan diolah (data responden, frame responden, atau kubus brand)
     kolom1 = kolom kriteria (TOM, LU, FI)
     kolom2 = kolom untuk breakdown (Kota, Usiar, Expandr, Pendidikan atau
     jika tidak di breakdown)
+    mask = array boolean atau nama filter frame responden untuk memilih responden
     """
     if kolom2 == None:
-        ct = pd.crosstab(data_masukan[kolom1], data_masukan[kolom1])
-        nSampel = np.diag(ct)
-        df_nSampel = pd.DataFrame({kolom1: ct.index.to_list(),'nSampel': nSampel})
+        ct = _agregat_brand(data_masukan, kolom1, nilai = 'n', mask = mask)
+        df_nSampel = pd.DataFrame({kolom1: ct.index.to_list(),'nSampel': ct.values})
         df_nSampel = df_nSampel.set_index(kolom1)
         total = df_nSampel.sum(axis = 0).to_frame().transpose()
         total.index = ['Total']
@@ -141,8 +520,9 @@ def hitung_nSampel(data_masukan, kolom1, kolom2 = None):
         return df_nSampel
 
     else:
-        ct = pd.crosstab(data_masukan[kolom1],data_masukan[kolom2])
-        ct.index = ct.index.astype(int)
+        ct = _agregat_brand(data_masukan, kolom1, kolom2, nilai = 'n', mask = mask)
+        if pd.api.types.is_numeric_dtype(ct.index):
+            ct.index = ct.index.astype(int)
         ct.index.rename(kolom1,inplace=True)
 
         total = ct.sum(axis=0).to_frame().transpose()
@@ -227,6 +607,68 @@ def top6_semuaElemen_DuaTahun(data, subkategori, tahun_ini):
     return data, data_sekarang, data_kemarin, merek_top6
 
 
+def kategori_brand(top10_brand):
+    """
+    Membuat tipe kategori brand laporan (top 10 brand dan 'Lainnya')
+
+    Kategori diurutkan secara alfabet agar urutan hasil groupby / crosstab
+    sama dengan urutan brand pada file urutan brand.
+
+    Parameter
+    ---------
+    top10_brand : daftar sepuluh besar brand
+
+    Return
+    ------
+    kategori : pd.CategoricalDtype berurutan untuk kolom brand
+    """
+
+    kategori = pd.CategoricalDtype(sorted(set(top10_brand) | {'Lainnya'}), ordered=True)
+    return kategori
+
+
+def label_brand(data_kode, mascod_bedding, top10_brand):
+    """
+    Mengganti kode brand menjadi nama brand untuk beberapa kolom sekaligus.
+    Brand di luar top 10 (termasuk kode yang tidak ada di mascod) menjadi 'Lainnya'.
+
+    Parameter
+    ---------
+    data_kode : tabel berisi kolom-kolom kode brand (TOM, UN1..UNn, LU, FI)
+    mascod_bedding : file excel daftar brand dengan kodenya
+    top10_brand : daftar sepuluh besar brand
+
+    Return
+    ------
+    df_label : tabel dengan kolom yang sama, bertipe kategori brand
+    """
+
+    kategori = kategori_brand(top10_brand)
+    brand = kategori.categories
+    kode_lainnya = brand.get_loc('Lainnya')
+
+    # Tabel lookup kode mascod -> kode kategori (brand di luar top 10 dilipat ke 'Lainnya')
+    mascod = mascod_bedding.drop_duplicates(subset='Coding', keep='first')
+    kode_mascod = pd.Index(pd.to_numeric(mascod['Coding'], errors='coerce'), dtype='float64')
+    lookup = brand.get_indexer(mascod['Brand'])
+    lookup = np.where(lookup == -1, kode_lainnya, lookup)
+
+    # Semua kolom diproses sekaligus sebagai satu array
+    nilai = data_kode.to_numpy(dtype=object).ravel('F')
+    nilai_numerik = pd.to_numeric(pd.Series(nilai), errors='coerce').to_numpy(dtype='float64')
+    posisi = kode_mascod.get_indexer(nilai_numerik)
+
+    kode = np.where(posisi != -1, lookup[posisi], brand.get_indexer(nilai))
+    kode = np.where(kode == -1, kode_lainnya, kode)
+    kode = np.where(pd.isna(nilai), -1, kode)
+    kode = kode.reshape(data_kode.shape, order='F')
+
+    df_label = pd.DataFrame({kolom: pd.Categorical.from_codes(kode[:, j], dtype=kategori)
+                             for j, kolom in enumerate(data_kode.columns)},
+                            index=data_kode.index)
+    return df_label
+
+
 def data_laporan(data, mascod_bedding,  top10_brand):
     """
     Memformat ulang data masukan dengan mengganti brand yang semula kode manjadi nama brand-nya
@@ -244,16 +686,682 @@ def data_laporan(data, mascod_bedding,  top10_brand):
 
     df_laporan = data.copy()
     col_changed = ['TOM', 'UN1', 'UN2', 'UN3', 'UN4', 'UN5', 'LU', 'FI']
-    n_brand = mascod_bedding.Brand.nunique()
-    for i in range(n_brand):
-        for col_j in col_changed:
-            df_laporan.loc[df_laporan.loc[:,col_j] == mascod_bedding.loc[i,'Coding'], col_j] = mascod_bedding.loc[i,'Brand']
+    df_label = label_brand(df_laporan[col_changed], mascod_bedding, top10_brand)
     for col_j in col_changed:
-        df_laporan.loc[~(pd.isna(df_laporan[col_j])) & ~(df_laporan.loc[:,col_j].isin(top10_brand)), col_j] = 'Lainnya'
+        df_laporan[col_j] = df_label[col_j]
 
     return df_laporan
 
 
+def buat_survey_frame(data, tipe_bobot = 'float64', maks_kategori = 32767):
+    """
+    Representasi ringkas data responden (struct-of-arrays) dengan nama kolom yang sama.
+    Kolom teks (kota, SES, pendidikan, pekerjaan, dst.) disimpan sebagai kategori berkode
+    int8/int16, kolom brand tetap memakai kamus kategori bersama (kategori_brand), kolom
+    bilangan bulat diperkecil tipenya, dan bobot tetap float64 sehingga tabel laporan sama
+    persis dengan data laporan biasa. Semua groupby dan crosstab pada kolom kategori memakai
+    kode bilangan bulat.
+
+    Bobot float32 (tipe_bobot = 'float32') menghemat memori kolom bobot, bobot tersebut
+    dijumlahkan dalam float64 (lihat AKUMULASI_FLOAT64) sehingga tabel laporan hanya berbeda
+    sebatas pembulatan bobot ke float32.
+
+    Parameter
+    ---------
+    data : data laporan yang sudah memiliki nama brand (hasil data_laporan)
+    tipe_bobot : tipe data kolom bobot ('float64' atau 'float32')
+    maks_kategori : jumlah nilai unik maksimum kolom teks yang diubah menjadi kategori
+
+    Return
+    ------
+    survey_frame : tabel data responden dengan tipe data ringkas
+    """
+
+    hasil = {}
+    for kolom in data.columns:
+        isi = data[kolom]
+        if kolom == 'bobot':
+            isi = isi.astype(tipe_bobot)
+        elif isinstance(isi.dtype, pd.CategoricalDtype):
+            pass
+        elif isi.dtype == object:
+            # Kolom teks bebas (hampir semua nilai unik) tidak lebih kecil jika dijadikan kategori
+            n_unik = isi.nunique()
+            if n_unik <= maks_kategori and n_unik*2 <= len(isi):
+                isi = isi.astype('category')
+        elif pd.api.types.is_integer_dtype(isi.dtype):
+            isi = pd.to_numeric(isi, downcast = 'integer')
+        hasil[kolom] = isi
+
+    return pd.DataFrame(hasil, index = data.index)
+
+
+# Bobot float32 (buat_survey_frame) dijumlahkan dalam float64, diisi False untuk
+# menjumlahkan langsung dalam float32
+AKUMULASI_FLOAT64 = True
+
+
+def _bobot_akumulasi(bobot):
+    """
+    Kolom bobot yang siap dijumlahkan (float32 diubah ke float64 jika AKUMULASI_FLOAT64)
+    """
+
+    if AKUMULASI_FLOAT64 and bobot.dtype == np.float32:
+        return bobot.astype(np.float64)
+    return bobot
+
+
+def buat_kubus_brand(data, list_kriteria = None, dimensi = None):
+    """
+    Membuat kubus agregat (kriteria x brand x kota x SES x usia x sex x IR) berisi
+    jumlah bobot dan n sampel. Kubus dibuat sekali dari data laporan lalu dipakai
+    oleh hitung_nilai, hitung_nilai_crosstab, fungsi_by, dan hitung_nSampel
+    sebagai pengganti data responden.
+
+    Parameter
+    ---------
+    data : data laporan yang sudah memiliki nama brand (hasil data_laporan)
+    list_kriteria : kolom kriteria yang dimasukkan ke kubus (default TOM, LU, FI, UN1..UNn)
+    dimensi : kolom karakteristik responden (default kota, expandr, usiar, sex, IR)
+
+    Return
+    ------
+    kubus : tabel dengan kolom kriteria, brand, dimensi, bobot, sisa_bobot, dan n
+            (bobot dan sisa_bobot dari _jumlah_tepat)
+    """
+
+    list_un = get_unaided(data)
+    if list_kriteria == None:
+        list_kriteria = ['TOM', 'LU', 'FI'] + list_un
+    if dimensi == None:
+        dimensi = ['kota', 'expandr', 'usiar', 'sex', 'IR']
+
+    # Semua kolom kriteria ditumpuk menjadi satu tabel panjang, kolom UN1..UNn digabung menjadi UN
+    n_data = len(data)
+    nama_kriteria = ['UN' if k in list_un else k for k in list_kriteria]
+    # Hanya baris yang menyebut brand yang diambil data demografinya
+    brand = pd.concat([data[k] for k in list_kriteria], ignore_index = True)
+    ada = brand.notna().to_numpy()
+    baris = np.tile(np.arange(n_data), len(list_kriteria))[ada]
+    dt_panjang = data[dimensi + ['bobot']].iloc[baris].reset_index(drop = True)
+    dt_panjang['bobot'] = _bobot_akumulasi(dt_panjang['bobot'])
+    dt_panjang.insert(0, 'kriteria', np.repeat(nama_kriteria, n_data)[ada])
+    dt_panjang.insert(1, 'brand', brand[ada].reset_index(drop = True))
+
+    kunci = ['kriteria', 'brand'] + dimensi
+    bobot, sisa_bobot = _jumlah_tepat(dt_panjang, kunci, ['bobot'])
+    kubus = dt_panjang.groupby(kunci, observed = True, dropna = False).size().to_frame('n')
+    kubus.insert(0, 'bobot', bobot)
+    kubus.insert(1, 'sisa_bobot', sisa_bobot)
+
+    return kubus.reset_index()
+
+
+def _jumlah_tepat(data, kunci, kolom):
+    """
+    Menjumlahkan kolom per kelompok tanpa galat pembulatan. Jumlah tiap kelompok dihitung
+    tepat (math.fsum) lalu dibulatkan sekali ke float64, dan sisa pembulatannya disimpan
+    terpisah. Jumlah + sisa beberapa kelompok (sel kubus, kubus per shard) yang dijumlahkan
+    ulang dengan fungsi ini tetap sama dengan jumlah langsung dari seluruh data responden,
+    berapa pun banyak dan urutan kelompoknya.
+
+    Parameter
+    ---------
+    data : tabel berisi kolom kunci dan kolom nilai
+    kunci : list kolom pengelompokan
+    kolom : list kolom nilai yang dijumlahkan bersama, misalnya ['bobot', 'sisa_bobot']
+
+    Return
+    ------
+    jumlah : series jumlah per kelompok
+    sisa : series sisa pembulatan jumlah per kelompok
+    """
+
+    panjang = pd.concat([data[kunci + [k]].rename(columns = {k : 'nilai'}) for k in kolom], ignore_index = True)
+    jumlah = panjang.groupby(kunci, observed = True, dropna = False)['nilai'].agg(math.fsum)
+    koreksi = (-jumlah).reset_index()
+    sisa = pd.concat([panjang, koreksi], ignore_index = True)
+    sisa = sisa.groupby(kunci, observed = True, dropna = False)['nilai'].agg(math.fsum)
+
+    return jumlah.rename(None), sisa.rename(None)
+
+
+def _is_kubus(data):
+    """
+    Mengecek apakah data masukan berupa kubus brand (hasil buat_kubus_brand)
+    """
+
+    return {'kriteria', 'brand', 'n'}.issubset(data.columns)
+
+
+def buat_frame_responden(data):
+    """
+    Membungkus data responden (data laporan) bersama cache mask filternya. Tiap filter
+    bernama (IR, non user, TOM = LU, top 10) dihitung sekali saat pertama dipakai lalu
+    disimpan sebagai bit array (np.packbits), mask boolean yang sudah dibuka disimpan per
+    kombinasi filter. Fungsi agregasi yang menerima frame ini memakai mask tersebut tanpa
+    membuat salinan subset data.
+
+    Parameter
+    ---------
+    data : data laporan yang sudah memiliki nama brand (hasil data_laporan)
+
+    Return
+    ------
+    frame : dict berisi data, n (jumlah baris), mask (cache bit array per nama filter), dan
+            mask_terbuka (cache mask boolean per tuple nama filter)
+    """
+
+    return {'data' : data, 'n' : len(data), 'mask' : {}, 'mask_terbuka' : {}}
+
+
+def _is_frame(data):
+    """
+    Mengecek apakah data masukan berupa frame responden (hasil buat_frame_responden)
+    """
+
+    return isinstance(data, dict) and 'mask' in data
+
+
+def _hitung_filter(data, nama):
+    """
+    Menghitung mask boolean filter bernama pada data responden
+    """
+
+    if nama == 'ir':
+        mask = data['IR'] == 'Ya'
+    elif nama == 'non_user':
+        mask = data['IR'] == 'Tidak'
+    elif nama == 'tom_lu':
+        mask = data['TOM'] == data['LU']
+    elif nama == 'tom_beda_lu':
+        mask = data['TOM'] != data['LU']
+    elif nama.startswith('top10_'):
+        kolom = data[nama[len('top10_'):]]
+        mask = kolom.notna() & (kolom != 'Lainnya')
+    else:
+        raise ValueError('Filter %s tidak dikenal (ir, non_user, tom_lu, tom_beda_lu, top10_<kolom>)'%(nama))
+
+    return np.asarray(mask, dtype = bool)
+
+
+def mask_responden(frame, *nama):
+    """
+    Mask boolean responden yang memenuhi semua filter bernama. Mask tiap filter diambil
+    dari cache frame (dihitung sekali), gabungan beberapa filter dihitung langsung pada
+    bit array. Mask yang sudah dibuka disimpan per tuple nama filter dan dikembalikan
+    read-only, sehingga pemakaian berulang tidak membuka bit array lagi.
+
+    Parameter
+    ---------
+    frame : frame responden (hasil buat_frame_responden)
+    nama : nama filter, yaitu 'ir', 'non_user', 'tom_lu', 'tom_beda_lu', atau 'top10_<kolom>'
+           (brand pada kolom TOM/LU/FI termasuk sepuluh besar)
+
+    Return
+    ------
+    mask : array boolean (read-only) sepanjang data responden
+    """
+
+    terbuka = frame['mask_terbuka']
+    if nama in terbuka:
+        return terbuka[nama]
+
+    bit = None
+    for nama_i in nama:
+        if nama_i not in frame['mask']:
+            frame['mask'][nama_i] = np.packbits(_hitung_filter(frame['data'], nama_i))
+        bit = frame['mask'][nama_i] if bit is None else bit & frame['mask'][nama_i]
+
+    mask = np.unpackbits(bit, count = frame['n']).astype(bool)
+    mask.flags.writeable = False
+    terbuka[nama] = mask
+    return mask
+
+
+def _terapkan_filter(data_used, mask = None, non_user = False):
+    """
+    Menyiapkan data dan mask untuk agregasi. Frame responden dibuka menjadi data
+    responden, mask dapat berupa nama filter (atau list nama filter, khusus frame
+    responden) maupun array boolean. Untuk kubus brand, non_user langsung memfilter
+    kubus karena kubus tidak menyimpan baris responden.
+
+    Return
+    ------
+    data_used : data responden atau kubus brand
+    mask : array boolean atau None (tanpa filter)
+    """
+
+    if _is_frame(data_used):
+        nama = ['non_user'] if non_user == True else []
+        if isinstance(mask, str):
+            nama.append(mask)
+            mask = None
+        elif isinstance(mask, (list, tuple)):
+            nama.extend(mask)
+            mask = None
+        if mask is not None:
+            mask = np.asarray(mask, dtype = bool)
+        if len(nama) > 0:
+            mask_nama = mask_responden(data_used, *nama)
+            mask = mask_nama if mask is None else mask & mask_nama
+        return data_used['data'], mask
+
+    if isinstance(mask, (str, list, tuple)):
+        raise ValueError('Mask bernama hanya dapat dipakai pada frame responden (buat_frame_responden)')
+
+    if _is_kubus(data_used):
+        if mask is not None:
+            raise ValueError('Mask responden tidak dapat dipakai pada kubus brand')
+        if non_user == True:
+            data_used = data_used[data_used.IR == 'Tidak']
+        return data_used, None
+
+    if mask is not None:
+        mask = np.asarray(mask, dtype = bool)
+    if non_user == True:
+        mask_nu = np.asarray(data_used['IR'] == 'Tidak', dtype = bool)
+        mask = mask_nu if mask is None else mask & mask_nu
+    return data_used, mask
+
+
+def _agregat_brand(data_used, kriteria, by = None, nilai = 'bobot', mask = None):
+    """
+    Menjumlahkan bobot atau n sampel per brand, dengan breakdown opsional.
+    Data masukan dapat berupa data responden, frame responden, maupun kubus brand.
+
+    Parameter
+    ---------
+    data_used : data responden, frame responden, atau kubus brand
+    kriteria : TOM, UN, LU, atau FI
+    by : kolom untuk breakdown (kota, expandr, usiar, sex) atau None
+    nilai : 'bobot' untuk jumlah bobot, 'n' untuk jumlah sampel
+    mask : array boolean atau nama filter frame responden untuk memilih responden
+
+    Return
+    ------
+    agregat : series per brand (by = None) atau tabel brand x by
+    """
+
+    data_used, mask = _terapkan_filter(data_used, mask)
+
+    if _is_kubus(data_used):
+        # Sel kubus dijumlahkan tepat (bobot + sisa_bobot), hasilnya sama dengan penjumlahan data responden
+        data_used = data_used[data_used['kriteria'] == kriteria].rename(columns = {'brand' : kriteria})
+        kunci = [kriteria] if by == None else [kriteria, by]
+        data_used = data_used.dropna(subset = kunci)
+        if nilai == 'bobot':
+            agregat, _ = _jumlah_tepat(data_used, kunci, ['bobot', 'sisa_bobot'])
+        else:
+            agregat = data_used.groupby(kunci, observed = True)['n'].sum()
+    else:
+        kunci = [data_used[kriteria]]
+        if by != None:
+            kunci.append(data_used[by])
+        if nilai == 'bobot':
+            isi = _bobot_akumulasi(data_used['bobot'])
+        else:
+            isi = pd.Series(1, index = data_used.index)
+        if mask is not None:
+            kunci = [k[mask] for k in kunci]
+            isi = isi[mask]
+        agregat = isi.groupby(kunci, observed = True).sum()
+    # Kunci kategori (buat_survey_frame) diurutkan sesuai kategorinya, sama seperti urutan kunci teks
+    agregat = agregat.sort_index()
+    agregat.name = nilai
+
+    if by != None:
+        agregat = agregat.unstack(by, fill_value = 0)
+
+    return agregat
+
+
+def _is_agregat(data):
+    """
+    Mengecek apakah data masukan berupa agregat laporan (hasil buat_agregat / agregat_shard)
+    """
+
+    return isinstance(data, dict) and 'kubus' in data
+
+
+def _bobot_switching(data_used):
+    """
+    Jumlah bobot crosstab LU x FI dari data responden atau agregat laporan
+    """
+
+    if _is_agregat(data_used):
+        return data_used['switching'].copy()
+
+    bobot_switching = pd.crosstab(index = data_used['LU'], columns = data_used['FI'], values = _bobot_akumulasi(data_used.bobot), aggfunc = sum)
+    bobot_switching.fillna(0, inplace = True)
+    return bobot_switching
+
+
+def _bobot_conv_rate(data_used, nilai = 'bobot'):
+    """
+    Jumlah bobot (nilai = 'bobot') atau n sampel (nilai = 'n') per brand untuk
+    conversion rate (TOM, CR, UOB, ABNU, NABU) dari data responden atau agregat laporan
+    """
+
+    if _is_agregat(data_used):
+        return data_used['conv_rate' if nilai == 'bobot' else 'n_conv_rate']
+
+    frame = data_used if _is_frame(data_used) else buat_frame_responden(data_used)
+    tom, lu, bobot = frame['data']['TOM'], frame['data']['LU'], _bobot_akumulasi(frame['data']['bobot'])
+    cr = mask_responden(frame, 'tom_lu')
+    uob = mask_responden(frame, 'ir', 'tom_beda_lu')
+    abnu = mask_responden(frame, 'non_user')
+    grup = {'TOM' : bobot.groupby(tom),
+            'CR' : bobot[cr].groupby(tom[cr]),
+            'UOB' : bobot[uob].groupby(tom[uob]),
+            'ABNU' : bobot[abnu].groupby(tom[abnu]),
+            'NABU' : bobot[uob].groupby(lu[uob])}
+    if nilai == 'bobot':
+        return {kolom : g.sum() for kolom, g in grup.items()}
+    return {kolom : g.size() for kolom, g in grup.items()}
+
+
+def buat_agregat(data):
+    """
+    Membuat agregat laporan, yaitu seluruh jumlah bobot dan n sampel yang dibutuhkan
+    tabel indeks (kubus brand), brand switching (crosstab LU x FI), dan conversion rate.
+    Semua isinya aditif sehingga agregat dari beberapa bagian data dapat dijumlahkan
+    dengan gabung_agregat (atau dikurangkan dengan kurangi_agregat) dan menghasilkan
+    tabel yang sama dengan data utuh. Crosstab switching dan bobot conversion rate
+    disertai n sampelnya agar brand yang datanya habis setelah dikurangi ikut hilang.
+
+    Parameter
+    ---------
+    data : data laporan yang sudah memiliki nama brand (hasil data_laporan)
+
+    Return
+    ------
+    agregat : dict berisi kubus, switching, n_switching, conv_rate, dan n_conv_rate
+    """
+
+    return {'kubus' : buat_kubus_brand(data),
+            'switching' : _bobot_switching(data),
+            'n_switching' : pd.crosstab(index = data['LU'], columns = data['FI']),
+            'conv_rate' : _bobot_conv_rate(data),
+            'n_conv_rate' : _bobot_conv_rate(data, 'n')}
+
+
+def gabung_agregat(list_agregat):
+    """
+    Menjumlahkan beberapa agregat laporan (tahap reduce)
+
+    Parameter
+    ---------
+    list_agregat : list agregat hasil buat_agregat
+
+    Return
+    ------
+    agregat : agregat gabungan
+    """
+
+    kubus = pd.concat([agregat['kubus'] for agregat in list_agregat], ignore_index = True)
+    kunci = [k for k in kubus.columns if k not in ['bobot', 'sisa_bobot', 'n']]
+    bobot, sisa_bobot = _jumlah_tepat(kubus, kunci, ['bobot', 'sisa_bobot'])
+    kubus = kubus.groupby(kunci, observed = True, dropna = False)[['n']].sum()
+    kubus.insert(0, 'bobot', bobot)
+    kubus.insert(1, 'sisa_bobot', sisa_bobot)
+    kubus = kubus.reset_index()
+
+    hasil = {'kubus' : kubus}
+    for nama in ['switching', 'n_switching']:
+        hasil[nama] = list_agregat[0][nama]
+        for agregat in list_agregat[1:]:
+            hasil[nama] = hasil[nama].add(agregat[nama], fill_value = 0)
+    for nama in ['conv_rate', 'n_conv_rate']:
+        hasil[nama] = dict(list_agregat[0][nama])
+        for agregat in list_agregat[1:]:
+            for kolom in hasil[nama]:
+                hasil[nama][kolom] = hasil[nama][kolom].add(agregat[nama][kolom], fill_value = 0)
+
+    return hasil
+
+
+def kurangi_agregat(agregat, agregat_kurang):
+    """
+    Mengurangkan agregat sebagian data (misalnya responden yang dihapus atau dikoreksi)
+    dari agregat laporan. Kelompok yang n sampelnya menjadi 0 dihapus, sehingga hasilnya
+    sama dengan agregat yang dibuat ulang tanpa data tersebut.
+
+    Parameter
+    ---------
+    agregat : agregat laporan
+    agregat_kurang : agregat data yang dikurangkan (hasil buat_agregat)
+
+    Return
+    ------
+    agregat : agregat hasil pengurangan
+    """
+
+    kubus_kurang = agregat_kurang['kubus'].copy()
+    kubus_kurang[['bobot', 'sisa_bobot', 'n']] = -kubus_kurang[['bobot', 'sisa_bobot', 'n']]
+    negatif = {'kubus' : kubus_kurang,
+               'switching' : -agregat_kurang['switching'],
+               'n_switching' : -agregat_kurang['n_switching'],
+               'conv_rate' : {k : -v for k, v in agregat_kurang['conv_rate'].items()},
+               'n_conv_rate' : {k : -v for k, v in agregat_kurang['n_conv_rate'].items()}}
+    hasil = gabung_agregat([agregat, negatif])
+
+    hasil['kubus'] = hasil['kubus'][hasil['kubus']['n'] != 0].reset_index(drop = True)
+
+    n_switching = hasil['n_switching']
+    baris = n_switching.index[n_switching.sum(axis = 1) != 0]
+    kolom = n_switching.columns[n_switching.sum(axis = 0) != 0]
+    n_switching = n_switching.loc[baris, kolom]
+    hasil['n_switching'] = n_switching
+    hasil['switching'] = hasil['switching'].loc[baris, kolom].where(n_switching != 0, 0)
+
+    for k in hasil['n_conv_rate']:
+        ada = hasil['n_conv_rate'][k] != 0
+        hasil['n_conv_rate'][k] = hasil['n_conv_rate'][k][ada]
+        hasil['conv_rate'][k] = hasil['conv_rate'][k][ada]
+
+    return hasil
+
+
+def bagi_shard(data, kolom = 'kota', n_baris = None):
+    """
+    Membagi data responden menjadi beberapa shard, per nilai kolom (default kota)
+    atau per n_baris baris
+
+    Parameter
+    ---------
+    data : data responden
+    kolom : kolom pembagi shard (dipakai jika n_baris None)
+    n_baris : jumlah baris tiap shard
+
+    Return
+    ------
+    list_shard : list tabel shard
+    """
+
+    if n_baris != None:
+        return [data.iloc[i:i+n_baris] for i in range(0, len(data), n_baris)]
+    return [shard for _, shard in data.groupby(kolom, sort = False, dropna = False)]
+
+
+def _agregat_satu_shard(shard, mascod_bedding, top10_brand):
+    """
+    Tahap map: membaca satu shard (tabel atau path file excel) lalu membuat agregatnya
+    """
+
+    if isinstance(shard, str):
+        shard = baca_excel(shard)
+    return buat_agregat(data_laporan(shard, mascod_bedding, top10_brand))
+
+
+def agregat_shard(list_shard, mascod_bedding, top10_brand, n_proses = None):
+    """
+    Membuat agregat laporan secara map-reduce. Tiap shard data responden (misalnya satu
+    file per kota) diolah di proses terpisah menjadi agregat parsial, lalu agregat parsial
+    dijumlahkan begitu selesai. Data responden utuh tidak pernah dimuat di satu proses.
+
+    Hasilnya dipakai seperti kubus brand / data responden:
+    kubus (hitung_nilai, hitung_nilai_crosstab, fungsi_by, hitung_nSampel, hitung_unaided),
+    kubus IR = Ya (hitung_bobot_cl, n_sample_user), dan agregat itu sendiri
+    (hitung_brand_switch, tabel_brand_switch, hitung_conv_rate).
+
+    Parameter
+    ---------
+    list_shard : list shard, berupa tabel data responden (belum diberi nama brand) atau path file excel
+    mascod_bedding : file excel daftar brand dengan kodenya
+    top10_brand : daftar sepuluh besar brand
+    n_proses : jumlah proses, 1 untuk tanpa proses tambahan (default jumlah core)
+
+    Return
+    ------
+    agregat : agregat laporan gabungan seluruh shard
+    """
+
+    agregat = None
+    if n_proses == 1:
+        list_parsial = (_agregat_satu_shard(shard, mascod_bedding, top10_brand) for shard in list_shard)
+        for parsial in list_parsial:
+            agregat = parsial if agregat == None else gabung_agregat([agregat, parsial])
+        return agregat
+
+    with ProcessPoolExecutor(n_proses) as pool:
+        n_shard = len(list_shard)
+        for parsial in pool.map(_agregat_satu_shard, list_shard, [mascod_bedding]*n_shard, [top10_brand]*n_shard):
+            agregat = parsial if agregat == None else gabung_agregat([agregat, parsial])
+
+    return agregat
+
+
+
+def _kolom_agregat(nama_kolom):
+    """
+    Kolom data responden yang dipakai buat_agregat
+    """
+
+    nama_kolom = str(nama_kolom)
+    return (nama_kolom in ['TOM', 'LU', 'FI', 'kota', 'expandr', 'usiar', 'sex', 'IR', 'bobot']
+            or (nama_kolom.startswith('UN') and nama_kolom[2:].isdigit()))
+
+
+def agregat_bertahap(nama_file, mascod_bedding, top10_brand, n_baris = 10000, sheet_name = 0):
+    """
+    Membuat agregat laporan dengan membaca file data responden per potongan (baca_bertahap).
+    Tiap potongan diberi nama brand dan langsung dijumlahkan ke agregat, hanya kolom yang
+    dibutuhkan agregat yang dibaca, sehingga memori puncak bergantung pada n_baris dan
+    bukan pada jumlah sampel.
+
+    Parameter
+    ---------
+    nama_file : path file data responden (csv, parquet, atau xlsx)
+    mascod_bedding : file excel daftar brand dengan kodenya
+    top10_brand : daftar sepuluh besar brand
+    n_baris : jumlah baris tiap potongan
+    sheet_name : nama atau nomor sheet (khusus xlsx)
+
+    Return
+    ------
+    agregat : agregat laporan seluruh data
+    """
+
+    list_potongan = baca_bertahap(nama_file, n_baris, sheet_name, _kolom_agregat)
+    return agregat_shard(list_potongan, mascod_bedding, top10_brand, n_proses = 1)
+
+
+def buat_store(data, mascod_bedding, top10_brand, kunci = ['panel', 'no_entry']):
+    """
+    Membuat store agregat untuk pengolahan bertahap selama fieldwork: data responden
+    mentah (kunci unik per responden) beserta agregat laporannya. Batch data berikutnya
+    cukup dimasukkan dengan update_store tanpa mengolah ulang seluruh data.
+
+    Parameter
+    ---------
+    data : data responden (belum diberi nama brand)
+    mascod_bedding : file excel daftar brand dengan kodenya
+    top10_brand : daftar sepuluh besar brand
+    kunci : kolom kunci responden (no_entry berulang antar panel, sehingga default panel dan no_entry)
+
+    Return
+    ------
+    store : dict berisi data, agregat, mascod_bedding, top10_brand, dan kunci
+    """
+
+    data = data.drop_duplicates(kunci, keep = 'last').reset_index(drop = True)
+
+    return {'data' : data,
+            'agregat' : buat_agregat(data_laporan(data, mascod_bedding, top10_brand)),
+            'mascod_bedding' : mascod_bedding,
+            'top10_brand' : top10_brand,
+            'kunci' : list(kunci)}
+
+
+def update_store(store, data_baru = None, hapus = None):
+    """
+    Memasukkan batch responden ke store. Responden yang kuncinya sudah ada dianggap
+    koreksi (data lama diganti), responden pada hapus dikeluarkan. Agregat diperbarui
+    hanya dari baris yang berubah: agregat baris lama dikurangkan, agregat baris baru
+    dijumlahkan.
+
+    Parameter
+    ---------
+    store : store agregat (hasil buat_store / update_store / baca_store)
+    data_baru : data responden baru atau koreksi (belum diberi nama brand)
+    hapus : kunci responden yang dihapus, berupa tabel kolom kunci atau list tuple kunci
+
+    Return
+    ------
+    store : store agregat yang sudah diperbarui
+    """
+
+    kunci = store['kunci']
+    data = store['data']
+    agregat = store['agregat']
+
+    list_kunci = []
+    if data_baru is not None:
+        data_baru = data_baru.drop_duplicates(kunci, keep = 'last')
+        list_kunci.append(data_baru[kunci])
+    if hapus is not None:
+        if not isinstance(hapus, pd.DataFrame):
+            hapus = pd.DataFrame(list(hapus), columns = kunci)
+        list_kunci.append(hapus[kunci])
+    if len(list_kunci) == 0:
+        return store
+
+    kunci_ganti = pd.MultiIndex.from_frame(pd.concat(list_kunci, ignore_index = True))
+    lama = pd.MultiIndex.from_frame(data[kunci]).isin(kunci_ganti)
+
+    if lama.any():
+        agregat_lama = buat_agregat(data_laporan(data[lama], store['mascod_bedding'], store['top10_brand']))
+        agregat = kurangi_agregat(agregat, agregat_lama)
+    if data_baru is not None and len(data_baru) > 0:
+        agregat_baru = buat_agregat(data_laporan(data_baru, store['mascod_bedding'], store['top10_brand']))
+        agregat = gabung_agregat([agregat, agregat_baru])
+        data = pd.concat([data[~lama], data_baru], ignore_index = True)
+    else:
+        data = data[~lama].reset_index(drop = True)
+
+    store = dict(store)
+    store['data'] = data
+    store['agregat'] = agregat
+    return store
+
+
+def simpan_store(store, nama_file):
+    """
+    Menyimpan store agregat ke file (pickle)
+    """
+
+    pd.to_pickle(store, nama_file)
+
+
+def baca_store(nama_file):
+    """
+    Membaca store agregat dari file hasil simpan_store
+    """
+
+    return pd.read_pickle(nama_file)
+
+
 def data_ir(data):
     """
     Membuat tabel data perbandingan n Sampel dengan IR 'Ya' dan 'IR' tidak
@@ -296,25 +1404,33 @@ def data_ir(data):
     return tabel_totalBawah, persen_tabel
 
 
-def profil_responden(data, kolom1, kolom2, sorter1, sorter2 = None):
+def profil_responden(data, kolom1, kolom2, sorter1, sorter2 = None, mask = None):
     """
     Membuat data tabel profil responden
 
     Parameter
     ---------
-    data : data yang akan diolah
+    data : data yang akan diolah (data responden atau frame responden)
     kolom1 : LU atau FI
     kolom2 : kolom untuk breakdown kolom1
     sorter1 : data series untuk mengurutkan brand
     sorter2 : list ubtuk sorter karakter responden
+    mask : array boolean atau nama filter frame responden (misalnya 'ir') untuk memilih responden
     Return
     ------
     total_saja : tabel yang berisi total n sampel masing-masing kategori kolom
     tabel_totalBawah : tabel yang berisi n sampel masing-masing kategori kolom untuk seluruh Brand
     """
 
-    crosstab = pd.crosstab(data[kolom1],
-                              data[kolom2])
+    data, mask = _terapkan_filter(data, mask)
+    baris, kolom = data[kolom1], data[kolom2]
+    if mask is not None:
+        baris, kolom = baris[mask], kolom[mask]
+    if isinstance(kolom.dtype, pd.CategoricalDtype):
+        kolom = kolom.cat.remove_unused_categories()
+
+    crosstab = pd.crosstab(baris,
+                              kolom)
     crosstab.index.rename(kolom1,inplace=True)
 
     if sorter2 != None:
@@ -364,16 +1480,17 @@ def presentase_profil(data_masukan):
     
     return(dt_pekerjaan)
 
-def hitung_nilai(kriteria, data_used, indeks_brand, non_user = False):
+def hitung_nilai(kriteria, data_used, indeks_brand, non_user = False, mask = None):
     """
     Menghitung nilai indeks kriteria (TOM, LU, atau FI) untuk top Brand.
 
     Parameter
     ---------
     kriteria : TOM, LU, atau FI
-    data_used : data yang akan diolah
+    data_used : data yang akan diolah (data responden, frame responden, atau kubus brand)
     indeks_brand : data series untuk mengurutkan brand
     non_user : Jika TRUE, akan menghitung data yang memiliki nilai IR = 'Tidak'
+    mask : array boolean atau nama filter frame responden untuk memilih responden (tanpa salinan subset)
 
     Return
     ------
@@ -381,11 +1498,10 @@ def hitung_nilai(kriteria, data_used, indeks_brand, non_user = False):
     sum_bobot_ : tabel nilai total bobot brand
     """
 
-    if (non_user == True):
-        data_used = data_used[data_used.IR == 'Tidak']
+    data_used, mask = _terapkan_filter(data_used, mask, non_user)
 
     # Menghitung sum bobot cross tab by tom
-    sum_bobot_ = data_used[['bobot',kriteria]].groupby(kriteria).sum()
+    sum_bobot_ = _agregat_brand(data_used, kriteria, mask = mask).to_frame()
     sum_bobot_.reset_index(inplace = True)
     total_bobot_ = pd.DataFrame({kriteria:['Total'], 'bobot':[sum(sum_bobot_.bobot)]})
     sum_bobot_ = pd.concat([sum_bobot_, total_bobot_], axis = 0)
@@ -443,7 +1559,7 @@ def hitung_gap(df_kriteria_sort, top10_brand):
 
 
 def hitung_nilai_crosstab(kriteria, by, data_used, indeks_brand, indeks_kolom = [], non_user = False,
-                         dt_tom = None):
+                         dt_tom = None, mask = None):
     """
     Membuat tabel crosstab untuk pemetaan top brand
 
@@ -451,24 +1567,22 @@ def hitung_nilai_crosstab(kriteria, by, data_used, indeks_brand, indeks_kolom =
     ---------
     kriteria : diisi TOM, UN, LU, atau FI
     by : kolom tabel crosstab terhadap tiap Brand
-    data_used : data yang digunakan untuk pengolahan crosstab
+    data_used : data yang digunakan untuk pengolahan crosstab (data responden, frame responden, atau kubus brand)
     indeks_brand : daftar brand untuk mengurutkan brand
     indeks_kolom : kolom custom yang digunakan untuk output data
     non_user: jika TRUE, data laporan yang diambil adalah yang IR='Tidak'
-    dt_tom : data laporan keseluruhan yang digunakan
+    dt_tom : data laporan keseluruhan yang digunakan (data responden, frame responden, atau kubus brand)
+    mask : array boolean atau nama filter frame responden untuk memilih responden data_used
 
     Return
     ------
     df_kriteria_by : tabel crosstab hasil perhitungan
     """
 
-    if (non_user == True):
-        data_used = data_used[data_used.IR == 'Tidak']
+    data_used, mask = _terapkan_filter(data_used, mask, non_user)
 
     # Menghitung sum bobot cross tab by kriteria dan karakter responden terpilih
-    sum_bobot_ = pd.crosstab(index = data_used[kriteria], columns = data_used[by], values = data_used.bobot, aggfunc = sum)
-    sum_bobot_.fillna(0, inplace = True)
-    sum_bobot_.index.rename(kriteria, inplace=True)
+    sum_bobot_ = _agregat_brand(data_used, kriteria, by, mask = mask)
 
     # Menghitung total bobot per kota
     total_bobot_ = sum_bobot_.sum(axis = 0).to_frame().transpose()
@@ -480,8 +1594,7 @@ def hitung_nilai_crosstab(kriteria, by, data_used, indeks_brand, indeks_kolom =
     df_kriteria_by = sum_bobot_.copy()
 
     if kriteria=='UN':
-        sum_bobot_1 = pd.crosstab(index = dt_tom['TOM'], columns = dt_tom[by], values = dt_tom.bobot, aggfunc = sum)
-        sum_bobot_1.fillna(0, inplace = True)
+        sum_bobot_1 = _agregat_brand(dt_tom, 'TOM', by)
         sum_bobot_1.index.rename(kriteria, inplace=True)
         total_bobot_1 = sum_bobot_1.sum(axis = 0).to_frame().transpose()
         total_bobot_1.index = ['Total']
@@ -528,7 +1641,7 @@ def hitung_nilai_crosstab(kriteria, by, data_used, indeks_brand, indeks_kolom =
     return df_kriteria_by
 
 
-def fungsi_by(kriteria, kolom, tabel_indeks, data_masukan):
+def fungsi_by(kriteria, kolom, tabel_indeks, data_masukan, mask = None):
     """
     Mengubah kolom brand menjadi indeks dan menambah baris data n sample
 
@@ -537,7 +1650,8 @@ def fungsi_by(kriteria, kolom, tabel_indeks, data_masukan):
     kriteria : diisi TOM, LU, atau FI
     kolom : nama kolom untuk crosstabulasi
     tabel_indeks : tabel indeks yang akan diolah
-    data_masukan : tabel data acuan keseluruhan
+    data_masukan : tabel data acuan keseluruhan (data responden, frame responden, atau kubus brand)
+    mask : array boolean atau nama filter frame responden (misalnya 'non_user') untuk n sample
 
     Return
     ------
@@ -546,9 +1660,7 @@ def fungsi_by(kriteria, kolom, tabel_indeks, data_masukan):
 
     tabel_indeks.columns = ['Brand']+tabel_indeks.columns[1:].to_list()
 
-    tb_crosstab = pd.crosstab(data_masukan[kriteria],
-                              data_masukan[kolom])
-    tb_crosstab.index.rename(kriteria,inplace=True)
+    tb_crosstab = _agregat_brand(data_masukan, kriteria, kolom, nilai = 'n', mask = mask)
 
     total_tb_kriteria = tb_crosstab.sum(axis=0).to_frame().transpose()
     total_tb_kriteria.index = ['Total']
@@ -578,6 +1690,35 @@ def fungsi_by(kriteria, kolom, tabel_indeks, data_masukan):
     return tabel_indeks
 
 
+def _bulatkan(nilai, desimal):
+    """
+    Membulatkan array dengan aturan round() python, yaitu pembulatan tepat dari nilai biner
+    float (half to even), misalnya round(2.675, 2) = 2.67. np.round mengalikan dengan
+    10**desimal terlebih dahulu sehingga nilai yang tepat di batas .x5 bisa dibulatkan ke
+    arah lain. Array dibulatkan dengan np.round, lalu hanya nilai di sekitar batas
+    pembulatan yang dihitung ulang dengan round().
+
+    Parameter
+    ---------
+    nilai : array / tabel angka
+    desimal : jumlah angka di belakang koma
+
+    Return
+    ------
+    hasil : array float64 hasil pembulatan
+    """
+
+    nilai = np.asarray(nilai, dtype = 'float64')
+    hasil = np.round(nilai, desimal)
+
+    with np.errstate(invalid = 'ignore'):
+        skala = nilai*10.0**desimal
+        batas = np.abs(skala - np.floor(skala) - 0.5) < 1e-6
+    hasil[batas] = [round(x, desimal) for x in nilai[batas].tolist()]
+
+    return hasil
+
+
 def hitung_tbi(tom, lu, fi):
     """
     Menghitung nilai TBI tiap brand menggunakan tabel TOM, LU, dan FI
@@ -593,14 +1734,11 @@ def hitung_tbi(tom, lu, fi):
     tbi : tabel dengan nilai indeks TBI per brand
     """
 
-    dt_tbi = pd.DataFrame(columns=['Brand','TBI'],index=range(len(tom)))
-    for jml_brand in range(len(dt_tbi)):
-        dt_tbi.loc[jml_brand, 'Brand'] = tom.loc[jml_brand, 'Brand']
-        dt_tbi.loc[jml_brand, 'TBI'] = float(0.4*tom.loc[jml_brand,'Mind Share'] +
-                                    0.3*lu.loc[jml_brand,'Market Share'] +
-                                    0.3*fi.loc[jml_brand,'Commitment Share'])
-    dt_tbi['TBI'] = dt_tbi['TBI'].astype('float64')
-    dt_tbi['TBI'] = dt_tbi['TBI'].round(decimals=1)
+    nilai_tbi = (0.4*tom['Mind Share'].to_numpy(dtype='float64') +
+                 0.3*lu['Market Share'].to_numpy(dtype='float64') +
+                 0.3*fi['Commitment Share'].to_numpy(dtype='float64'))
+    dt_tbi = pd.DataFrame({'Brand': tom['Brand'].to_numpy(),
+                           'TBI': _bulatkan(nilai_tbi, 1)})
 
     return dt_tbi
 
@@ -620,14 +1758,15 @@ def crosstab_tbi(tom, lu, fi):
     tbi : tabel dengan crosstabulasi indeks TBI per brand
     """
 
-    dt_tbi_by = pd.DataFrame(columns=tom.columns,index=tom.index)
-    for brand in dt_tbi_by.index:
-        for kolom in dt_tbi_by.columns:
-            dt_tbi_by.loc[brand, kolom] = float(0.4*tom.loc[brand,kolom] +
-                                         0.3*lu.loc[brand,kolom]+
-                                         0.3*fi.loc[brand,kolom])
-            dt_tbi_by.loc[brand, kolom] = round(dt_tbi_by.loc[brand,kolom],1)
-    dt_tbi_by = dt_tbi_by.drop(labels = 'n Sample', axis = 0)
+    tom = tom.drop(labels = 'n Sample', axis = 0)
+
+    # Tabel LU dan FI disejajarkan dengan brand dan kolom tabel TOM
+    blok_tom = tom.to_numpy(dtype='float64')
+    blok_lu = lu.reindex(index=tom.index, columns=tom.columns).to_numpy(dtype='float64')
+    blok_fi = fi.reindex(index=tom.index, columns=tom.columns).to_numpy(dtype='float64')
+
+    nilai_tbi = _bulatkan(0.4*blok_tom + 0.3*blok_lu + 0.3*blok_fi, 1)
+    dt_tbi_by = pd.DataFrame(nilai_tbi, index=tom.index, columns=tom.columns)
 
     return dt_tbi_by
 
@@ -655,6 +1794,37 @@ def get_unaided(data):
     return list_un
 
 
+def get_unaided_panjang(data, list_kolom = None, nama_kolom = 'UN'):
+    """
+    Menumpuk kolom multirespon (default UN1..UNn) menjadi tabel panjang yang ringkas,
+    satu baris per sebutan brand. Data demografi tidak ikut disalin, ambil dari data
+    asal lewat kolom baris, misalnya data['kota'].to_numpy()[dt_panjang['baris']]
+
+    Parameter
+    ---------
+    data : data masukan untuk pembuatan laporan
+    list_kolom : daftar kolom yang ditumpuk (default kolom Unaided)
+    nama_kolom : nama kolom brand pada tabel luaran
+
+    Return
+    ------
+    dt_panjang : tabel dengan kolom baris (posisi responden di data), brand, dan bobot
+    """
+
+    if list_kolom == None:
+        list_kolom = get_unaided(data)
+
+    brand = pd.concat([data[k] for k in list_kolom], ignore_index = True)
+    ada = brand.notna().to_numpy()
+    baris = np.tile(np.arange(len(data), dtype = 'int32'), len(list_kolom))[ada]
+
+    dt_panjang = pd.DataFrame({'baris': baris,
+                               nama_kolom: brand[ada].reset_index(drop = True),
+                               'bobot': _bobot_akumulasi(data['bobot']).to_numpy()[baris]})
+
+    return dt_panjang
+
+
 def get_dataframe_unaided(data):
     """
     Membuat data tabel khusus untuk data Unaided
@@ -665,22 +1835,19 @@ def get_dataframe_unaided(data):
 
     Return
     ------
-    dt : tabel data khusus Unaided
+    dt : tabel data khusus Unaided, satu baris per responden per kolom UN (blok UN1,
+         lalu UN2, dst.), termasuk baris dengan UN kosong
     """
 
     new_kolom = ['no_entry', 'panel', 'kota', 'bobot', 'sex', 'usia', 'usiar', 'UN',
                 'didik', 'kerja', 'expand', 'expandr']
-    dt = pd.DataFrame(columns=new_kolom)
     list_kolom_un = get_unaided(data)
-    for ke in range(len(list_kolom_un)):
-        kolom = ['no_entry', 'panel', 'kota', 'bobot', 'sex', 'usia', 'usiar', list_kolom_un[ke],
-                 'didik', 'kerja', 'expand', 'expandr']
-        temp_dt = data[kolom].copy()
-        temp_dt.columns = new_kolom
 
-        dt = pd.concat([dt, temp_dt],axis=0, ignore_index=True)
-    dt.reset_index(drop=True)
-    return dt
+    baris = np.tile(np.arange(len(data)), len(list_kolom_un))
+    dt = data[[k for k in new_kolom if k != 'UN']].iloc[baris].reset_index(drop = True)
+    dt['UN'] = pd.concat([data[k] for k in list_kolom_un], ignore_index = True)
+
+    return dt[new_kolom]
 
 
 def hitung_unaided(data_unaided, tabel_bobot_tom, sorter_brand):
@@ -689,7 +1856,7 @@ def hitung_unaided(data_unaided, tabel_bobot_tom, sorter_brand):
 
     Parameter
     ---------
-    data_unaided : data masukan laporan khusus bagian unaided
+    data_unaided : data masukan laporan khusus bagian unaided (atau kubus brand)
     tabel_bobot_tom : tabel bobot hasil dari perhitungan brand TOM
     sorter_brand : daftar nomor untuk mengurutkan brand
 
@@ -698,7 +1865,10 @@ def hitung_unaided(data_unaided, tabel_bobot_tom, sorter_brand):
 
     """
 
-    dt_unaided = data_unaided[['UN','bobot']].groupby(by='UN').sum().reset_index()
+    if _is_kubus(data_unaided):
+        dt_unaided = _agregat_brand(data_unaided, 'UN').reset_index()
+    else:
+        dt_unaided = data_unaided[['UN','bobot']].groupby(by='UN').sum().reset_index()
     dt_unaided.columns = ['Brand','Unaided']
 
     dt_unaided['Unaided'] = (dt_unaided['Unaided']+tabel_bobot_tom['bobot'][:-1])/tabel_bobot_tom['bobot'][len(tabel_bobot_tom)-1]*100
@@ -718,7 +1888,7 @@ def hitung_brand_switch(data_used, list_sorted_brand, sorter_brand):
 
     Parameter
     ---------
-    data_used : data tabel yang digunakan untuk mengolah laporan
+    data_used : data tabel yang digunakan untuk mengolah laporan (data responden atau agregat laporan)
     list_sorted_brand : data brand yang digunakan untuk sorting (brand dan urutan ranking-nya)
     sorter_brand : data brand yang digunakan untuk sorting (nomornya saja)
 
@@ -728,8 +1898,7 @@ def hitung_brand_switch(data_used, list_sorted_brand, sorter_brand):
     """
 
     # Menghitung sum bobot cross tab by LU dan FI
-    bobot_switching = pd.crosstab(index = data_used['LU'], columns = data_used['FI'], values = data_used.bobot, aggfunc = sum)
-    bobot_switching.fillna(0, inplace = True)
+    bobot_switching = _bobot_switching(data_used)
 
     # Menghitung total bobot per LU
     tot_bobot_switching = bobot_switching.sum(axis = 1).to_frame()
@@ -763,7 +1932,7 @@ def hitung_brand_switch(data_used, list_sorted_brand, sorter_brand):
     tab_switching['Switching in'] = (tab_bobot_switching_sort['Switching in']/tab_bobot_switching_sort['Total'])*100
     tab_switching['Net switching'] = tab_switching['Switching in'] - tab_switching['Switching out']
 
-    actual_lu,_ = hitung_nilai('LU', data_used, sorter_brand)
+    actual_lu,_ = hitung_nilai('LU', data_used['kubus'] if _is_agregat(data_used) else data_used, sorter_brand)
     actual_lu.set_index('Brand', inplace = True)
 
     tab_switching['Actual LU'] = actual_lu
@@ -785,14 +1954,17 @@ def n_sample_user(data_user, sorter_brand):
 
     Parameter
     ---------
-    data_user : data tabel olah laporan dengan IR=Ya
+    data_user : data tabel olah laporan dengan IR=Ya (data responden atau kubus brand)
     sorter_brand : data brand untuk mengurutkan index
 
     Return
     ------
     n_sample : tabel nilai n Sample
     """
-    n_sample = data_user['LU'].value_counts().to_frame()
+    if _is_kubus(data_user):
+        n_sample = _agregat_brand(data_user, 'LU', nilai = 'n').to_frame()
+    else:
+        n_sample = data_user['LU'].value_counts().to_frame()
     n_sample.columns = ['n Sample']
     n_sample = n_sample.reindex(index=sorter_brand.sort_values(by='Sorting').reset_index(drop=True)['Brand'][:len(sorter_brand)-1].to_list())
     n_sample.reset_index(inplace=True)
@@ -807,7 +1979,7 @@ def tabel_brand_switch(data_used, list_sorted_brand, n_sample):
 
     Parameter
     ---------
-    data_used : data laporan yang akan diolah
+    data_used : data laporan yang akan diolah (data responden atau agregat laporan)
     list_sorted_brand : data untuk mengurutkan daftar brand
     n_sample : tabel data berisi n Sample
 
@@ -816,8 +1988,7 @@ def tabel_brand_switch(data_used, list_sorted_brand, n_sample):
     tab_switching_sort_t : tabel luaran berbentuk crosstab
     """
     # Menghitung sum bobot cross tab by LU dan FI
-    bobot_switching = pd.crosstab(index = data_used['LU'], columns = data_used['FI'], values = data_used.bobot, aggfunc = sum)
-    bobot_switching.fillna(0, inplace = True)
+    bobot_switching = _bobot_switching(data_used)
 
     # Menghitung total bobot per LU
     tot_bobot_switching = bobot_switching.sum(axis = 1).to_frame()
@@ -858,47 +2029,20 @@ def hitung_conv_rate(data_used, list_sorted_brand):
 
     Parameter
     ---------
-    data_used : data laporan yang digunakan untuk mengolah
+    data_used : data laporan yang digunakan untuk mengolah (data responden, frame responden, atau agregat laporan)
     list_sorted_brand : tabel yang digunakan untuk mengurutkan brand
 
     Return
     ------
     tab_conv_rate : tabel luaran data conversion rate
     """
-    ## Menghitung bobot tom
-    bobot_tom = data_used[['bobot','TOM']].groupby('TOM').sum()
-    bobot_tom.fillna(0, inplace = True)
-    bobot_tom.index.rename('Brand', inplace=True)
-    # display(bobot_tom)
-
-    ## Menghitung bobot CR
-    data_cr = data_used.loc[data_used['TOM']==data_used['LU'], ['TOM', 'bobot']]
-    bobot_cr = data_cr.groupby('TOM').sum()
-    bobot_cr.index.rename('Brand', inplace=True)
-
-    ## Menghitung bobot UOB
-    data_ir_ya = data_used[data_used['IR'] == 'Ya']
-    data_uob = data_ir_ya.loc[data_ir_ya['TOM']!=data_ir_ya['LU'] , ['LU','TOM', 'bobot']]
-    bobot_uob = data_uob.groupby('TOM').sum()
-    bobot_uob.index.rename('Brand', inplace=True)
-
-    ## Menghitung bobot ABNU
-    data_abnu = data_used.loc[data_used['IR'] == 'Tidak', ['TOM', 'bobot']]
-    bobot_abnu = data_abnu.groupby('TOM').sum()
-    bobot_abnu.index.rename('Brand', inplace=True)
-
-    ## Menghitung bobot NABU
-    data_nabu = data_ir_ya.loc[data_ir_ya['TOM']!=data_ir_ya['LU'] , ['LU', 'bobot']]
-    bobot_nabu = data_nabu.groupby('LU').sum()
-    bobot_nabu.index.rename('Brand', inplace=True)
+    ## Menghitung bobot TOM, CR, UOB, ABNU, dan NABU per brand
+    bobot = _bobot_conv_rate(data_used)
 
     ## Menyusun tabel bobot perhitungan convertion rate
-    bobot_conv_rate = pd.DataFrame(index = bobot_nabu.index, columns = ['TOM', 'CR', 'UOB', 'ABNU', 'NABU'])
-    bobot_conv_rate['TOM'] = bobot_tom
-    bobot_conv_rate['CR'] = bobot_cr
-    bobot_conv_rate['UOB'] = bobot_uob
-    bobot_conv_rate['ABNU'] = bobot_abnu
-    bobot_conv_rate['NABU'] = bobot_nabu
+    bobot_conv_rate = pd.DataFrame(index = bobot['NABU'].index.rename('Brand'), columns = ['TOM', 'CR', 'UOB', 'ABNU', 'NABU'])
+    for kolom in bobot_conv_rate.columns:
+        bobot_conv_rate[kolom] = bobot[kolom]
 
     ## Mengurutkan brand berdasarkan tbi'
     brand_sorted_ = list_sorted_brand.Brand.to_list()
@@ -954,73 +2098,73 @@ def brand_diagnostic(tabel_tom, tabel_lu, tabel_fi):
     return dt_diagnostic
 
 
-def hitung_bobot_cl(data_masukan, sorter_brand):
+def hitung_array_cl(data_masukan, sorter_brand):
     """
-    Menghitung bobot overall competitor landscape
+    Menghitung competitor landscape per kota dalam bentuk array 3 dimensi
+    (kota x focal brand x competitor)
 
     Parameter
     ---------
-    data_masukan : data yang akan diolah / digunakan untuk mencari bobot
+    data_masukan : data yang akan diolah / digunakan untuk mencari bobot (data responden atau kubus brand)
     sorter_brand : data untuk mengurutkan brand
 
     Return
     ------
-    bobot_total_cl : data bobot overall per brand
+    array_cl : array competitor landscape dengan diagonal (brand yang sama) bernilai NaN
+    list_brand : daftar brand untuk sumbu focal brand dan competitor
+    list_kota : daftar kota untuk sumbu pertama
     """
 
-    cl_awal = pd.crosstab(index = data_masukan['LU'], columns = data_masukan['kota'], values = data_masukan.bobot, aggfunc = sum)
-    cl_awal.fillna(0, inplace = True)
-    cl_awal.index.rename('LU', inplace=True)
-    cl_awal.reset_index(inplace=True)
-    cl_awal.set_index(['LU'],inplace=True)
-    cl_awal= cl_awal.reindex(sorter_brand['Brand'])
-    cl_awal = cl_awal.reindex(columns=kota_urut())
-    cl_awal['Total'] = cl_awal.sum(axis=1)
+    if _is_kubus(data_masukan):
+        cl_awal = _agregat_brand(data_masukan, 'LU', 'kota')
+    else:
+        cl_awal = pd.crosstab(index = data_masukan['LU'], columns = data_masukan['kota'], values = _bobot_akumulasi(data_masukan.bobot), aggfunc = sum)
+        cl_awal.fillna(0, inplace = True)
+    cl_awal = cl_awal.reindex(index = sorter_brand['Brand'], columns = kota_urut())
 
-    cl_total = cl_awal.sum(axis = 0).to_frame().transpose()
-    cl_total.index = ['Total']
-    cl_total.index.rename('LU', inplace=True)
+    list_brand = cl_awal.index.to_list()
+    list_kota = cl_awal.columns.to_list()
 
-    cl_awal = pd.concat([cl_awal, cl_total], axis = 0)
-    cl_awal.index.rename('Brand',inplace=True)
+    # Porsi bobot brand di tiap kota terhadap total brand (ke samping) dan total kota (ke bawah)
+    bobot = cl_awal.to_numpy(dtype='float64')
+    porsi_brand = bobot/np.nansum(bobot, axis = 1, keepdims = True)
+    porsi_kota = bobot/np.nansum(bobot, axis = 0, keepdims = True)
 
-    cl_kesamping = cl_awal.iloc[:-1,:-1].copy()
-    for idx in cl_kesamping.index:
-        cl_kesamping.loc[idx,:] = cl_kesamping.loc[idx,:]/cl_awal.loc[idx,'Total']
-    cl_kesamping.index.name = ''
+    # Outer product per kota: [kota, focal, competitor] = porsi_brand[focal, kota] * porsi_kota[competitor, kota]
+    array_cl = porsi_brand.T[:, :, np.newaxis] * porsi_kota.T[:, np.newaxis, :]
+    idx_diag = np.arange(len(list_brand))
+    array_cl[:, idx_diag, idx_diag] = np.nan
 
-    cl_kebawah = cl_awal.iloc[:-1,:-1].copy()
-    for clm in cl_kebawah.columns:
-        cl_kebawah.loc[:,clm] = cl_kebawah.loc[:,clm]/cl_awal.loc['Total',clm]
-    cl_kebawah = cl_kebawah.transpose()
-    cl_kebawah.columns.name = ''
+    return array_cl, list_brand, list_kota
 
-    competitor_landscape = []
 
-    kt = cl_kesamping.columns.to_list()
-    brd = cl_kesamping.index.to_list()
+def hitung_bobot_cl(data_masukan, sorter_brand):
+    """
+    Menghitung bobot overall competitor landscape
 
-    for kt_ in range(len(kt)):
-        tb_cl = pd.DataFrame(index=cl_kesamping.index.copy(), columns=cl_kebawah.columns.copy())
-        for brd1 in brd:
-            for brd2 in brd:
-                if brd1==brd2:
-                    continue
-                tb_cl.loc[brd1, brd2] = cl_kesamping.loc[brd1,kt[kt_]] * cl_kebawah.loc[kt[kt_], brd2]
-        tb_cl.index.name = kt[kt_]
-        competitor_landscape.append(tb_cl)
+    Parameter
+    ---------
+    data_masukan : data yang akan diolah / digunakan untuk mencari bobot (data responden atau kubus brand)
+    sorter_brand : data untuk mengurutkan brand
 
+    Return
+    ------
+    bobot_total_cl : data bobot overall per brand
+    competitor_all : tabel competitor landscape overall (jumlah seluruh kota)
+    competitor_landscape : list tabel competitor landscape per kota
+    """
+
+    array_cl, list_brand, list_kota = hitung_array_cl(data_masukan, sorter_brand)
+
+    idx_brand = pd.Index(list_brand, name = '')
 
-    competitor_all = pd.DataFrame(columns=cl_kebawah.columns,
-                                 index=cl_kesamping.index)
-    for brd1 in brd:
-        for brd2 in brd:
-            if brd1==brd2:
-                continue
-            nilai_akumulasi = 0
-            for cl in range(len(competitor_landscape)):
-                nilai_akumulasi += competitor_landscape[cl].loc[brd1, brd2]
-            competitor_all.loc[brd1, brd2] = nilai_akumulasi
+    competitor_landscape = []
+    for kt_ in range(len(list_kota)):
+        tb_cl = pd.DataFrame(array_cl[kt_], index = idx_brand.rename(list_kota[kt_]), columns = idx_brand)
+        competitor_landscape.append(tb_cl)
+
+    # Overall: jumlah seluruh kota, diagonal tetap NaN
+    competitor_all = pd.DataFrame(array_cl.sum(axis = 0), index = idx_brand, columns = idx_brand)
     bobot_total_cl = competitor_all.sum(axis=1)
 
     return bobot_total_cl, competitor_all, competitor_landscape
@@ -1033,26 +2177,45 @@ def hitung_competitor_landscape(nama_tabel, tabel_masukan,
 
     Parameter
     ---------
-    nama_tabel : nama untuk tabel competitor landscape-nya
-    tabel_masukan : tabel yang digunakan untuk menghitung
+    nama_tabel : nama untuk tabel competitor landscape-nya, atau list nama tabel
+                 jika tabel_masukan berupa array 3 dimensi
+    tabel_masukan : tabel yang digunakan untuk menghitung, atau array 3 dimensi
+                    (tabel x focal brand x competitor) hasil hitung_array_cl
     bobot_pembagi : digunakan untuk menghitung nilai indeks
 
     Return
     ------
-    tabel_output : data luaran dalam bentuk tabel
+    tabel_output : data luaran dalam bentuk tabel, atau list tabel jika
+                   tabel_masukan berupa array 3 dimensi
     """
 
-    tabel_output = pd.DataFrame(index = tabel_masukan.index.copy(), columns=tabel_masukan.columns.copy())
-    for index in tabel_output.index:
-        for column in tabel_output.columns:
-            if index==column:
-                continue
-            tabel_output.loc[index, column] = round(tabel_masukan.loc[index,column]/bobot_pembagi[index],3)
-    tabel_output.index.name = ''
-    tabel_output = pd.concat([tabel_output], keys=['Focal Firm'],names=[nama_tabel])
-    tabel_output = pd.concat([tabel_output], keys=['Competitors'], axis=1)
+    if isinstance(tabel_masukan, pd.DataFrame):
+        list_brand = tabel_masukan.index
+        list_competitor = tabel_masukan.columns
+        array_masukan = tabel_masukan.to_numpy(dtype = 'float64')[np.newaxis]
+        pembagi = bobot_pembagi.reindex(list_brand).to_numpy(dtype = 'float64')
+    else:
+        list_brand = bobot_pembagi.index
+        list_competitor = bobot_pembagi.index
+        array_masukan = np.asarray(tabel_masukan, dtype = 'float64')
+        pembagi = bobot_pembagi.to_numpy(dtype = 'float64')
+
+    # Semua tabel dibagi sekaligus, brand yang sama (diagonal) bernilai NaN
+    array_output = _bulatkan(array_masukan/pembagi[np.newaxis, :, np.newaxis], 3)
+    array_output[:, np.asarray(list_brand)[:, np.newaxis] == np.asarray(list_competitor)[np.newaxis, :]] = np.nan
+
+    idx_competitor = pd.MultiIndex.from_product([['Competitors'], list_competitor], names = [None, ''])
+
+    list_nama = [nama_tabel] if isinstance(tabel_masukan, pd.DataFrame) else list(nama_tabel)
+    list_tabel = []
+    for i, nama_ in enumerate(list_nama):
+        idx_focal = pd.MultiIndex.from_product([['Focal Firm'], list_brand], names = [nama_, ''])
+        list_tabel.append(pd.DataFrame(array_output[i], index = idx_focal, columns = idx_competitor))
+
+    if isinstance(tabel_masukan, pd.DataFrame):
+        return list_tabel[0]
 
-    return tabel_output
+    return list_tabel
 
 # ----------------------------------------------------------------------------------------------------------------------------
 
@@ -1092,6 +2255,135 @@ def filter_tambahan(data_used, kode_awal, incl_kota = True, kolom_kota = 'Kota_1
     return data_tambahan_
 
 
+def terjemah_kode(data_kode, mascod, kolom_kode = None, kolom_label = None):
+    """
+    Mengganti kode menjadi label berdasarkan mascod untuk series, tabel, atau
+    array sekaligus tanpa mengubah data masukan. Kode yang tidak ada di mascod
+    dibiarkan apa adanya dan dilaporkan.
+
+    Parameter
+    ---------
+    data_kode : series, tabel, atau array berisi kode
+    mascod : tabel mascod (kode dan label)
+    kolom_kode : nama kolom kode di mascod (default kolom pertama)
+    kolom_label : nama kolom label di mascod (default kolom kedua)
+
+    Return
+    ------
+    data_label : data dengan bentuk yang sama berisi label
+    kode_tidak_terpetakan : daftar kode yang tidak ditemukan di mascod
+    """
+
+    if kolom_kode == None:
+        kolom_kode = mascod.columns[0]
+    if kolom_label == None:
+        kolom_label = mascod.columns[1]
+
+    # Kode pertama yang muncul di mascod yang dipakai
+    mascod_ = mascod.drop_duplicates(subset = kolom_kode, keep = 'first')
+    kode_mascod = pd.Index(mascod_[kolom_kode].to_numpy(dtype = 'object'), dtype = 'object')
+    label_mascod = mascod_[kolom_label].to_numpy(dtype = 'object')
+
+    nilai = np.asarray(data_kode, dtype = 'object')
+    bentuk = nilai.shape
+    nilai = nilai.ravel()
+
+    posisi = kode_mascod.get_indexer(nilai)
+    terpetakan = posisi != -1
+    label = nilai.copy()
+    label[terpetakan] = label_mascod[posisi[terpetakan]]
+
+    tidak_terpetakan = ~terpetakan & ~pd.isna(nilai)
+    kode_tidak_terpetakan = pd.unique(nilai[tidak_terpetakan]).tolist()
+
+    label = label.reshape(bentuk)
+    if isinstance(data_kode, pd.DataFrame):
+        data_label = pd.DataFrame(label, index = data_kode.index, columns = data_kode.columns)
+    elif isinstance(data_kode, pd.Series):
+        data_label = pd.Series(label, index = data_kode.index, name = data_kode.name)
+    elif isinstance(data_kode, pd.Index):
+        data_label = pd.Index(label, name = data_kode.name)
+    else:
+        data_label = label
+
+    return data_label, kode_tidak_terpetakan
+
+
+def _peringatan_kode(kode_tidak_terpetakan, sumber):
+    """
+    Memberi peringatan (warnings.warn) jika ada kode hasil terjemah_kode yang tidak ditemukan di mascod
+    """
+
+    if len(kode_tidak_terpetakan) > 0:
+        warnings.warn('Kode %s pada %s tidak ada di mascod dan tidak diberi label'%(kode_tidak_terpetakan, sumber))
+
+
+def matriks_indikator(data, list_kolom):
+    """
+    Membuat matriks indikator sparse (responden x opsi) untuk pertanyaan multirespon,
+    misalnya kolom Unaided (get_unaided) atau kolom media habit (filter_tambahan).
+    Matriks cukup dibuat sekali per pertanyaan, lalu count, bobot, top-N, dan
+    breakdown dihitung dengan hitung_indikator.
+
+    Parameter
+    ---------
+    data : data yang digunakan untuk menghitung
+    list_kolom : daftar kolom jawaban multirespon
+
+    Return
+    ------
+    indikator : matriks CSR berisi jumlah sebutan tiap opsi per responden
+    opsi : daftar opsi (kode atau label) untuk kolom matriks
+    """
+
+    nilai = data[list(list_kolom)].to_numpy(dtype = 'object').ravel()
+    baris = np.repeat(np.arange(len(data)), len(list_kolom))
+
+    ada = ~pd.isna(nilai)
+    kode_opsi, opsi = pd.factorize(nilai[ada], sort = True)
+
+    indikator = sparse.csr_matrix((np.ones(len(kode_opsi), dtype = 'int64'), (baris[ada], kode_opsi)),
+                                  shape = (len(data), len(opsi)))
+
+    return indikator, opsi
+
+
+def hitung_indikator(indikator, opsi, bobot = None, by = None):
+    """
+    Menghitung jumlah sebutan (atau jumlah bobot) tiap opsi dari matriks indikator
+
+    Parameter
+    ---------
+    indikator : matriks indikator hasil matriks_indikator
+    opsi : daftar opsi hasil matriks_indikator
+    bobot : bobot per responden, default 1 (jumlah sebutan)
+    by : karakteristik per responden untuk breakdown (misalnya kolom kota atau expandr)
+
+    Return
+    ------
+    tabel_opsi : series jumlah per opsi, atau tabel opsi x kategori jika by diisi
+    """
+
+    n_resp = indikator.shape[0]
+    if bobot is None:
+        bobot = np.ones(n_resp, dtype = indikator.dtype)
+    else:
+        bobot = np.asarray(bobot, dtype = 'float64')
+
+    if by is None:
+        return pd.Series(indikator.T @ bobot, index = opsi)
+
+    # Matriks keanggotaan (responden x kategori) berisi bobot responden
+    kode_by, kategori = pd.factorize(np.asarray(by), sort = True)
+    ada = kode_by >= 0
+    anggota = sparse.csr_matrix((bobot[ada], (np.flatnonzero(ada), kode_by[ada])),
+                                shape = (n_resp, len(kategori)))
+
+    tabel_opsi = pd.DataFrame((indikator.T @ anggota).toarray(), index = opsi, columns = kategori)
+
+    return tabel_opsi
+
+
 def hitung_tambahan(data_used, kode_awal, mascod, top = None ):
     """
     Menghitung frekuensi dan persentase dari data media habit
@@ -1110,19 +2402,17 @@ def hitung_tambahan(data_used, kode_awal, mascod, top = None ):
     # Filtering kolom data
     data_tambahan = filter_tambahan(data_used, kode_awal, incl_kota = False)
 
-    # Menggabungkan data ke 1 kolom
-    data_tamb_merged = pd.Series(data_tambahan.values.ravel('F'))
-    data_tamb_merged = data_tamb_merged.to_frame()
+    # Menghitung jumlah sebutan per kode
+    indikator, opsi = matriks_indikator(data_tambahan, data_tambahan.columns)
+    count_opsi = hitung_indikator(indikator, opsi)
 
-    # Labeling data
-    for i in range(len(mascod)):
-        coding_i = mascod.iloc[i,0]
-        data_tamb_merged.loc[data_tamb_merged.iloc[:,0]==coding_i,0] = mascod.iloc[i,1]
+    # Labeling data, kode yang tidak ada di mascod tetap ditampilkan sebagai kode
+    count_opsi.index, kode_tidak_terpetakan = terjemah_kode(opsi, mascod)
+    _peringatan_kode(kode_tidak_terpetakan, kode_awal)
 
     # Membuat tabel count
-    tab_count = data_tamb_merged.value_counts().to_frame()
+    tab_count = count_opsi.groupby(level = 0).sum().sort_values(ascending = False).to_frame('Count')
     tab_count.index.rename('Kriteria', inplace = True)
-    tab_count.rename(columns = {0 : 'Count'}, inplace = True)
 
     # Menghitung n_sampel
     kol_1 = data_tambahan.iloc[:,0].to_frame()
@@ -1169,17 +2459,13 @@ def data_olshop(data, mascod_kota, mascod_olshop):
     persen_tabel : tabel yang berisi jumlah n sampel dalam format persentase
     """
 
-    # Labeling data
-    data.columns = ['kota','Olshop']
-
-    for i in range(len(mascod_kota)):
-        coding_i = mascod_kota.loc[i,'Coding']
-        data.loc[data.loc[:,'kota']==coding_i,'kota'] = mascod_kota.loc[i,'Label']
-
-    for i in range(len(mascod_olshop)):
-        coding_i = mascod_olshop.loc[i,'Coding']
-        data.loc[data.loc[:,'Olshop']==coding_i,'Olshop'] = mascod_olshop.loc[i,'Label']
-
+    # Labeling data (data masukan tidak diubah)
+    data = data.set_axis(['kota','Olshop'], axis = 1)
+    label_kota, kode_kota = terjemah_kode(data['kota'], mascod_kota, 'Coding', 'Label')
+    label_olshop, kode_olshop = terjemah_kode(data['Olshop'], mascod_olshop, 'Coding', 'Label')
+    _peringatan_kode(kode_kota, 'kota')
+    _peringatan_kode(kode_olshop, 'olshop')
+    data = pd.DataFrame({'kota' : label_kota, 'Olshop' : label_olshop})
 
     crosstab = pd.crosstab(data['Olshop'],
                               data['kota'])
@@ -2,8 +2,13 @@ import pptx
 import pandas as pd
 import numpy as np
 import openpyxl
+import os
+import io
+import copy
+import zipfile
+from xml.sax.saxutils import escape
 from pptx import Presentation
-from pptx.chart.data import CategoryChartData, XyChartData, ChartData
+from pptx.chart.data import CategoryChartData, XyChartData, BubbleChartData, ChartData
 from pptx.enum.chart import XL_CHART_TYPE
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -11,6 +16,10 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR, MSO_AUTO_SIZE
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.chart import XL_TICK_LABEL_POSITION, XL_LABEL_POSITION, XL_TICK_MARK,XL_MARKER_STYLE, XL_LEGEND_POSITION
 from pptx.oxml.xmlchemy import OxmlElement
+from pptx.oxml.ns import qn
+from pptx.oxml.table import CT_Table
+from pptx.table import _Cell
+from pandas.io.formats.style import Styler
 
 
 def Reverse(lst):
@@ -22,10 +31,109 @@ def set_reverse_categories(axis):
     """
     ele = axis._element.xpath(r'c:scaling/c:orientation')[0]
     ele.set("val", "maxMin")
+
+def tulis_label_seri(seri, teks, ukuran_font = None, nama_font = None, bold = None,
+                     warna_font = None, posisi = None):
+    """
+    Menulis data label seluruh titik pada satu seri chart sekaligus. Label titik pertama diformat
+    dengan python-pptx dan dipakai sebagai cetakan XML c:dLbl, titik berikutnya cukup salinan
+    cetakan dengan idx dan teks yang diganti.
+    
+    Parameter
+    ---------
+    seri : objek seri chart (chart.plots[0].series[i])
+    teks : list teks label tiap titik, '' untuk label kosong
+    ukuran_font : ukuran font label (dalam satuan Pt)
+    nama_font : nama font label
+    bold : True / False untuk font tebal
+    warna_font : warna font RGB (r, g, b)
+    posisi : posisi label (XL_LABEL_POSITION)
+    
+    Return
+    ------
+    None
+    """
+    
+    templat = {}
+    terakhir = None
+    for j in range(len(teks)):
+        isi = str(teks[j])
+        kosong = isi == ''
+        if kosong not in templat:
+            label = seri.points[j].data_label
+            label.text_frame.text = isi
+            if ukuran_font != None:
+                label.font.size = Pt(ukuran_font)
+            if nama_font != None:
+                label.font.name = nama_font
+            if bold != None:
+                label.font.bold = bold
+            if warna_font != None:
+                label.font.color.rgb = RGBColor(*warna_font)
+            if posisi != None:
+                label.position = posisi
+            templat[kosong] = label._dLbl
+            terakhir = templat[kosong]
+            continue
+        
+        dLbl = copy.deepcopy(templat[kosong])
+        dLbl.idx.val = j
+        if kosong == False:
+            dLbl.find('.//' + qn('a:t')).text = isi
+        terakhir.addnext(dLbl)
+        terakhir = dLbl
+    
+    return None
+
+def warnai_titik(seri, warna, jumlah_titik = None):
+    """
+    Mengisi warna solid seluruh titik (bar / slice) pada satu seri chart sekaligus. Titik pertama
+    diformat dengan python-pptx, titik berikutnya salinan XML c:dPt dengan idx dan warna yang diganti.
+    
+    Parameter
+    ---------
+    seri : objek seri chart (chart.plots[0].series[i])
+    warna : warna RGB (r, g, b) untuk semua titik, atau list warna RGB per titik
+    jumlah_titik : jumlah titik yang diwarnai, default seluruh titik atau sebanyak list warna
+    
+    Return
+    ------
+    None
+    """
+    
+    warna = np.asarray(warna, dtype = int)
+    if warna.ndim == 1:
+        if jumlah_titik == None:
+            jumlah_titik = len(seri.points)
+        warna = np.broadcast_to(warna, (jumlah_titik, 3))
+    elif jumlah_titik != None:
+        warna = warna[:jumlah_titik]
+    warna = warna.tolist()
+    if len(warna) == 0:
+        return None
+    
+    titik = seri.points[0].format
+    titik.fill.solid()
+    titik.fill.fore_color.rgb = RGBColor(*warna[0])
+    templat = seri._element.get_or_add_dPt_for_point(0)
+    
+    terakhir = templat
+    for j in range(1, len(warna)):
+        dPt = copy.deepcopy(templat)
+        dPt.idx.val = j
+        dPt.find('.//' + qn('a:srgbClr')).set('val', str(RGBColor(*warna[j])))
+        terakhir.addnext(dPt)
+        terakhir = dPt
+    
+    return None
     
+_cache_template = {}
+
 def FileTemplate(nama_file_template):
     """
-    Mendapatkan file template powerpoint
+    Mendapatkan file template powerpoint. File template hanya dibaca dan di-parse sekali (selama file
+    tidak berubah), setiap pemanggilan mendapat salinan template yang bebas diubah tanpa
+    mempengaruhi laporan lain.
     
     Parameter
     ---------
@@ -36,9 +144,180 @@ def FileTemplate(nama_file_template):
     prs : objek template
     """
     
-    prs = Presentation(nama_file_template)
+    if isinstance(nama_file_template, (str, os.PathLike)):
+        path_file = os.path.abspath(nama_file_template)
+        info = os.stat(path_file)
+        stempel = (info.st_size, info.st_mtime_ns)
+        if path_file not in _cache_template or _cache_template[path_file][0] != stempel:
+            with open(path_file, 'rb') as f:
+                _cache_template[path_file] = (stempel, Presentation(io.BytesIO(f.read())))
+        prs = copy.deepcopy(_cache_template[path_file][1])
+    else:
+        prs = Presentation(nama_file_template)
     return prs
 
+_BAGIAN_WORKBOOK_CHART = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'),
+}
+
+def _kolom_excel(nomor_kolom):
+    """
+    Mengubah nomor kolom (mulai dari 0) menjadi huruf kolom excel ('A', 'B', ..., 'AA', ...)
+    """
+    
+    huruf = ''
+    nomor_kolom = nomor_kolom + 1
+    while nomor_kolom > 0:
+        nomor_kolom, sisa = divmod(nomor_kolom - 1, 26)
+        huruf = chr(ord('A') + sisa) + huruf
+    return huruf
+
+def _sel_workbook_chart(chart_data):
+    """
+    Isi sel workbook chart {(baris, kolom): nilai} dari atribut publik chart_data, dengan tata letak
+    yang sama dengan workbook python-pptx (CategoryWorkbookWriter / XyWorkbookWriter /
+    BubbleWorkbookWriter) sehingga referensi Sheet1!$B$2:... di XML chart tetap benar
+    """
+    
+    sel = {}
+    if isinstance(chart_data, XyChartData):
+        # Tiap series satu tabel: judul di kolom B, lalu X, Y (dan ukuran bubble) per baris
+        for series in chart_data:
+            offset = 2*series.index + series.data_point_offset
+            sel[(offset, 1)] = series.name
+            daftar_kolom = [series.x_values, series.y_values]
+            if isinstance(chart_data, BubbleChartData):
+                sel[(offset, 2)] = 'Size'
+                daftar_kolom.append(series.bubble_sizes)
+            for kolom, isi in enumerate(daftar_kolom):
+                for k, nilai in enumerate(isi):
+                    sel[(offset + 1 + k, kolom)] = nilai
+    else:
+        # Kategori di kolom awal (satu kolom per level) mulai baris kedua, lalu satu kolom per series
+        categories = chart_data.categories
+        depth = categories.depth
+        for idx, level in enumerate(categories.levels):
+            for off, nama in level:
+                sel[(off + 1, depth - idx - 1)] = nama
+        for idx, series in enumerate(chart_data):
+            sel[(0, depth + idx)] = series.name
+            for k, nilai in enumerate(series.values):
+                sel[(1 + k, depth + idx)] = nilai
+    return sel
+
+def workbook_chart_ringkas(chart_data, isi = True):
+    """
+    Membuat workbook xlsx minimal untuk data chart. Tata letak sel sama dengan workbook python-pptx
+    (sehingga referensi Sheet1!$B$2:... di chart tetap benar), tetapi hanya berisi satu sheet tanpa
+    style. Bagian workbook selain sheet diambil dari cetakan yang sama.
+    
+    Parameter
+    ---------
+    chart_data : objek ChartData / CategoryChartData / XyChartData
+    isi : False untuk workbook dengan sheet kosong
+    
+    Return
+    ------
+    blob : isi file xlsx (bytes)
+    """
+    
+    sel = _sel_workbook_chart(chart_data) if isi == True else {}
+    
+    isi_baris = {}
+    for (baris, kolom) in sorted(sel):
+        nilai = sel[(baris, kolom)]
+        ref = _kolom_excel(kolom) + str(baris + 1)
+        if nilai is None or (isinstance(nilai, (float, np.floating)) and not np.isfinite(nilai)):
+            continue
+        if isinstance(nilai, (bool, np.bool_)):
+            xml_sel = '<c r="%s" t="b"><v>%d</v></c>' % (ref, int(nilai))
+        elif isinstance(nilai, (int, np.integer)):
+            xml_sel = '<c r="%s"><v>%d</v></c>' % (ref, int(nilai))
+        elif isinstance(nilai, (float, np.floating)):
+            xml_sel = '<c r="%s"><v>%r</v></c>' % (ref, float(nilai))
+        else:
+            xml_sel = '<c r="%s" t="inlineStr"><is><t>%s</t></is></c>' % (ref, escape(str(nilai)))
+        isi_baris.setdefault(baris, []).append(xml_sel)
+    
+    xml_sheet = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                 + ''.join(['<row r="%d">%s</row>' % (baris + 1, ''.join(isi_baris[baris])) for baris in isi_baris])
+                 + '</sheetData></worksheet>')
+    
+    file_xlsx = io.BytesIO()
+    with zipfile.ZipFile(file_xlsx, 'w', zipfile.ZIP_DEFLATED) as zip_xlsx:
+        for nama, isi in _BAGIAN_WORKBOOK_CHART.items():
+            zip_xlsx.writestr(nama, isi)
+        zip_xlsx.writestr('xl/worksheets/sheet1.xml', xml_sheet)
+    return file_xlsx.getvalue()
+
+class _DataChartWorkbook(object):
+    """
+    Pembungkus data chart yang mengganti xlsx_blob (workbook yang disematkan add_chart)
+    """
+    
+    def __init__(self, chart_data, xlsx_blob):
+        self._chart_data = chart_data
+        self.xlsx_blob = xlsx_blob
+    
+    def xml_bytes(self, tipe_chart):
+        return self._chart_data.xml_bytes(tipe_chart)
+
+def tambah_chart(slide, tipe_chart, x, y, cx, cy, chart_data, workbook_chart = 'lengkap'):
+    """
+    Menambahkan chart ke slide dengan slide.shapes.add_chart, dengan workbook excel yang disematkan:
+    'lengkap' : workbook lengkap buatan python-pptx (default)
+    'ringkas' : workbook minimal dari workbook_chart_ringkas, data chart tetap bisa diedit di PowerPoint
+    'tanpa'   : workbook dengan sheet kosong, chart statis (data chart tidak bisa diedit di PowerPoint)
+    
+    Parameter
+    ---------
+    slide : objek slide tempat chart
+    tipe_chart : jenis chart (XL_CHART_TYPE)
+    x, y, cx, cy : posisi dan ukuran chart
+    chart_data : objek data chart
+    workbook_chart : 'lengkap', 'ringkas' atau 'tanpa'
+    
+    Return
+    ------
+    graphic_frame : objek shape chart (chart ada di atribut .chart)
+    """
+    
+    if workbook_chart == 'ringkas' or workbook_chart == 'tanpa':
+        chart_data = _DataChartWorkbook(chart_data, workbook_chart_ringkas(chart_data, workbook_chart == 'ringkas'))
+    elif workbook_chart != 'lengkap':
+        raise ValueError("workbook_chart harus 'lengkap', 'ringkas' atau 'tanpa', bukan %r" % (workbook_chart,))
+    return slide.shapes.add_chart(tipe_chart, x, y, cx, cy, chart_data)
+
 def SubElement(parent, tagname, **kwargs):
     """
     Fungsi untuk mengedit kode XML python-pptx pada border tabel
@@ -49,10 +328,49 @@ def SubElement(parent, tagname, **kwargs):
     parent.append(element)
     return element
 
+_cache_border = {}
+
+def _templat_border(border_color, border_width, lnT, lnB, lnR, lnL):
+    """
+    Membuat (sekali saja) elemen XML border a:lnT, a:lnB, a:lnR dan a:lnL untuk satu spesifikasi border
+    
+    Parameter
+    ---------
+    border_color : warna border tabel dengan kode hexadesimal
+    border_width : tebal border tabel
+    lnT, lnB, lnR, lnL : border sebelah atas, bawah, kanan, kiri
+    
+    Return
+    ------
+    templat : elemen a:tcPr yang memuat elemen-elemen border
+    """
+    
+    kunci = (border_color, border_width, lnT, lnB, lnR, lnL)
+    if kunci in _cache_border:
+        return _cache_border[kunci]
+    
+    templat = OxmlElement('a:tcPr')
+    sisi = {}
+    for nama, pakai in [('a:lnT', lnT), ('a:lnB', lnB), ('a:lnR', lnR), ('a:lnL', lnL)]:
+        if pakai==True:
+            sisi[nama] = SubElement(templat, nama, w=border_width, cap='flat', cmpd='sng', algn='ctr')
+            solidFill = SubElement(sisi[nama], 'a:solidFill')
+            srgbClr = SubElement(solidFill, 'a:srgbClr', val=border_color)
+            prstDash = SubElement(sisi[nama], 'a:prstDash', val='solid')
+
+    if 'a:lnB' in sisi:
+        round_ = SubElement(sisi['a:lnB'], 'a:round')
+        headEnd = SubElement(sisi['a:lnB'], 'a:headEnd', type='none', w='med', len='med')
+        tailEnd = SubElement(sisi['a:lnB'], 'a:tailEnd', type='none', w='med', len='med')
+    
+    _cache_border[kunci] = templat
+    return templat
+
 def _set_cell_border(cell, border_color="000000", border_width='12700',
                     lnT=True, lnB=True, lnR=True, lnL=True):
     """ 
-    Fungsi untuk mengatur border tabel.
+    Fungsi untuk mengatur border tabel. Elemen border untuk tiap spesifikasi dibuat sekali
+    (_templat_border), lalu disalin ke cell.
     
     Parameter
     ---------
@@ -68,36 +386,8 @@ def _set_cell_border(cell, border_color="000000", border_width='12700',
     cell : cell tabel dengan border yang sudah di-edit
     """
     
-    tc = cell._tc
-    tcPr = tc.get_or_add_tcPr()
-
-    if lnT==True:
-        lnT = SubElement(tcPr, 'a:lnT', w=border_width, cap='flat', cmpd='sng', algn='ctr')
-        solidFill = SubElement(lnT, 'a:solidFill')
-        srgbClr = SubElement(solidFill, 'a:srgbClr', val=border_color)
-        prstDash = SubElement(lnT, 'a:prstDash', val='solid')
-    
-    if lnB==True:
-        lnB = SubElement(tcPr, 'a:lnB', w=border_width, cap='flat', cmpd='sng', algn='ctr')
-        solidFill = SubElement(lnB, 'a:solidFill')
-        srgbClr = SubElement(solidFill, 'a:srgbClr', val=border_color)
-        prstDash = SubElement(lnB, 'a:prstDash', val='solid')
-
-    if lnR==True:
-        lnR = SubElement(tcPr, 'a:lnR', w=border_width, cap='flat', cmpd='sng', algn='ctr')
-        solidFill = SubElement(lnR, 'a:solidFill')
-        srgbClr = SubElement(solidFill, 'a:srgbClr', val=border_color)  
-        prstDash = SubElement(lnR, 'a:prstDash', val='solid')
-
-    if lnL==True:
-        lnL = SubElement(tcPr, 'a:lnL', w=border_width, cap='flat', cmpd='sng', algn='ctr')
-        solidFill = SubElement(lnL, 'a:solidFill')
-        srgbClr = SubElement(solidFill, 'a:srgbClr', val=border_color)    
-        prstDash = SubElement(lnL, 'a:prstDash', val='solid')
-
-    round_ = SubElement(lnB, 'a:round')
-    headEnd = SubElement(lnB, 'a:headEnd', type='none', w='med', len='med')
-    tailEnd = SubElement(lnB, 'a:tailEnd', type='none', w='med', len='med')
+    tcPr = cell._tc.get_or_add_tcPr()
+    tcPr.extend(copy.deepcopy(_templat_border(border_color, border_width, lnT, lnB, lnR, lnL)))
     return cell
 
 
@@ -136,6 +426,239 @@ def buat_tabel(template_ppt,nomor_slide,
 
     return tabel
 
+_cache_sel_tabel = {}
+
+def _templat_sel(kunci):
+    """
+    Membuat (sekali saja) elemen XML a:tc dengan format tertentu sebagai cetakan cell tabel
+    
+    Parameter
+    ---------
+    kunci : tuple format cell (isi paragraf, warna font, nama font, ukuran font, bold, alignment,
+            vertical anchor, margin kiri, kanan, atas, bawah, warna isi, warna border)
+    
+    Return
+    ------
+    tc : elemen a:tc cetakan
+    """
+    
+    if kunci in _cache_sel_tabel:
+        return _cache_sel_tabel[kunci]
+    
+    (isi_paragraf, warna_font, nama_font, ukuran_font, bold, rata, anchor,
+     margin_kiri, margin_kanan, margin_atas, margin_bawah, warna_isi, warna_border) = kunci
+    
+    tc = CT_Table.new_tbl(1, 1, Inches(1), Inches(1)).tr_lst[0].tc_lst[0]
+    sel = _Cell(tc, None)
+    if warna_border != None:
+        _set_cell_border(sel, warna_border)
+    sel.text = '\n'.join(['x' if isi else '' for isi in isi_paragraf])
+    for paragraf in sel.text_frame.paragraphs:
+        if warna_font != None:
+            paragraf.font.color.rgb = RGBColor(*warna_font)
+        if ukuran_font != None:
+            paragraf.font.size = Pt(ukuran_font)
+        if nama_font != None:
+            paragraf.font.name = nama_font
+        if bold != None:
+            paragraf.font.bold = bold
+        if rata != None:
+            paragraf.alignment = rata
+    if anchor != None:
+        sel.vertical_anchor = anchor
+    if margin_kiri != None:
+        sel.margin_left = Inches(margin_kiri)
+    if margin_kanan != None:
+        sel.margin_right = Inches(margin_kanan)
+    if margin_atas != None:
+        sel.margin_top = Inches(margin_atas)
+    if margin_bawah != None:
+        sel.margin_bottom = Inches(margin_bawah)
+    if warna_isi != None:
+        sel.fill.solid()
+        sel.fill.fore_color.rgb = RGBColor(*warna_isi)
+    
+    _cache_sel_tabel[kunci] = tc
+    return tc
+
+def _matriks_format(nilai, rows, cols, warna = False):
+    """
+    Menyamakan format (satu nilai untuk semua cell atau matriks per cell) menjadi list baris x kolom
+    """
+    
+    if nilai is None:
+        return [[None]*cols for i in range(rows)]
+    if warna == True:
+        nilai = np.broadcast_to(np.asarray(nilai, dtype = int), (rows, cols, 3))
+        return [[tuple(rgb) for rgb in baris] for baris in nilai.tolist()]
+    nilai = np.broadcast_to(np.asarray(nilai, dtype = object), (rows, cols))
+    return nilai.tolist()
+
+def tulis_tabel(tabel, teks, warna_font = (0, 0, 0), nama_font = 'Lato', ukuran_font = 10,
+                bold = None, rata = PP_ALIGN.CENTER, anchor = MSO_ANCHOR.MIDDLE,
+                margin_kiri = None, margin_kanan = None, margin_atas = None, margin_bawah = None,
+                warna_isi = None, warna_border = "969696"):
+    """
+    Mengisi teks dan format seluruh cell tabel ppt sekaligus. Tiap format yang berbeda dibuat sekali
+    sebagai cetakan XML a:tc, lalu cell tabel diganti dengan salinan cetakan yang sesuai dan teksnya diisi.
+    Setiap format bisa berupa satu nilai untuk semua cell, matriks (baris x kolom), atau None jika tidak diatur.
+    
+    Parameter
+    ---------
+    tabel : objek tabel di ppt (hasil buat_tabel / add_table)
+    teks : matriks teks (baris x kolom), baris baru ('\\n') menjadi paragraf baru
+    warna_font : warna font RGB (r, g, b) atau array (baris x kolom x 3)
+    nama_font : nama font
+    ukuran_font : ukuran font (dalam satuan Pt)
+    bold : True / False untuk font tebal
+    rata : alignment paragraf (PP_ALIGN)
+    anchor : vertical anchor cell (MSO_ANCHOR)
+    margin_kiri, margin_kanan, margin_atas, margin_bawah : margin cell (dalam satuan Inci)
+    warna_isi : warna isi cell RGB (r, g, b) atau array (baris x kolom x 3)
+    warna_border : warna border cell dengan kode hexadesimal
+    
+    Return
+    ------
+    tabel : objek tabel di ppt yang sudah diisi
+    """
+    
+    list_tr = tabel._tbl.tr_lst
+    rows = len(list_tr)
+    cols = len(list_tr[0].tc_lst)
+    
+    format_sel = [_matriks_format(warna_font, rows, cols, True), _matriks_format(nama_font, rows, cols),
+                  _matriks_format(ukuran_font, rows, cols), _matriks_format(bold, rows, cols),
+                  _matriks_format(rata, rows, cols), _matriks_format(anchor, rows, cols),
+                  _matriks_format(margin_kiri, rows, cols), _matriks_format(margin_kanan, rows, cols),
+                  _matriks_format(margin_atas, rows, cols), _matriks_format(margin_bawah, rows, cols),
+                  _matriks_format(warna_isi, rows, cols, True), _matriks_format(warna_border, rows, cols)]
+    
+    for i in range(rows):
+        list_tc = list_tr[i].tc_lst
+        for j in range(cols):
+            paragraf = str(teks[i][j]).split('\n')
+            kunci = (tuple([p != '' for p in paragraf]),) + tuple([f[i][j] for f in format_sel])
+            
+            tc = copy.deepcopy(_templat_sel(kunci))
+            for p, isi in zip(tc.txBody.p_lst, paragraf):
+                if isi != '':
+                    p.find(qn('a:r')).find(qn('a:t')).text = isi
+            tc.attrib.update(list_tc[j].attrib)
+            list_tr[i].replace(list_tc[j], tc)
+    
+    return tabel
+
+def _seperti_excel(data):
+    """
+    Menyamakan tipe data tabel dengan hasil baca ulang dari excel
+    (kolom float yang seluruh nilainya bulat terbaca sebagai int)
+    """
+
+    data = data.copy()
+    for j in range(data.shape[1]):
+        kolom = data.iloc[:, j]
+        if kolom.dtype.kind == 'f' and kolom.notna().all() and (kolom == kolom.round()).all():
+            data.isetitem(j, kolom.astype('int64'))
+    return data
+
+# Cache warna fill per file excel: path -> (penanda file, {nama sheet: array RGB})
+_cache_warna_excel = {}
+
+def ambil_warna_sheet(file_excel, nama_sheet):
+    """
+    Mengambil warna fill seluruh sel pada satu sheet excel dalam bentuk array RGB.
+    Workbook dibuka sekali (read-only) untuk semua sheet lalu disimpan di cache,
+    dan dibaca ulang jika file excel berubah.
+    
+    Parameter
+    ---------
+    file_excel : path file excel atau pd.ExcelFile
+    nama_sheet : nama sheet pada file excel
+    
+    Return
+    ------
+    warna : array RGB (baris x kolom x 3), sel tanpa fill bernilai 0
+    """
+
+    path = os.path.abspath(getattr(file_excel, 'io', file_excel))
+    info = os.stat(path)
+    penanda = (info.st_size, info.st_mtime_ns)
+
+    if path not in _cache_warna_excel or _cache_warna_excel[path][0] != penanda:
+        wb = openpyxl.load_workbook(path, read_only=True)
+        warna_per_sheet = {}
+        for ws in wb.worksheets:
+            rgb_fill = {}
+            list_baris = list(ws.iter_rows())
+            n_kolom = max([len(baris) for baris in list_baris], default=0)
+            warna = np.zeros((len(list_baris), n_kolom, 3), dtype='uint8')
+            for i, baris in enumerate(list_baris):
+                for j, cell in enumerate(baris):
+                    if cell.fill is None:
+                        continue
+                    rgb_ij = cell.fill.fgColor.rgb
+                    if rgb_ij not in rgb_fill:
+                        rgb_fill[rgb_ij] = [int(rgb_ij[k:k+2], 16) for k in (2, 4, 6)] if isinstance(rgb_ij, str) else [0, 0, 0]
+                    warna[i, j] = rgb_fill[rgb_ij]
+            warna_per_sheet[ws.title] = warna
+        wb.close()
+        _cache_warna_excel[path] = (penanda, warna_per_sheet)
+
+    return _cache_warna_excel[path][1][nama_sheet]
+
+def _ambil_tabel_warna(file_excel, nama_sheet, baris_awal, kolom_awal, warna=None, **kwargs_baca):
+    """
+    Mengambil tabel beserta warna tiap sel data, dari file excel hasil olah data
+    atau langsung dari tabel di memori
+    
+    Parameter
+    ---------
+    file_excel : file excel yang memuat data, tabel (tanpa warna, seperti sheet tanpa fill),
+                 pasangan (tabel, warna), atau Styler hasil olah data beserta parameter warna
+    nama_sheet : nama sheet data pada file excel (tidak dipakai jika file_excel berupa tabel)
+    baris_awal : nomor baris excel (mulai dari 1) untuk baris data pertama
+    kolom_awal : nomor kolom excel (mulai dari 1) untuk kolom data pertama
+    warna : array RGB (baris x kolom x 3) untuk tabel di memori, misalnya hasil olah_tb.warna_gradien
+    kwargs_baca : parameter pd.read_excel (header, index_col)
+    
+    Return
+    ------
+    data : tabel data
+    warna : array RGB (baris x kolom data x 3)
+    """
+
+    if isinstance(file_excel, tuple):
+        file_excel, warna = file_excel
+    if isinstance(file_excel, (pd.DataFrame, Styler)):
+        if isinstance(file_excel, Styler):
+            # Warna Styler tidak bisa dibaca kembali, harus diberikan terpisah
+            if warna is None:
+                raise ValueError("warna tabel Styler harus diberikan, misalnya dengan olah_tb.tabel_warna(tabel, kriteria)")
+            data = file_excel.data
+        else:
+            data = file_excel
+        if warna is None:
+            warna = np.zeros(data.shape + (3,), dtype='uint8')
+        warna = np.asarray(warna, dtype='uint8')
+        if warna.shape != data.shape + (3,):
+            raise ValueError("ukuran warna %s tidak sesuai dengan tabel %s"%(warna.shape, data.shape))
+
+        # Tanpa index_col, kolom index ikut terbaca sebagai kolom data
+        if 'index_col' not in kwargs_baca:
+            n_index = data.index.nlevels
+            data = data.reset_index()
+            warna = np.concatenate([np.zeros((warna.shape[0], n_index, 3), dtype='uint8'), warna], axis=1)
+        return _seperti_excel(data), warna
+
+    data = pd.read_excel(file_excel, sheet_name=nama_sheet, **kwargs_baca)
+
+    # Warna diambil dari cache warna sheet, dipotong sesuai posisi data di excel
+    warna_sheet = ambil_warna_sheet(file_excel, nama_sheet)
+    warna = np.zeros(data.shape + (3,), dtype='uint8')
+    potongan = warna_sheet[baris_awal-1:baris_awal-1+data.shape[0], kolom_awal-1:kolom_awal-1+data.shape[1]]
+    warna[:potongan.shape[0], :potongan.shape[1]] = potongan
+    return data, warna
+
 def plot_text(template_ppt, nomor_slide, teks, nilai, font_style, font_size,
                             kiri, atas, lebar, tinggi):
     """
@@ -327,8 +850,39 @@ def plot_sample_size(data, tabel):
     return None
 
 
+def ppt_sample_size(template_ppt, nomor_slide, data):
+    """
+    Membuat tabel sampel size beserta ukuran kolom dan barisnya lalu mem-plot datanya (buat_tabel + plot_sample_size)
+
+    Parameter
+    ---------
+    template_ppt : template ppt yang dipakai
+    nomor_slide : angka nomor slide (mulai dari 0)
+    data : data sampel size (hasil olah_tb.sample_size)
+
+    Return
+    ------
+    None
+    """
+
+    tabel = buat_tabel(template_ppt = template_ppt, nomor_slide = nomor_slide,
+                       baris = len(data)+1, kolom = len(data.columns)+1,
+                       kiri = 0.25, atas = 1, lebar = 4.25, tinggi = 5)
+    tabel.columns[0].width = Inches(.5)
+    tabel.columns[1].width = Inches(1.2)
+
+    tabel.rows[0].height = Inches(.47)
+    for i in range(1, len(data)-1):
+        tabel.rows[i].height = Inches(.33)
+    tabel.rows[len(data)].height = Inches(.47)
+
+    plot_sample_size(data, tabel)
+
+    return None
+
+
 def plot_tracking(template_ppt,nomor_slide, 
-                  data, merek):
+                  data, merek, workbook_chart = 'lengkap'):
     """
     Plot data tracking
     
@@ -338,6 +892,7 @@ def plot_tracking(template_ppt,nomor_slide,
     nomor_slide : angka nomor slide (mulai dari 0)
     data : data yang akan diploting
     merek : merek tahun ini yang akan diploting
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     None
@@ -349,22 +904,27 @@ def plot_tracking(template_ppt,nomor_slide,
     gf_tracking = ChartData()
     gf_tracking.categories = data.Tahun.unique()
 
+    label_tbi = []
     for mrk in merek:
         dt_ = data[data.Merek.isin([mrk])].sort_values(by = 'Tahun')
         dt_tbi = dt_['Top Brand Index'].values*100
         tbi = []
+        label = []
         for n_d_tbi in dt_tbi:
             if str(n_d_tbi) == 'nan':
                 dt_tbi_i = '#N/A'
+                label = label + ['']
             else:
                 dt_tbi_i = round(n_d_tbi,1)
+                label = label + [str(dt_tbi_i)+"%"]
             tbi = tbi + [dt_tbi_i]  
         
         gf_tracking.add_series(mrk, tbi)
+        label_tbi.append(label)
 
     x, y, cx, cy = Inches(0.33), Inches(1), Inches(9.26), Inches(4.25)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.LINE, x, y, cx, cy, gf_tracking
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.LINE, x, y, cx, cy, gf_tracking, workbook_chart
     ).chart
     chart.has_legend = True
     chart.legend.position = XL_LEGEND_POSITION.BOTTOM
@@ -384,32 +944,21 @@ def plot_tracking(template_ppt,nomor_slide,
     chart.plots[0].has_data_labels = True
     list_rgb = [[112, 48, 160],[49, 133, 156], [255, 102, 0], [51, 204, 51],[192, 0, 0],[249, 19, 150]]
     for i in range(len(merek)):
-        chart.plots[0].series[i].format.line.width = Pt(1)
-        chart.plots[0].series[i].format.line.color.rgb = RGBColor(list_rgb[i][0], list_rgb[i][1], list_rgb[i][2])
-        dt_ = data[data.Merek == merek[i]].sort_values(by = 'Tahun')
-        dt_tbi = dt_['Top Brand Index'].values*100
-        dt_tbi = [round(n_d_tbi,1) for n_d_tbi in dt_tbi]
-        for j in range(len(dt_tbi)):
-            label = dt_tbi[j]
-            if str(label) == 'nan':
-                chart.plots[0].series[i].points[j].data_label.text_frame.text = ''
-            else:
-                chart.plots[0].series[i].points[j].data_label.text_frame.text = str(label)+"%"
-            #chart.plots[0].series[i].points[j].data_label.ShowBubbleSize = True
-            chart.plots[0].series[i].points[j].data_label.font.size = Pt(12)
-            chart.plots[0].series[i].points[j].data_label.font.name = 'Tahoma'
-            chart.plots[0].series[i].points[j].data_label.font.bold = True
-            chart.plots[0].series[i].points[j].data_label.font.color.rgb = RGBColor(list_rgb[i][0], list_rgb[i][1], list_rgb[i][2])
-            chart.plots[0].series[i].points[j].data_label.position = XL_LABEL_POSITION.ABOVE
-            chart.plots[0].series[i].marker.style = XL_MARKER_STYLE.CIRCLE
-            chart.plots[0].series[i].marker.format.fill.solid()
-            chart.plots[0].series[i].marker.format.fill.fore_color.rgb = RGBColor(list_rgb[i][0], list_rgb[i][1], list_rgb[i][2])
-            chart.plots[0].series[i].marker.size =  8 
+        rgb_i = RGBColor(list_rgb[i][0], list_rgb[i][1], list_rgb[i][2])
+        seri = chart.plots[0].series[i]
+        seri.format.line.width = Pt(1)
+        seri.format.line.color.rgb = rgb_i
+        tulis_label_seri(seri, label_tbi[i], ukuran_font = 12, nama_font = 'Tahoma', bold = True,
+                         warna_font = list_rgb[i], posisi = XL_LABEL_POSITION.ABOVE)
+        seri.marker.style = XL_MARKER_STYLE.CIRCLE
+        seri.marker.format.fill.solid()
+        seri.marker.format.fill.fore_color.rgb = rgb_i
+        seri.marker.size =  8 
     return None
 
 
 def plot_kemarin_sekarang(template_ppt, nomor_slide,
-                          tahun_ini, data_tahun_kemarin, data_tahun_sekarang, merek_top6):
+                          tahun_ini, data_tahun_kemarin, data_tahun_sekarang, merek_top6, workbook_chart = 'lengkap'):
     """
     Plot data tahun kemarin dan sekarang untuk TBI, TOM, LU, FI
     
@@ -421,6 +970,7 @@ def plot_kemarin_sekarang(template_ppt, nomor_slide,
     data_tahun_kemarin : data untuk tahun kemarin
     data_tahun_sekarang : data untuk tahun saat ini
     merek_top6 : daftar merek top6 untuk perbandingan
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -450,8 +1000,8 @@ def plot_kemarin_sekarang(template_ppt, nomor_slide,
             else:
                 x, y, cx, cy = Inches(x_val), Inches(1.675), Inches(2.5), Inches(3.5)
                 
-            bar_top6 = slide.shapes.add_chart(
-                XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, bar_top6
+            bar_top6 = tambah_chart(
+                slide, XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, bar_top6, workbook_chart
             ).chart
 
             bar_top6.has_title = False
@@ -486,14 +1036,12 @@ def plot_kemarin_sekarang(template_ppt, nomor_slide,
             data_bar_labels.font.name = 'Tahoma'
             
             
-            for p in range(6):
-                bar_top6.plots[0].series[0].points[p].format.fill.solid()
-                bar_top6.plots[0].series[0].points[p].format.fill.fore_color.rgb = RGBColor(list_rgb[tmpl][0], list_rgb[tmpl][1],list_rgb[tmpl][2])
+            warnai_titik(bar_top6.plots[0].series[0], list_rgb[tmpl], 6)
             
     return None
 
 
-def plot_tracking_client(template_ppt, nomor_slide, data):
+def plot_tracking_client(template_ppt, nomor_slide, data, workbook_chart = 'lengkap'):
     """
     Plot TOM, LU, FI untuk khusus tracking
     
@@ -502,6 +1050,7 @@ def plot_tracking_client(template_ppt, nomor_slide, data):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)
     data : data yang akan di-plot
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -525,8 +1074,8 @@ def plot_tracking_client(template_ppt, nomor_slide, data):
 
 
     x, y, cx, cy = Inches(0.75), Inches(1.5), Inches(5.44), Inches(5.12)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart, workbook_chart
     ).chart
 
     # chart.has_legend = False
@@ -556,14 +1105,12 @@ def plot_tracking_client(template_ppt, nomor_slide, data):
     data_bar_labels.position = XL_LABEL_POSITION.OUTSIDE_END
     
     for i in range(len(tampil)):
-        for j in range(len(list_th)):
-            chart.plots[0].series[i].points[j].format.fill.solid()
-            chart.plots[0].series[i].points[j].format.fill.fore_color.rgb = RGBColor(list_rgb[i][0], list_rgb[i][1],list_rgb[i][2])
+        warnai_titik(chart.plots[0].series[i], list_rgb[i], len(list_th))
  
     return None
 
 
-def plot_line_tracking_client(template_ppt, nomor_slide, data):
+def plot_line_tracking_client(template_ppt, nomor_slide, data, workbook_chart = 'lengkap'):
     """
     Plot line chart untuk tracking data client selama 5 tahun terakhir
     
@@ -572,6 +1119,7 @@ def plot_line_tracking_client(template_ppt, nomor_slide, data):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)
     data : data yang akan di-plot
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -592,8 +1140,8 @@ def plot_line_tracking_client(template_ppt, nomor_slide, data):
             gf_client.add_series(kel_, 100*data[kel_].values)
 
             x, y, cx, cy = Inches(0.75), Inches(y_val), Inches(4.33), Inches(2.5)
-            chart = slide.shapes.add_chart(
-                XL_CHART_TYPE.LINE_MARKERS, x, y, cx, cy, gf_client
+            chart = tambah_chart(
+                slide, XL_CHART_TYPE.LINE_MARKERS, x, y, cx, cy, gf_client, workbook_chart
             ).chart
             
             chart.has_title = False
@@ -627,7 +1175,7 @@ def plot_line_tracking_client(template_ppt, nomor_slide, data):
     return None
 
 
-def plot_data_ir_kota(template_ppt, nomor_slide, data_ir):
+def plot_data_ir_kota(template_ppt, nomor_slide, data_ir, workbook_chart = 'lengkap'):
     """
     Plot data ir breakdown kota
     
@@ -636,6 +1184,7 @@ def plot_data_ir_kota(template_ppt, nomor_slide, data_ir):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
     data_ir : data IR yang akan di-plot    
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -657,8 +1206,8 @@ def plot_data_ir_kota(template_ppt, nomor_slide, data_ir):
     chart_data.add_series('Tidak', data_ir.Tidak[:len(list_kategori)].values)
 
     x, y, cx, cy = Inches(5), Inches(1.33), Inches(4.75), Inches(4.5)
-    chart = slide.shapes.add_chart(
-    XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data
+    chart = tambah_chart(
+    slide, XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data, workbook_chart
     ).chart
     
     chart.value_axis.visible = False
@@ -669,11 +1218,8 @@ def plot_data_ir_kota(template_ppt, nomor_slide, data_ir):
     chart.category_axis.major_tick_mark = XL_TICK_MARK.NONE
     set_reverse_categories(chart.category_axis)
     plot = chart.plots[0]
-    for i in range(len(list_kota)):
-        plot.series[0].points[i].format.fill.solid()
-        plot.series[0].points[i].format.fill.fore_color.rgb = RGBColor(69, 114, 167)
-        plot.series[1].points[i].format.fill.solid()
-        plot.series[1].points[i].format.fill.fore_color.rgb = RGBColor(147, 169, 207)
+    warnai_titik(plot.series[0], (69, 114, 167), len(list_kota))
+    warnai_titik(plot.series[1], (147, 169, 207), len(list_kota))
     
     plot.gap_width = 57
     plot.overlap = 100
@@ -688,7 +1234,7 @@ def plot_data_ir_kota(template_ppt, nomor_slide, data_ir):
     return None
 
 
-def pie_chart_ir(template_ppt, nomor_slide, data_ir, left, top, width, height):
+def pie_chart_ir(template_ppt, nomor_slide, data_ir, left, top, width, height, workbook_chart = 'lengkap'):
     """
     Membuat chart pie untuk data_ir 'Ya' dan 'Tidak'
     
@@ -697,6 +1243,7 @@ def pie_chart_ir(template_ppt, nomor_slide, data_ir, left, top, width, height):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
     data_ir : data IR yang akan di-plot   
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -712,8 +1259,8 @@ def pie_chart_ir(template_ppt, nomor_slide, data_ir, left, top, width, height):
     pie_chart.add_series('IR', series)
 
     x, y, cx, cy = Inches(left), Inches(top), Inches(width), Inches(height)
-    pie= slide.shapes.add_chart(
-        XL_CHART_TYPE.PIE_EXPLODED, x, y, cx, cy, pie_chart
+    pie= tambah_chart(
+        slide, XL_CHART_TYPE.PIE_EXPLODED, x, y, cx, cy, pie_chart, workbook_chart
     ).chart
 
     pie.has_title = False
@@ -738,7 +1285,7 @@ def pie_chart_ir(template_ppt, nomor_slide, data_ir, left, top, width, height):
 
 
 def donut_chart(template_ppt, nomor_slide, data, 
-                     left, top, width, height, explode=False):
+                     left, top, width, height, explode=False, workbook_chart = 'lengkap'):
     """
     Plot data usia dengan chart dunia
     
@@ -752,6 +1299,7 @@ def donut_chart(template_ppt, nomor_slide, data,
     width : lebar chart
     height : tinggi chart    
     explode : jika explode TRUE, chart akan memiliki explosion
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -768,12 +1316,12 @@ def donut_chart(template_ppt, nomor_slide, data,
     x, y, cx, cy = Inches(left), Inches(top), Inches(width), Inches(height)
     
     if explode==False:
-        donut = slide.shapes.add_chart(
-            XL_CHART_TYPE.DOUGHNUT, x, y, cx, cy, donut_chart
+        donut = tambah_chart(
+            slide, XL_CHART_TYPE.DOUGHNUT, x, y, cx, cy, donut_chart, workbook_chart
         ).chart
     else:
-        donut = slide.shapes.add_chart(
-            XL_CHART_TYPE.DOUGHNUT_EXPLODED, x, y, cx, cy, donut_chart
+        donut = tambah_chart(
+            slide, XL_CHART_TYPE.DOUGHNUT_EXPLODED, x, y, cx, cy, donut_chart, workbook_chart
         ).chart
 
     donut.has_title = False
@@ -789,14 +1337,12 @@ def donut_chart(template_ppt, nomor_slide, data,
     data_donut_labels.position = XL_LABEL_POSITION.CENTER
     
     list_rgb = [[57, 96, 142], [69, 114, 167], [79, 129, 189], [147, 169, 207], [188, 200, 223]]
-    for j in range(len(data.columns)):
-        donut.plots[0].series[0].points[j].format.fill.solid()
-        donut.plots[0].series[0].points[j].format.fill.fore_color.rgb = RGBColor(list_rgb[j][0], list_rgb[j][1],list_rgb[j][2])
+    warnai_titik(donut.plots[0].series[0], list_rgb[:len(data.columns)])
    
     return None
 
 
-def bar_chart_profil(template_ppt, nomor_slide, data, left, top, width, height, slice_at = None):
+def bar_chart_profil(template_ppt, nomor_slide, data, left, top, width, height, slice_at = None, workbook_chart = 'lengkap'):
     """
     Plot bar chart untuk profil bagian data
     
@@ -809,6 +1355,7 @@ def bar_chart_profil(template_ppt, nomor_slide, data, left, top, width, height,
     top : tepi chart dari atas
     width : lebar chart
     height : tinggi chart
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -826,8 +1373,8 @@ def bar_chart_profil(template_ppt, nomor_slide, data, left, top, width, height,
     chart.add_series('Series 1', data.loc[:0,:].squeeze().values)
 
     x, y, cx, cy = Inches(left), Inches(top), Inches(width), Inches(height)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart, workbook_chart
     ).chart
 
     chart.has_title = False
@@ -853,14 +1400,12 @@ def bar_chart_profil(template_ppt, nomor_slide, data, left, top, width, height,
     data_pie_labels.number_format = '#.0"%"'
     chart.position = XL_LABEL_POSITION.OUTSIDE_END
     
-    for j in range(len(data.columns)):
-        chart.plots[0].series[0].points[j].format.fill.solid()
-        chart.plots[0].series[0].points[j].format.fill.fore_color.rgb = RGBColor(55,96,146)
+    warnai_titik(chart.plots[0].series[0], (55, 96, 146), len(data.columns))
 
     return None
 
 
-def grafik_profil_responden(template_ppt, nomor_slide, data_masukan):
+def grafik_profil_responden(template_ppt, nomor_slide, data_masukan, workbook_chart = 'lengkap'):
     """
     Membuat bar chart untuk profil responden
     
@@ -869,6 +1414,7 @@ def grafik_profil_responden(template_ppt, nomor_slide, data_masukan):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
     data_masukan : data yang akan di-plot      
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -895,8 +1441,8 @@ def grafik_profil_responden(template_ppt, nomor_slide, data_masukan):
         chart.add_series(tampil[tmp], val_)
 
     x, y, cx, cy = Inches(0.33), Inches(1.25), Inches(9.125), Inches(2.5)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart, workbook_chart
     ).chart
 
     # chart.has_legend = False
@@ -920,9 +1466,7 @@ def grafik_profil_responden(template_ppt, nomor_slide, data_masukan):
     data_bar_labels.position = XL_LABEL_POSITION.OUTSIDE_END  
     
     for i in range(len(tampil)):
-        for j in range(len(list_th)):
-            chart.plots[0].series[i].points[j].format.fill.solid()
-            chart.plots[0].series[i].points[j].format.fill.fore_color.rgb = RGBColor(list_rgb[i][0], list_rgb[i][1],list_rgb[i][2])
+        warnai_titik(chart.plots[0].series[i], list_rgb[i], len(list_th))
      
     return None
 
@@ -961,19 +1505,9 @@ def plot_tabel_n_sampel(template_ppt, nomor_slide, data_masukan, with_mean = Fal
         
         for j in range(cols):
             list_temp[j] = 'n: ' + str(list_temp[j])
-            
-            _set_cell_border(tabel_n_sampel.cell(0,j), "969696")
-            tabel_n_sampel.cell(0,j).text = list_temp[j]
-            tabel_n_sampel.cell(0,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel_n_sampel.cell(0,j).text_frame.paragraphs[0].font.name = 'Lato Light'
-            tabel_n_sampel.cell(0,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel_n_sampel.cell(0,j).text_frame.paragraphs[0].font.bold = False
-            tabel_n_sampel.cell(0,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel_n_sampel.cell(0,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel_n_sampel.cell(0,j).margin_left = Inches(0)
-            tabel_n_sampel.cell(0,j).margin_right = Inches(0)
-            tabel_n_sampel.cell(0,j).fill.solid()
-            tabel_n_sampel.cell(0,j).fill.fore_color.rgb = RGBColor(192, 192, 192)
+        
+        tulis_tabel(tabel_n_sampel, [list_temp], nama_font = 'Lato Light', bold = False,
+                    margin_kiri = 0, margin_kanan = 0, warna_isi = (192, 192, 192))
     else:
         usia_ = pd.Series(data.columns[:-1].to_list())
         rata_usia = []
@@ -998,33 +1532,15 @@ def plot_tabel_n_sampel(template_ppt, nomor_slide, data_masukan, with_mean = Fal
                     list_temp[i][j] = 'Mean usia:\n' + str("%.2f" % rata_usia[j])
                 else:
                     list_temp[i][j] = 'n: ' + str(n_sampel[j])
-                    
-                _set_cell_border(tabel_n_sampel.cell(i,j), "969696")
-                tabel_n_sampel.cell(i,j).text = list_temp[i][j]
-                tabel_n_sampel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-                tabel_n_sampel.cell(i,j).margin_left = Inches(0)
-                tabel_n_sampel.cell(i,j).margin_right = Inches(0)
-                tabel_n_sampel.cell(i,j).margin_top = Inches(0)
-                tabel_n_sampel.cell(i,j).margin_bottom = Inches(0)
-                tabel_n_sampel.cell(i,j).fill.solid()
-                tabel_n_sampel.cell(i,j).fill.fore_color.rgb = RGBColor(192, 192, 192)
-                tabel_n_sampel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-                tabel_n_sampel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato Light'
-                tabel_n_sampel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-                tabel_n_sampel.cell(i,j).text_frame.paragraphs[0].font.bold = False
-                tabel_n_sampel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-                
-                if len(tabel_n_sampel.cell(i,j).text_frame.paragraphs) > 1:
-                    tabel_n_sampel.cell(i,j).text_frame.paragraphs[1].font.color.rgb = RGBColor(0,0,0)
-                    tabel_n_sampel.cell(i,j).text_frame.paragraphs[1].font.name = 'Lato Light'
-                    tabel_n_sampel.cell(i,j).text_frame.paragraphs[1].font.size = Pt(10)
-                    tabel_n_sampel.cell(i,j).text_frame.paragraphs[1].font.bold = False
-                    tabel_n_sampel.cell(i,j).text_frame.paragraphs[1].alignment = PP_ALIGN.CENTER
+        
+        tulis_tabel(tabel_n_sampel, list_temp, nama_font = 'Lato Light', bold = False,
+                    margin_kiri = 0, margin_kanan = 0, margin_atas = 0, margin_bawah = 0,
+                    warna_isi = (192, 192, 192))
                     
         tabel_n_sampel.rows[0].height = Inches(.375)
     return None
 
-def plot_tabel_pekerjaan(template_ppt, nomor_slide, file_excel, nama_sheet):
+def plot_tabel_pekerjaan(template_ppt, nomor_slide, file_excel, nama_sheet, warna=None):
     """
     Membuat plot tabel pekerjaan
     
@@ -1032,17 +1548,16 @@ def plot_tabel_pekerjaan(template_ppt, nomor_slide, file_excel, nama_sheet):
     ---------
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
-    file_excel = File excel yang memuat data
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
     nama_sheet = nama sheet data pekerjaan pada file excel
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
     Return
     ------
     None
     """
     
-    dt_pekerjaan = pd.read_excel(file_excel, sheet_name=nama_sheet)    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
+    dt_pekerjaan, warna_pekerjaan = _ambil_tabel_warna(file_excel, nama_sheet, 2, 1, warna)
        
     slide = template_ppt.slides[nomor_slide]
     shapes = slide.shapes
@@ -1056,6 +1571,13 @@ def plot_tabel_pekerjaan(template_ppt, nomor_slide, file_excel, nama_sheet):
     tabel_pekerjaan = shapes.add_table(rows, cols, left, top, width, height).table
 
     header = dt_pekerjaan.columns.to_list()
+    
+    teks = []
+    warna_font = np.zeros((rows, cols, 3), dtype = np.uint8)
+    warna_isi = np.full((rows, cols, 3), 255, dtype = np.uint8)
+    ukuran_font = np.full((rows, cols), 9)
+    rata = np.full((rows, cols), PP_ALIGN.CENTER, dtype = object)
+    margin_kiri = np.zeros((rows, cols))
 
     for i in range(rows):
         if i==0:
@@ -1069,44 +1591,30 @@ def plot_tabel_pekerjaan(template_ppt, nomor_slide, file_excel, nama_sheet):
                     list_temp[j] = str("%.1f" % list_temp[j]) + '%'
                 else:
                     list_temp[j] = str(list_temp[j])
-                
-            _set_cell_border(tabel_pekerjaan.cell(i,j), "969696")
-            tabel_pekerjaan.cell(i,j).text = list_temp[j]
-            tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.size = Pt(9)
-            tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.bold = False
-            tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel_pekerjaan.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel_pekerjaan.cell(i,j).margin_left = Inches(0)
-            tabel_pekerjaan.cell(i,j).margin_right = Inches(0)
-            tabel_pekerjaan.cell(i,j).fill.solid()
-            tabel_pekerjaan.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
             
             if i == 0 or i == rows-1:
-                tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel_pekerjaan.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)  
+                warna_font[i,j] = (255, 255, 255)
+                warna_isi[i,j] = (51, 102, 153)
                 
                 if j != 0:
-                    tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].font.size = Pt(8)
+                    ukuran_font[i,j] = 8
             else:
                 if j != 0:
-                    rgb_ij = sheet_warna.cell(i+1, j+1).fill.fgColor.rgb[2:]
-                    rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                    tabel_pekerjaan.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2]) 
+                    warna_isi[i,j] = warna_pekerjaan[i-1, j]
             
             if j == 0: 
-                tabel_pekerjaan.cell(i,j).margin_left = Inches(0.1)
+                margin_kiri[i,j] = 0.1
                 if i != 0:
-                    tabel_pekerjaan.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
-    #         tabel_pekerjaan.cell(i,j).fill.solid()
-    # #         tabel_pekerjaan.cell(i,j).fill.fore_color.rgb = RGBColor(155,187,89)
-    # tabel_pekerjaan.cell(i,0).merge(tabel_sampel_size.cell(i,1))            
+                    rata[i,j] = PP_ALIGN.LEFT
+        teks.append(list_temp)
+    
+    tulis_tabel(tabel_pekerjaan, teks, warna_font = warna_font, ukuran_font = ukuran_font, bold = False, rata = rata,
+                margin_kiri = margin_kiri, margin_kanan = 0, warna_isi = warna_isi)
     tabel_pekerjaan.columns[0].width = Inches(1.75)
     tabel_pekerjaan.rows[0].height = Inches(.5)
     return None
 
-def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, client = 'Comforta'):
+def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, client = 'Comforta', workbook_chart = 'lengkap'):
     """
     Membuat plot bar chart untuk indeks brand dan gap-nya terhadap indeks tertinggi
     
@@ -1117,6 +1625,7 @@ def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, c
     data_plot : data yang akan di-plot (TOM, LU, FI, nonUser, Unaided)
     gap_data_plot : jika ada, tabel data gap indeks antar brand akan di-plot
     client = Nama brand client
+    workbook_chart = workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -1134,8 +1643,8 @@ def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, c
         x, y, cx, cy = Inches(0.25), Inches(.5), Inches(9.25), Inches(2.63)
     else:
         x, y, cx, cy = Inches(0.25), Inches(.5), Inches(9.25), Inches(3)
-    chart= slide.shapes.add_chart(
-        XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart
+    chart= tambah_chart(
+        slide, XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart, workbook_chart
     ).chart
     
     chart.has_title = False
@@ -1160,16 +1669,17 @@ def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, c
     data_chart_labels.font.size = Pt(10)
     data_chart_labels.position = XL_LABEL_POSITION.OUTSIDE_END  
     
+    warna_bar = []
     for j in range(len(data_plot.Brand)):
-        chart.plots[0].series[0].points[j].format.fill.solid()
         if client == None:
             chart.category_axis.visible = False
-            chart.plots[0].series[0].points[j].format.fill.fore_color.rgb = RGBColor(255, 192, 0)            
+            warna_bar.append((255, 192, 0))
         else:
             if data_plot.Brand[j] == client:
-                chart.plots[0].series[0].points[j].format.fill.fore_color.rgb = RGBColor(37, 64, 97)
+                warna_bar.append((37, 64, 97))
             else:
-                chart.plots[0].series[0].points[j].format.fill.fore_color.rgb = RGBColor(127, 127, 127)
+                warna_bar.append((127, 127, 127))
+    warnai_titik(chart.plots[0].series[0], warna_bar)
     
     
     if type(gap_data_plot)==pd.DataFrame:
@@ -1204,63 +1714,95 @@ def ppt_plot_bar_gap(template_ppt, nomor_slide, data_plot, gap_data_plot=None, c
 
 
 
-def ppt_by_kota(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False):
+def ppt_by(template_ppt, nomor_slide, file_excel, nama_sheet, left, top, width, height,
+           n_sampel = True, tot_multirespon = False, warna = None, baris_header = 1, dengan_indeks = True,
+           lebar_indeks = None, tinggi_header = None, bold = False, margin_nol = True, margin_indeks = None,
+           size_subheader = 7, size_multirespon = None):
     """
-    Plot tabel crosstab indeks brand dengan kota
+    Plot tabel crosstab indeks brand dengan breakdown apa saja (kota, usiar, expandr, sex, kota x SES, ...).
+    Baris header, isi header, dan merge cell header diturunkan dari level kolom tabel (MultiIndex),
+    kolom yang berurutan dengan label level atas yang sama digabung menjadi satu cell.
     
     Parameter
     ---------
     template_ppt : template ppt yang dipakai
-    nomor_slide : angka nomor slide (mulai dari 0)   
-    file_excel = File excel yang memuat data
-    nama_sheet = nama sheet data pekerjaan pada file excel    
+    nomor_slide : angka nomor slide (mulai dari 0)
+    file_excel : file excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
+    nama_sheet : nama sheet data pada file excel
+    left : batas kiri tabel dengan tepi slide (dalam satuan Inci)
+    top : batas atas tabel dengan tepi slide (dalam satuan Inci)
+    width : lebar seluruh tabel (dalam satuan Inci)
+    height : tinggi seluruh tabel (dalam satuan Inci)
+    n_sampel : True jika baris terakhir berisi n sampel
+    tot_multirespon : True jika dua baris terakhir berisi total multirespon dan n sampel
+    warna : array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
+    baris_header : jumlah baris header tabel di file excel (tabel di memori mengikuti level kolomnya)
+    dengan_indeks : False jika kolom indeks (brand) tidak ikut ditampilkan
+    lebar_indeks : lebar kolom indeks (dalam satuan Inci), None jika tidak diatur
+    tinggi_header : tinggi baris header pertama (dalam satuan Inci), None jika tidak diatur
+    bold : format bold font (None jika tidak diatur)
+    margin_nol : True jika margin kiri dan kanan cell dibuat 0
+    margin_indeks : margin kiri kolom indeks (dalam satuan Inci), None jika tidak diatur
+    size_subheader : ukuran font baris header selain baris pertama
+    size_multirespon : ukuran font jika tot_multirespon (selain sub header), None jika tidak diubah
     
     Return
     ------
-    None    
+    None
     """
     
-    data_kota = pd.read_excel(file_excel, sheet_name=nama_sheet, header=[0,1], index_col=[0])    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
+    kwargs_baca = {'index_col' : [0]}
+    if baris_header > 1:
+        kwargs_baca['header'] = list(range(baris_header))
+    data, warna_data = _ambil_tabel_warna(file_excel, nama_sheet, baris_header + 1 + (baris_header > 1), 2,
+                                          warna, **kwargs_baca)
+    n_header = data.columns.nlevels
+    
+    data = data.reset_index()
+    kolom = data.columns.to_list()
+    if n_header == 1:
+        label = [[kol] for kol in kolom]
+    else:
+        label = [list(kol) for kol in kolom]
+    
+    isi_header = []
+    for l in range(n_header):
+        baris_label = []
+        for x in range(len(kolom)):
+            if l < n_header - 1 and x > 0 and label[x][:l+1] == label[x-1][:l+1]:
+                baris_label.append('')
+            else:
+                baris_label.append(label[x][l])
+        isi_header.append(baris_label)
+    
     slide = template_ppt.slides[nomor_slide]
     shapes = slide.shapes
-
-    rows = data_kota.shape[0]+2
-    cols = data_kota.shape[1]+1
-    left = Inches(0.125)
-    top = Inches(1.125)
-    width = Inches(9.25)
-    height = Inches(3)
-
-    tabel = shapes.add_table(rows, cols, left, top, width, height).table
-
-    data_kota = data_kota.reset_index()
-
-    isi_header1 = []
-    for x in range(len(data_kota.columns)):
-        kol = data_kota.columns[x][0]
-        if x==0:
-            isi_header1.append(kol)
-        elif kol==data_kota.columns[x-1][0]:
-            isi_header1.append('')
-        else:
-            isi_header1.append(kol)
-
-    isi_header2 = [data_kota.columns[x][1] for x in range(len(data_kota.columns))]
-
+    
+    awal = 0 if dengan_indeks == True else 1
+    rows = data.shape[0] + n_header
+    cols = data.shape[1] - awal
+    
+    tabel = shapes.add_table(rows, cols, Inches(left), Inches(top), Inches(width), Inches(height)).table
+    
+    teks = []
+    warna_font = np.zeros((rows, cols, 3), dtype = np.uint8)
+    warna_isi = np.full((rows, cols, 3), 255, dtype = np.uint8)
+    ukuran_font = np.full((rows, cols), 10)
+    rata = np.full((rows, cols), PP_ALIGN.CENTER, dtype = object)
+    if margin_nol == True:
+        margin_kiri = np.zeros((rows, cols))
+    else:
+        margin_kiri = np.full((rows, cols), None, dtype = object)
+    
     for i in range(rows):
-        if i==0:
-            header = isi_header1
-            list_temp = header
-        elif i==1:
-            header = isi_header2
-            list_temp = header
-
+        if i < n_header:
+            list_temp = list(isi_header[i])
         else:
-            list_temp = data_kota.loc[i-2,:].to_list()
-
-        for j in range(cols):     
+            list_temp = data.loc[i-n_header,:].to_list()
+        list_temp = list_temp[awal:]
+        
+        for j in range(cols):
+            kol = j + awal
             if type(list_temp[j])!=str:
                 if n_sampel == True:
                     if i != rows - 1:
@@ -1270,335 +1812,144 @@ def ppt_by_kota(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = Tr
                         list_temp[j] = str(list_temp[j])
                 else:
                     list_temp[j] = str(list_temp[j]) + '%'
-                
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].font.bold = False
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel.cell(i,j).margin_left = Inches(0)
-            tabel.cell(i,j).margin_right = Inches(0)
-            tabel.cell(i,j).fill.solid()
-            tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
             
-            if i == 0 or i == 1:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153) 
-            else:
-                if j != 0:
-                    rgb_ij = sheet_warna.cell(i+2, j+1).fill.fgColor.rgb[2:]
-                    rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2])                 
+            if i < n_header:
+                warna_font[i,j] = (255, 255, 255)
+                warna_isi[i,j] = (51, 102, 153)
+            elif kol != 0:
+                warna_isi[i,j] = warna_data[i-n_header, kol-1]
             
-            if i == 1 and j != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(7)
-            if j == 0 and i != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
-                tabel.cell(i,j).margin_left = Inches(.05)                
+            if 0 < i < n_header and kol != 0:
+                ukuran_font[i,j] = size_subheader
+            if kol == 0 and i != 0:
+                rata[i,j] = PP_ALIGN.LEFT
+                if margin_indeks != None:
+                    margin_kiri[i,j] = margin_indeks
             if tot_multirespon == True:
                 if i == rows-1 or i == rows-2:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-                    tabel.cell(i,j).margin_left = Inches(0)
-                    tabel.cell(i,j).margin_right = Inches(0)
-                if i != 1:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(9)
+                    warna_font[i,j] = (255, 255, 255)
+                    warna_isi[i,j] = (51, 102, 153)
+                    if margin_nol == True:
+                        margin_kiri[i,j] = 0
+                if size_multirespon != None and not 0 < i < n_header:
+                    ukuran_font[i,j] = size_multirespon
             elif n_sampel == True and i == rows-1:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-                
-    tabel.cell(0,0).merge(tabel.cell(1,0))            
-    tabel.cell(0,1).merge(tabel.cell(0,7))            
-    tabel.cell(0,8).merge(tabel.cell(0,10))     
-    tabel.cell(0,11).merge(tabel.cell(0,13))     
-    tabel.cell(0,14).merge(tabel.cell(0,15))     
-    tabel.columns[0].width = Inches(1)
+                warna_font[i,j] = (255, 255, 255)
+                warna_isi[i,j] = (51, 102, 153)
+        teks.append(list_temp)
+    
+    tulis_tabel(tabel, teks, warna_font = warna_font, ukuran_font = ukuran_font, bold = bold, rata = rata,
+                margin_kiri = margin_kiri, margin_kanan = 0 if margin_nol == True else None, warna_isi = warna_isi)
+    
+    # Merge header: kolom indeks ke bawah, label level atas yang sama ke samping
+    if dengan_indeks == True and n_header > 1:
+        tabel.cell(0,0).merge(tabel.cell(n_header-1,0))
+    for l in range(n_header - 1):
+        x = awal
+        while x < len(kolom):
+            y = x
+            while y + 1 < len(kolom) and label[y+1][:l+1] == label[x][:l+1]:
+                y += 1
+            if y > x:
+                tabel.cell(l, x-awal).merge(tabel.cell(l, y-awal))
+            x = y + 1
+    
+    if lebar_indeks != None and dengan_indeks == True:
+        tabel.columns[0].width = Inches(lebar_indeks)
+    if tinggi_header != None:
+        tabel.rows[0].height = Inches(tinggi_header)
     
     return None
 
 
-def ppt_by_usiar(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False):
+def ppt_by_kota(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False, warna = None):
     """
-    Plot tabel crosstab indeks brand dengan usiar
+    Plot tabel crosstab indeks brand dengan kota (lihat ppt_by)
     
     Parameter
     ---------
     template_ppt : template ppt yang dipakai
-    nomor_slide : angka nomor slide (mulai dari 0)  
-    file_excel = File excel yang memuat data
-    nama_sheet = nama sheet data pekerjaan pada file excel
+    nomor_slide : angka nomor slide (mulai dari 0)   
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
+    nama_sheet = nama sheet data pekerjaan pada file excel    
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
     Return
     ------
     None    
     """
     
-    data_usiar = pd.read_excel(file_excel, sheet_name=nama_sheet, index_col = [0])    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
-    
-    slide = template_ppt.slides[nomor_slide]
-    shapes = slide.shapes
-
-    rows = data_usiar.shape[0]+1
-    cols = data_usiar.shape[1]+1
-    left = Inches(0.375)
-    top = Inches(1.25)
-    width = Inches(8.75)
-    height = Inches(3)
-
-    tabel = shapes.add_table(rows, cols, left, top, width, height).table
-
-    data_usiar = data_usiar.reset_index()
-
-    isi_header = [data_usiar.columns[x] for x in range(len(data_usiar.columns))]
+    return ppt_by(template_ppt, nomor_slide, file_excel, nama_sheet, 0.125, 1.125, 9.25, 3,
+                  n_sampel, tot_multirespon, warna, baris_header = 2, lebar_indeks = 1,
+                  margin_indeks = .05, size_multirespon = 9)
 
-    for i in range(rows):
-        if i==0:
-            header = isi_header
-            list_temp = header
-        else:
-            list_temp = data_usiar.loc[i-1,:].to_list()
 
-        for j in range(cols):     
-            if type(list_temp[j])!=str:
-                if n_sampel == True:
-                    if i != rows - 1:
-                        list_temp[j] = str(list_temp[j]) + '%'
-                    else: 
-                        list_temp[j] = int(list_temp[j])
-                        list_temp[j] = str(list_temp[j])
-                else:
-                    list_temp[j] = str(list_temp[j]) + '%'
-
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            #tabel.cell(i,j).text_frame.paragraphs[0].margin_left = Inches(0)
-            #tabel.cell(i,j).text_frame.paragraphs[0].margin_right = Inches(0)
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel.cell(i,j).fill.solid()
-            tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
-
-            if i == 0:
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51,102,153)                
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-            else:
-                if j != 0:
-                    rgb_ij = sheet_warna.cell(i+1, j+1).fill.fgColor.rgb[2:]
-                    rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2])
-                    
-            if tot_multirespon == True:
-                if i == rows-1 or i == rows-2:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-            elif n_sampel == True and i == rows-1:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)           
-            if j == 0 and i != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
+def ppt_by_usiar(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False, warna = None):
+    """
+    Plot tabel crosstab indeks brand dengan usiar (lihat ppt_by)
     
-    tabel.columns[0].width = Inches(2)
-    tabel.rows[0].height = Inches(.5)
+    Parameter
+    ---------
+    template_ppt : template ppt yang dipakai
+    nomor_slide : angka nomor slide (mulai dari 0)  
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
+    nama_sheet = nama sheet data pekerjaan pada file excel
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
-    return None
+    Return
+    ------
+    None    
+    """
+    
+    return ppt_by(template_ppt, nomor_slide, file_excel, nama_sheet, 0.375, 1.25, 8.75, 3,
+                  n_sampel, tot_multirespon, warna, lebar_indeks = 2, tinggi_header = .5,
+                  bold = None, margin_nol = False)
 
 
-def ppt_by_expandr(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False):
+def ppt_by_expandr(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False, warna = None):
     """
-    Plot tabel crosstab indeks brand dengan expandr
+    Plot tabel crosstab indeks brand dengan expandr (lihat ppt_by)
     
     Parameter
     ---------
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0) 
-    file_excel = File excel yang memuat data
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
     nama_sheet = nama sheet data pekerjaan pada file excel
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
     Return
     ------
     None    
     """    
- 
-    data_expandr = pd.read_excel(file_excel, sheet_name=nama_sheet, index_col = [0])    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
     
-    slide = template_ppt.slides[nomor_slide]
-    shapes = slide.shapes
-
-    rows = data_expandr.shape[0]+1
-    cols = data_expandr.shape[1]+1
-    left = Inches(0.5)
-    top = Inches(1.125)
-    width = Inches(6.25)
-    height = Inches(3.25)
-
-    tabel = shapes.add_table(rows, cols, left, top, width, height).table
-
-    data_expandr = data_expandr.reset_index()
-
-    isi_header = [data_expandr.columns[x] for x in range(len(data_expandr.columns))]
-
-    for i in range(rows):
-        if i==0:
-            header = isi_header
-            list_temp = header
-        else:
-            list_temp = data_expandr.loc[i-1,:].to_list()
+    return ppt_by(template_ppt, nomor_slide, file_excel, nama_sheet, 0.5, 1.125, 6.25, 3.25,
+                  n_sampel, tot_multirespon, warna, lebar_indeks = 1.75, tinggi_header = .5)
 
-        for j in range(cols):     
-            if type(list_temp[j])!=str:
-                if n_sampel == True:
-                    if i != rows - 1:
-                        list_temp[j] = str(list_temp[j]) + '%'
-                    else: 
-                        list_temp[j] = int(list_temp[j])
-                        list_temp[j] = str(list_temp[j])
-                else:
-                    list_temp[j] = str(list_temp[j]) + '%'
 
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].font.bold = False
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel.cell(i,j).margin_left = Inches(0)
-            tabel.cell(i,j).margin_right = Inches(0)
-            tabel.cell(i,j).fill.solid()
-            tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
-            
-            if i == 0:
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51,102,153)                
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-            else:
-                if j != 0:
-                    rgb_ij = sheet_warna.cell(i+1, j+1).fill.fgColor.rgb[2:]
-                    rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2])                
-            if tot_multirespon == True:
-                if i == rows-1 or i == rows-2:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-            elif n_sampel == True and i == rows-1:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-            if j == 0 and i != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT            
-    #         tabel.cell(i,j).fill.solid()
-    # #         tabel.cell(i,j).fill.fore_color.rgb = RGBColor(155,187,89)
-    #         tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-
-    tabel.columns[0].width = Inches(1.75)
-    tabel.rows[0].height = Inches(.5)
-    
-    return None
-
-
-def ppt_by_sex(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False):
+def ppt_by_sex(template_ppt, nomor_slide, file_excel, nama_sheet, n_sampel = True, tot_multirespon = False, warna = None):
     """
-    Plot tabel crosstab indeks brand dengan sex
+    Plot tabel crosstab indeks brand dengan sex (lihat ppt_by), tanpa kolom brand
     
     Parameter
     ---------
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0) 
-    file_excel = File excel yang memuat data
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
     nama_sheet = nama sheet data pekerjaan pada file excel
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
     Return
     ------
     None    
     """       
-
-    data_sex = pd.read_excel(file_excel, sheet_name=nama_sheet, index_col = [0])    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
-    
-    slide = template_ppt.slides[nomor_slide]
-    shapes = slide.shapes
-    
-    rows = data_sex.shape[0]+1
-    cols = data_sex.shape[1]
-    left = Inches(7.75)
-    top = Inches(1.125)
-    width = Inches(1.75)
-    height = Inches(3.25)
-
-    tabel1 = shapes.add_table(rows, cols, left, top, width, height).table
-
-    data_sex = data_sex.reset_index()
-
-    isi_header = [data_sex.columns[x] for x in range(len(data_sex.columns))]
-
-    for i in range(rows):
-        if i==0:
-            header = isi_header
-            list_temp = header
-        else:
-            list_temp = data_sex.loc[i-1,:].to_list()
-        list_temp = list_temp[1:]
-
-        for j in range(cols):     
-            if type(list_temp[j])!=str:
-                if n_sampel == True:
-                    if i != rows - 1:
-                        list_temp[j] = str(list_temp[j]) + '%'
-                    else: 
-                        list_temp[j] = int(list_temp[j])
-                        list_temp[j] = str(list_temp[j])
-                else:
-                    list_temp[j] = str(list_temp[j]) + '%'
-
-            _set_cell_border(tabel1.cell(i,j), "969696")
-            tabel1.cell(i,j).text = list_temp[j]
-            tabel1.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel1.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel1.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel1.cell(i,j).text_frame.paragraphs[0].font.bold = False
-            tabel1.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel1.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel1.cell(i,j).fill.solid()
-            tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
-            
-            if i == 0:
-                tabel1.cell(i,j).fill.solid()
-                tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(51,102,153)                
-                tabel1.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-            else:
-                rgb_ij = sheet_warna.cell(i+1, j+2).fill.fgColor.rgb[2:]
-                rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2])    
-                
-            if tot_multirespon == True:
-                if i == rows-1 or i == rows-2:
-                    tabel1.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                    tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-            elif n_sampel == True and i == rows-1:
-                tabel1.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)    
-    #         tabel1.cell(i,j).fill.solid()
-    # #         tabel1.cell(i,j).fill.fore_color.rgb = RGBColor(155,187,89)
-    #         tabel1.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
     
-    tabel1.rows[0].height = Inches(.5)
-        
-    return None
+    return ppt_by(template_ppt, nomor_slide, file_excel, nama_sheet, 7.75, 1.125, 1.75, 3.25,
+                  n_sampel, tot_multirespon, warna, dengan_indeks = False, tinggi_header = .5,
+                  margin_nol = False)
 
 
-def plot_brand_switching_bar(template_ppt, nomor_slide, data_brandSwitching, tabel_nSample):
+def plot_brand_switching_bar(template_ppt, nomor_slide, data_brandSwitching, tabel_nSample, workbook_chart = 'lengkap'):
     """
     Membuat plot bar chart
     
@@ -1608,6 +1959,7 @@ def plot_brand_switching_bar(template_ppt, nomor_slide, data_brandSwitching, tab
     nomor_slide : angka nomor slide (mulai dari 0)       
     data_brandSwitching : data yang akan diolah
     tabel_nSample : data yang memuat n_Sample
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -1630,8 +1982,8 @@ def plot_brand_switching_bar(template_ppt, nomor_slide, data_brandSwitching, tab
     chart_data.add_series('Switching out', Reverse(data_brandSwitching['Switching out'].to_list()))
 
     x, y, cx, cy = Inches(.25), Inches(1.675), Inches(4.25), Inches(3.75)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data, workbook_chart
     ).chart
 
     chart.category_axis.tick_labels.font.name = 'Lato'
@@ -1642,11 +1994,8 @@ def plot_brand_switching_bar(template_ppt, nomor_slide, data_brandSwitching, tab
     chart.category_axis.major_tick_mark = XL_TICK_MARK.NONE
     
     plot = chart.plots[0]
-    for i in range(len(list_brand)):
-        plot.series[0].points[i].format.fill.solid()
-        plot.series[0].points[i].format.fill.fore_color.rgb = RGBColor(69, 114, 167)
-        plot.series[1].points[i].format.fill.solid()
-        plot.series[1].points[i].format.fill.fore_color.rgb = RGBColor(147, 169, 207)
+    warnai_titik(plot.series[0], (69, 114, 167), len(list_brand))
+    warnai_titik(plot.series[1], (147, 169, 207), len(list_brand))
 
     plot.gap_width = 54
     plot.overlap = 100
@@ -1700,6 +2049,12 @@ def ppt_tabel_brand_switching(template_ppt, nomor_slide, data_brandSwitching,
     isi_header1 = [kol_cl[i][0] for i in range(len(kol_cl[:2]))]+['']*(len(kol_cl)-2)
     isi_header2 = ['']*1+[kol_cl[i+1][1] for i in range(len(kol_cl[1:]))]
 
+    teks = []
+    warna_font = np.zeros((rows, cols, 3), dtype = np.uint8)
+    warna_isi = np.full((rows, cols, 3), 255, dtype = np.uint8)
+    rata = np.full((rows, cols), PP_ALIGN.CENTER, dtype = object)
+    margin_kiri = np.zeros((rows, cols))
+
     for i in range(rows):
         if i==0:
             header = isi_header1
@@ -1721,30 +2076,20 @@ def ppt_tabel_brand_switching(template_ppt, nomor_slide, data_brandSwitching,
                 else:
                     list_temp[j] = str(list_temp[j]) + '%'
             
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].font.bold = False
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel.cell(i,j).margin_left = Inches(0)
-            tabel.cell(i,j).margin_right = Inches(0)
-            
-            tabel.cell(i,j).fill.solid()
-            tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)
-            
             if i == 0 or i== 1 or i == (rows - 1):
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
+                warna_font[i,j] = (255, 255, 255)
+                warna_isi[i,j] = (51, 102, 153)
             else:
                 if j != 0 and i == j+1:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(127, 127, 127)
+                    warna_font[i,j] = (255, 255, 255)
+                    warna_isi[i,j] = (127, 127, 127)
             if j == 0 and i != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
-                tabel.cell(i,j).margin_left = Inches(.05)                       
+                rata[i,j] = PP_ALIGN.LEFT
+                margin_kiri[i,j] = .05
+        teks.append(list_temp)
+    
+    tulis_tabel(tabel, teks, warna_font = warna_font, bold = False, rata = rata,
+                margin_kiri = margin_kiri, margin_kanan = 0, warna_isi = warna_isi)
  
     tabel.cell(0,0).merge(tabel.cell(1,0))            
     tabel.cell(0,1).merge(tabel.cell(0,11))
@@ -1756,7 +2101,7 @@ def ppt_tabel_brand_switching(template_ppt, nomor_slide, data_brandSwitching,
 
 
 def plot_stacked_bar(template_ppt, nomor_slide, list_data, kategori,  kategori1,
-                    left, top, width, height):
+                    left, top, width, height, workbook_chart = 'lengkap'):
     """
     Menyajikan stacked_bar chart
     
@@ -1771,6 +2116,7 @@ def plot_stacked_bar(template_ppt, nomor_slide, list_data, kategori,  kategori1,
     list_data : array data series yang akan di tampilkan
     kategori : kategori ini digunakan untuk menamai sumbu dengan nama brand
     kategori1 : kategori ini digunakan untuk menamai sumbu dengan jumlah n_sample
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -1794,8 +2140,8 @@ def plot_stacked_bar(template_ppt, nomor_slide, list_data, kategori,  kategori1,
         chart_data.add_series(list_data[i].name, Reverse(list_data[i].to_list()))
         
     x, y, cx, cy = Inches(left), Inches(top), Inches(width), Inches(height)
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data
+    chart = tambah_chart(
+        slide, XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data, workbook_chart
     ).chart
     
     chart.category_axis.visible = False
@@ -1804,13 +2150,9 @@ def plot_stacked_bar(template_ppt, nomor_slide, list_data, kategori,  kategori1,
     chart.value_axis.has_major_gridlines = False
     
     plot = chart.plots[0]
-    for i in range(len(list_brand)):
-        plot.series[0].points[i].format.fill.solid()
-        plot.series[0].points[i].format.fill.fore_color.rgb = RGBColor(13, 13, 13)
-        plot.series[1].points[i].format.fill.solid()
-        plot.series[1].points[i].format.fill.fore_color.rgb = RGBColor(96, 96, 96)
-        plot.series[2].points[i].format.fill.solid()
-        plot.series[2].points[i].format.fill.fore_color.rgb = RGBColor(146, 208, 80)
+    warnai_titik(plot.series[0], (13, 13, 13), len(list_brand))
+    warnai_titik(plot.series[1], (96, 96, 96), len(list_brand))
+    warnai_titik(plot.series[2], (146, 208, 80), len(list_brand))
     
     plot.gap_width = 54
     plot.overlap = 100
@@ -1828,7 +2170,7 @@ def plot_stacked_bar(template_ppt, nomor_slide, list_data, kategori,  kategori1,
 
 def plot_bar_chart(template_ppt, nomor_slide, kategori, series, left, top, width,
                    height, min_scale, max_scale, rgb_chart, kategori1=None, label_sumbu = False,
-                   font_size = 9, gap_grafik = 54):
+                   font_size = 9, gap_grafik = 54, workbook_chart = 'lengkap'):
     """
     Membuat plot bar chart
     
@@ -1848,6 +2190,7 @@ def plot_bar_chart(template_ppt, nomor_slide, kategori, series, left, top, width
     label_sumbu : ya/tidak category axis dimunculkan
     font_size : ukuran font category axis
     gap_grafik : ukuran gap_width grafik
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     
     Return
@@ -1874,8 +2217,8 @@ def plot_bar_chart(template_ppt, nomor_slide, kategori, series, left, top, width
     chart.add_series('Series 1', Reverse(series.values))
     
     x, y, cx, cy = Inches(left), Inches(top), Inches(width), Inches(height)
-    chart= slide.shapes.add_chart(
-        XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart
+    chart= tambah_chart(
+        slide, XL_CHART_TYPE.BAR_CLUSTERED, x, y, cx, cy, chart, workbook_chart
     ).chart
     
     chart.has_title = False
@@ -1895,9 +2238,7 @@ def plot_bar_chart(template_ppt, nomor_slide, kategori, series, left, top, width
     # chart.legend.include_in_layout = False
     
     plot = chart.plots[0]
-    for i in range(len(list_kategori)):
-        plot.series[0].points[i].format.fill.solid()
-        plot.series[0].points[i].format.fill.fore_color.rgb = RGBColor(rgb_chart[0], rgb_chart[1], rgb_chart[2])
+    warnai_titik(plot.series[0], rgb_chart, len(list_kategori))
     plot.series[0].invert_if_negative = True
     plot.gap_width = gap_grafik
     plot.overlap = 0
@@ -1942,6 +2283,12 @@ def plot_tabel_brandDiac(template_ppt, nomor_slide, data_tabel):
 
     isi_header = [data_tabel.columns[x] for x in range(len(data_tabel.columns))]
 
+    teks = []
+    warna_font = np.zeros((rows, cols, 3), dtype = np.uint8)
+    warna_isi = np.full((rows, cols, 3), 255, dtype = np.uint8)
+    bold = np.full((rows, cols), None, dtype = object)
+    rata = np.full((rows, cols), PP_ALIGN.CENTER, dtype = object)
+
     for i in range(rows):
         if i==0:
             header = isi_header
@@ -1955,35 +2302,25 @@ def plot_tabel_brandDiac(template_ppt, nomor_slide, data_tabel):
                     list_temp[j] = str(list_temp[j]) + '%'
                 else:
                     list_temp[j] = str("%.3f" % list_temp[j])
-                
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(10)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
             
             if i == 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255,255,255)
-                tabel.cell(i,j).text_frame.paragraphs[0].font.bold = True
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
+                warna_font[i,j] = (255, 255, 255)
+                bold[i,j] = True
+                warna_isi[i,j] = (51, 102, 153)
             elif i%2 != 0:
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(191, 191, 191)   
-            else:
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)  
+                warna_isi[i,j] = (191, 191, 191)
             if j == 0 and i != 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
+                rata[i,j] = PP_ALIGN.LEFT
+        teks.append(list_temp)
+    
+    tulis_tabel(tabel, teks, warna_font = warna_font, bold = bold, rata = rata, warna_isi = warna_isi)
     tabel.rows[0].height = Inches(.5)
     tabel.columns[0].width = Inches(1.25)
      
     return None
 
 
-def plot_scatter_brandDiac(template_ppt, nomor_slide, data_brandDiac, top = None):
+def plot_scatter_brandDiac(template_ppt, nomor_slide, data_brandDiac, top = None, workbook_chart = 'lengkap'):
     """
     Membuat scatter plot untuk brand diag
     
@@ -1992,6 +2329,7 @@ def plot_scatter_brandDiac(template_ppt, nomor_slide, data_brandDiac, top = None
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)      
     data_brandDiac : data yang akan di-plot
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -2011,8 +2349,8 @@ def plot_scatter_brandDiac(template_ppt, nomor_slide, data_brandDiac, top = None
         chart_data.add_series(data_brandDiac['Brand'][i]).add_data_point(x,y)
     #'Model %d'%(i)
     x, y, cx, cy = Inches(.75), Inches(2.36), Inches(5.75), Inches(3.75)
-    scatter = slide.shapes.add_chart(
-        XL_CHART_TYPE.XY_SCATTER, x, y, cx, cy, chart_data
+    scatter = tambah_chart(
+        slide, XL_CHART_TYPE.XY_SCATTER, x, y, cx, cy, chart_data, workbook_chart
     ).chart
 
     scatter.has_legend = False
@@ -2044,7 +2382,7 @@ def plot_scatter_brandDiac(template_ppt, nomor_slide, data_brandDiac, top = None
 
 def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
                              left, top, width, height, header_size, font_size,
-                             first_row, first_col0, first_col1):
+                             first_row, first_col0, first_col1, warna = None):
     """
     Membuat tabel competitor landscape di laporan ppt
     
@@ -2056,8 +2394,9 @@ def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
     top : tepi chart dari atas
     width : lebar chart
     height : tinggi chart          
-    file_excel = File excel yang memuat data
+    file_excel = File excel yang memuat data, atau tabel / pasangan (tabel, warna) hasil olah data
     nama_sheet = nama sheet data pekerjaan pada file excel
+    warna = array warna RGB (baris x kolom data x 3) jika file_excel berupa tabel atau Styler
     
     Return
     ------
@@ -2067,9 +2406,7 @@ def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
     slide = template_ppt.slides[nomor_slide]
     shapes = slide.shapes
 
-    data_cl = pd.read_excel(file_excel, sheet_name=nama_sheet, header = [0,1], index_col = [0,1])    
-    wb = openpyxl.load_workbook(file_excel)
-    sheet_warna = wb[nama_sheet]
+    data_cl, warna_cl = _ambil_tabel_warna(file_excel, nama_sheet, 4, 3, warna, header = [0,1], index_col = [0,1])
     
     rows = data_cl.shape[0]+2
     cols = data_cl.shape[1]+2
@@ -2087,6 +2424,15 @@ def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
     isi_header1[1]= ''
     isi_header2 = ['']*2+[kol_cl[i+2][1] for i in range(len(kol_cl[2:]))]
 
+    teks = []
+    warna_font = np.zeros((rows, cols, 3), dtype = np.uint8)
+    warna_isi = np.full((rows, cols, 3), 255, dtype = np.uint8)
+    ukuran_font = np.full((rows, cols), font_size)
+    bold = np.full((rows, cols), None, dtype = object)
+    rata = np.full((rows, cols), PP_ALIGN.CENTER, dtype = object)
+    margin_kiri = np.zeros((rows, cols))
+    margin_kanan = np.zeros((rows, cols))
+
     for i in range(rows):
         if i==0:
             header = isi_header1
@@ -2106,49 +2452,32 @@ def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
             elif type(list_temp[j])!=str:
                 list_temp[j] = str("%.3f" % list_temp[j])
             
-            _set_cell_border(tabel.cell(i,j), "969696")
-            tabel.cell(i,j).text = list_temp[j]
-            tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(0,0,0)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(font_size)
-            tabel.cell(i,j).text_frame.paragraphs[0].font.name = 'Lato'
-            tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
-            tabel.cell(i,j).vertical_anchor = MSO_ANCHOR.MIDDLE
-            tabel.cell(i,j).margin_left = Inches(0)
-            tabel.cell(i,j).margin_right = Inches(0)
-            tabel.cell(i,j).margin_top = Inches(0)
-            tabel.cell(i,j).margin_bottom = Inches(0)
-            tabel.cell(i,j).fill.solid()
-            tabel.cell(i,j).fill.fore_color.rgb = RGBColor(255, 255, 255)            
-            
             if i == 0 or j == 0:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.bold = True
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(217, 217, 217)  
+                bold[i,j] = True
+                warna_isi[i,j] = (217, 217, 217)
             elif i == 1 or j ==1:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)                  
+                warna_font[i,j] = (255, 255, 255)
+                warna_isi[i,j] = (51, 102, 153)
                 if i == 1:
-                    tabel.cell(i,j).text_frame.paragraphs[0].font.size = Pt(header_size)
+                    ukuran_font[i,j] = header_size
                 else:
-                    tabel.cell(i,j).text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
-                    tabel.cell(i,j).margin_left = Inches(0.1)
-                    tabel.cell(i,j).margin_right = Inches(0.1)
+                    rata[i,j] = PP_ALIGN.LEFT
+                    margin_kiri[i,j] = 0.1
+                    margin_kanan[i,j] = 0.1
             else:
                 if j != 0 and j != 1:
-                    rgb_ij = sheet_warna.cell(i+2, j+1).fill.fgColor.rgb[2:]
-                    rgb_ij = tuple(int(rgb_ij[i:i+2], 16) for i in (0, 2, 4))
-                    tabel.cell(i,j).fill.fore_color.rgb = RGBColor(rgb_ij[0], rgb_ij[1], rgb_ij[2])   
+                    warna_isi[i,j] = warna_cl[i-2, j-2]
                     
             if i == j:
-                tabel.cell(i,j).text_frame.paragraphs[0].font.color.rgb = RGBColor(51, 102, 153)
-                tabel.cell(i,j).fill.solid()
-                tabel.cell(i,j).fill.fore_color.rgb = RGBColor(51, 102, 153)
-
-                    
-    tabel.cell(0,0).text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-    tabel.cell(0,0).fill.solid()
-    tabel.cell(0,0).fill.fore_color.rgb = RGBColor(0, 176, 80)   
+                warna_font[i,j] = (51, 102, 153)
+                warna_isi[i,j] = (51, 102, 153)
+        teks.append(list_temp)
+    
+    warna_font[0,0] = (255, 255, 255)
+    warna_isi[0,0] = (0, 176, 80)
+    tulis_tabel(tabel, teks, warna_font = warna_font, ukuran_font = ukuran_font, bold = bold, rata = rata,
+                margin_kiri = margin_kiri, margin_kanan = margin_kanan, margin_atas = 0, margin_bawah = 0,
+                warna_isi = warna_isi)
     
     tabel.columns[0].width = Inches(first_col0)
     tabel.columns[1].width = Inches(first_col1)
@@ -2160,7 +2489,7 @@ def ppt_competition_landscape(template_ppt, nomor_slide, file_excel, nama_sheet,
      
     return None
     
-def pie_chart_olshop(template_ppt, nomor_slide, data_olshop):
+def pie_chart_olshop(template_ppt, nomor_slide, data_olshop, workbook_chart = 'lengkap'):
     """
     Membuat chart pie untuk data_olshop 'Pernah' dan 'Tidak pernah'
     
@@ -2169,6 +2498,7 @@ def pie_chart_olshop(template_ppt, nomor_slide, data_olshop):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
     data_olshop : data olshop yang akan di-plot   
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -2184,8 +2514,8 @@ def pie_chart_olshop(template_ppt, nomor_slide, data_olshop):
     pie_chart.add_series('olshop', series)
 
     x, y, cx, cy = Inches(0.5), Inches(2), Inches(4.25), Inches(3.32)
-    pie= slide.shapes.add_chart(
-        XL_CHART_TYPE.PIE_EXPLODED, x, y, cx, cy, pie_chart
+    pie= tambah_chart(
+        slide, XL_CHART_TYPE.PIE_EXPLODED, x, y, cx, cy, pie_chart, workbook_chart
     ).chart
 
     pie.has_title = False
@@ -2208,7 +2538,7 @@ def pie_chart_olshop(template_ppt, nomor_slide, data_olshop):
     pie.series[0].points[1].format.fill.fore_color.rgb = RGBColor(147, 169, 207)
     return None
     
-def plot_data_olshop_kota(template_ppt, nomor_slide, data_olshop):
+def plot_data_olshop_kota(template_ppt, nomor_slide, data_olshop, workbook_chart = 'lengkap'):
     """
     Plot data olshop breakdown kota
     
@@ -2217,6 +2547,7 @@ def plot_data_olshop_kota(template_ppt, nomor_slide, data_olshop):
     template_ppt : template ppt yang dipakai
     nomor_slide : angka nomor slide (mulai dari 0)    
     data_olshop : data olshop yang akan di-plot    
+    workbook_chart : workbook excel yang disematkan di chart (lihat tambah_chart)
     
     Return
     ------
@@ -2238,8 +2569,8 @@ def plot_data_olshop_kota(template_ppt, nomor_slide, data_olshop):
     chart_data.add_series('Tidak pernah', data_olshop['Tidak pernah'][:len(list_kategori)].values)
 
     x, y, cx, cy = Inches(5), Inches(1), Inches(4.75), Inches(5)
-    chart = slide.shapes.add_chart(
-    XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data
+    chart = tambah_chart(
+    slide, XL_CHART_TYPE.BAR_STACKED_100, x, y, cx, cy, chart_data, workbook_chart
     ).chart
     
     chart.value_axis.visible = False
@@ -2250,11 +2581,8 @@ def plot_data_olshop_kota(template_ppt, nomor_slide, data_olshop):
     chart.category_axis.major_tick_mark = XL_TICK_MARK.NONE
     set_reverse_categories(chart.category_axis)
     plot = chart.plots[0]
-    for i in range(len(list_kota)):
-        plot.series[0].points[i].format.fill.solid()
-        plot.series[0].points[i].format.fill.fore_color.rgb = RGBColor(69, 114, 167)
-        plot.series[1].points[i].format.fill.solid()
-        plot.series[1].points[i].format.fill.fore_color.rgb = RGBColor(147, 169, 207)
+    warnai_titik(plot.series[0], (69, 114, 167), len(list_kota))
+    warnai_titik(plot.series[1], (147, 169, 207), len(list_kota))
     
     plot.gap_width = 57
     plot.overlap = 100
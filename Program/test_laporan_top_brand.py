@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+import olah_data_top_brand as olah_tb
+import laporan_top_brand as laporan_tb
+
+
+FOLDER_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data')
+
+
+def test_batch_output_ganda_ditolak(tmp_path):
+    # Job yang sama tanpa 'output' mendapat nama file default yang sama
+    daftar_job = [{'subkategori' : 'Bedding', 'client' : 'Comforta'},
+                  {'subkategori' : 'Bedding', 'client' : 'Comforta'},
+                  {'subkategori' : 'Bedding', 'client' : 'King Koil', 'output' : os.path.join(str(tmp_path), 'a.pptx')}]
+    with pytest.raises(ValueError, match = 'output yang sama'):
+        laporan_tb.jalankan_batch(daftar_job, {'konteks' : {}, 'slide' : []})
+
+
+@pytest.mark.parametrize('mode', ['store', 'stream', 'shard'])
+def test_data_responden_mengikuti_sumber_agregat(tmp_path, mode):
+    # Sumber agregat berisi sebagian responden saja, berbeda dengan file data input default
+    konteks = {'client' : 'Comforta', 'subkategori' : ['Bedding'], 'folder_data' : FOLDER_DATA}
+    df_input_clean = laporan_tb.ambil_data(laporan_tb.buat_sumber(konteks), 'df_input_clean')
+    bagian = [df_input_clean.iloc[0::3], df_input_clean.iloc[1::3]]
+    data = pd.concat(bagian, ignore_index = True)
+
+    if mode == 'store':
+        sumber = laporan_tb.buat_sumber(konteks)
+        store = olah_tb.buat_store(data, laporan_tb.ambil_data(sumber, 'mascod_bedding'),
+                                   laporan_tb.ambil_data(sumber, 'top10_brand'))
+        olah_tb.simpan_store(store, str(tmp_path / 'store.pkl'))
+        konteks['store'] = str(tmp_path / 'store.pkl')
+    elif mode == 'stream':
+        data.to_csv(tmp_path / 'stream.csv', index = False)
+        konteks['stream'] = str(tmp_path / 'stream.csv')
+    else:
+        for i, potongan in enumerate(bagian):
+            potongan.to_excel(tmp_path / ('shard %d.xlsx'%(i)), index = False)
+        konteks['shard'] = [str(tmp_path / ('shard %d.xlsx'%(i))) for i in range(len(bagian))]
+        konteks['n_proses_shard'] = 1
+
+    sumber = laporan_tb.buat_sumber(konteks)
+    assert len(laporan_tb.ambil_data(sumber, 'df_input_clean')) == len(data)
+    assert len(laporan_tb.ambil_data(sumber, 'df_laporan')) == len(data)
+    assert laporan_tb.ambil_data(sumber, 'sample_size')['Total'].iloc[-1] == len(data)
+
+    # Kubus dari sumber agregat sama dengan kubus dari data responden yang dipakai tabel lain
+    kubus = laporan_tb.ambil_data(sumber, 'kubus')
+    kubus_responden = olah_tb.buat_agregat(laporan_tb.ambil_data(sumber, 'df_laporan'))['kubus']
+    for kriteria in ['TOM', 'LU', 'FI', 'UN']:
+        pd.testing.assert_frame_equal(olah_tb._agregat_brand(kubus, kriteria, 'kota'),
+                                      olah_tb._agregat_brand(kubus_responden, kriteria, 'kota'))
@@ -0,0 +1,119 @@
+import os
+
+import pandas as pd
+import pytest
+
+import olah_data_top_brand as olah_tb
+
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+FOLDER_DATA = os.path.join(FOLDER, '..', 'Data')
+# Tabel keluaran notebook sebelum memakai kubus brand, dipakai sebagai acuan
+FILE_ACUAN = os.path.join(FOLDER, '..', 'Output', 'tabel output laporan top brand Comforta.xlsx')
+
+
+@pytest.fixture(scope = 'module')
+def laporan():
+    df_input_clean = pd.read_excel(os.path.join(FOLDER_DATA, 'data input clean top brand.xlsx'))
+    mascod_bedding = pd.read_excel(os.path.join(FOLDER_DATA, 'mascod bedding 2021.xlsx'))
+    code_top_brand_lainnya = pd.read_excel(os.path.join(FOLDER_DATA, 'urutan brand.xlsx'))
+    top10_brand = code_top_brand_lainnya[~(code_top_brand_lainnya['Brand']=='Lainnya') &
+                                         ~(code_top_brand_lainnya['Brand']=='Total')]['Brand'].to_list()
+    sorter_brand = code_top_brand_lainnya['Sorting'][:len(code_top_brand_lainnya)]
+
+    df_laporan = olah_tb.data_laporan(df_input_clean, mascod_bedding, top10_brand)
+    return df_laporan, olah_tb.buat_kubus_brand(df_laporan), sorter_brand
+
+
+# nama sheet : (kriteria, kriteria fungsi_by, data IR saja, non_user, by)
+TABEL_CROSSTAB = {}
+for _by in ['kota', 'expandr', 'usiar', 'sex']:
+    TABEL_CROSSTAB['mind_share_' + _by] = ('TOM', 'TOM', False, False, _by)
+    TABEL_CROSSTAB['mind_share_%s_nonuser'%(_by)] = ('TOM', 'TOM', False, True, _by)
+    TABEL_CROSSTAB['market_share_' + _by] = ('LU', 'LU', True, False, _by)
+    TABEL_CROSSTAB['commitment_share_' + _by] = ('FI', 'LU', True, False, _by)
+    TABEL_CROSSTAB['unaided ' + _by] = ('UN', 'TOM', False, False, _by)
+
+
+@pytest.mark.parametrize('nama_sheet', list(TABEL_CROSSTAB))
+def test_crosstab_kubus_sama_dengan_acuan(laporan, nama_sheet):
+    df_laporan, kubus, sorter_brand = laporan
+    kriteria, kriteria_by, hanya_ir, non_user, by = TABEL_CROSSTAB[nama_sheet]
+    indeks_kolom = {'kota' : olah_tb.kota_urut(), 'expandr' : olah_tb.ses_urut()}.get(by, [])
+
+    data = kubus[kubus.IR == 'Ya'] if hanya_ir else kubus
+    data_by = kubus[kubus.IR == 'Tidak'] if non_user else data
+    tabel = olah_tb.hitung_nilai_crosstab(kriteria = kriteria, by = by, data_used = data, indeks_brand = sorter_brand,
+                                          indeks_kolom = indeks_kolom, non_user = non_user,
+                                          dt_tom = kubus if kriteria == 'UN' else None)
+    tabel = olah_tb.fungsi_by(kriteria_by, by, tabel, data_by).data
+
+    acuan = pd.read_excel(FILE_ACUAN, sheet_name = nama_sheet, header = list(range(tabel.columns.nlevels)), index_col = 0)
+    pd.testing.assert_frame_equal(tabel, acuan, check_dtype = False, check_names = False,
+                                  check_column_type = False, check_index_type = False)
+
+
+def test_agregat_shard_sama_dengan_kubus_utuh(laporan):
+    df_laporan, kubus, sorter_brand = laporan
+    # Urutan dan pembagian penjumlahan bobot tidak mengubah hasil
+    list_agregat = [olah_tb.buat_agregat(df_laporan.iloc[i::7]) for i in range(7)]
+    kubus_gabung = olah_tb.gabung_agregat(list_agregat[::-1])['kubus']
+    for kriteria in ['TOM', 'LU', 'FI', 'UN']:
+        pd.testing.assert_frame_equal(olah_tb._agregat_brand(kubus_gabung, kriteria, 'kota'),
+                                      olah_tb._agregat_brand(kubus, kriteria, 'kota'))
+
+
+def test_hitung_tambahan_kode_tanpa_label_diperingatkan():
+    data = pd.DataFrame({'Q1_1' : [1, 2, 9], 'Q1_2' : [2, None, None]})
+    mascod = pd.DataFrame({'kode' : [1, 2], 'label' : ['A', 'B']})
+    with pytest.warns(UserWarning, match = 'Q1_'):
+        tabel = olah_tb.hitung_tambahan(data, 'Q1_', mascod)
+    assert 9 in tabel.index
+
+
+def test_baca_excel_cache_rusak_dibaca_ulang(tmp_path):
+    pytest.importorskip('pyarrow')
+    nama_file = os.path.join(FOLDER_DATA, 'urutan brand.xlsx')
+    acuan = pd.read_excel(nama_file)
+    pd.testing.assert_frame_equal(olah_tb.baca_excel(nama_file, folder_cache = str(tmp_path)), acuan)
+
+    # File cache rusak tidak menggagalkan pembacaan dan ditulis ulang
+    file_cache, = tmp_path.glob('*.parquet')
+    file_cache.write_bytes(b'bukan parquet')
+    pd.testing.assert_frame_equal(olah_tb.baca_excel(nama_file, folder_cache = str(tmp_path)), acuan)
+    pd.testing.assert_frame_equal(olah_tb._baca_cache(str(file_cache)), acuan)
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_baca_excel_folder_cache_tidak_bisa_ditulis(tmp_path):
+    nama_file = os.path.join(FOLDER_DATA, 'urutan brand.xlsx')
+    folder_cache = tmp_path / 'cache'
+    folder_cache.write_text('file biasa, bukan folder')
+    with pytest.warns(UserWarning, match = 'tidak ditulis'):
+        data = olah_tb.baca_excel(nama_file, folder_cache = str(folder_cache))
+    pd.testing.assert_frame_equal(data, pd.read_excel(nama_file))
+
+
+def test_mask_responden_terbuka_disimpan(laporan):
+    df_laporan, kubus, sorter_brand = laporan
+    frame = olah_tb.buat_frame_responden(df_laporan)
+    mask = olah_tb.mask_responden(frame, 'ir', 'tom_beda_lu')
+    assert (mask == ((df_laporan['IR'] == 'Ya') & (df_laporan['TOM'] != df_laporan['LU'])).to_numpy()).all()
+    # Pemakaian berikutnya memakai mask yang sama, dan cache tidak bisa diubah dari luar
+    assert olah_tb.mask_responden(frame, 'ir', 'tom_beda_lu') is mask
+    with pytest.raises(ValueError):
+        mask[0] = not mask[0]
+
+
+def test_survey_frame_default_sama_persis(laporan):
+    df_laporan, kubus, sorter_brand = laporan
+    survey_frame = olah_tb.buat_survey_frame(df_laporan)
+    assert survey_frame['bobot'].dtype == 'float64'
+    assert olah_tb.buat_survey_frame(df_laporan, 'float32')['bobot'].dtype == 'float32'
+
+    kubus_sf = olah_tb.buat_agregat(survey_frame)['kubus']
+    for kriteria in ['TOM', 'LU', 'FI', 'UN']:
+        # Kolom kota survey frame berupa kategori, nilainya harus sama persis
+        tabel = olah_tb._agregat_brand(kubus_sf, kriteria, 'kota')
+        tabel.columns = tabel.columns.astype(object)
+        pd.testing.assert_frame_equal(tabel, olah_tb._agregat_brand(kubus, kriteria, 'kota'))